@@ -4,8 +4,10 @@ import {
   stdDev,
   computeDriverMetrics,
   computeComparison,
+  gapDeltaFromTable,
+  gapDeltaFromTraces,
 } from "../compare";
-import type { TelemetryLap, TelemetrySession } from "@/app/types/telemetry";
+import type { DriverDeltas, TelemetryLap, TelemetrySession } from "@/app/types/telemetry";
 
 function mockLap(overrides: Partial<TelemetryLap> = {}): TelemetryLap {
   return {
@@ -278,3 +280,152 @@ describe("computeComparison", () => {
     expect(result.drivingDNA[1].abbreviation).toBe("NOR");
   });
 });
+
+describe("gapDeltaFromTable", () => {
+  const deltas: DriverDeltas = {
+    drivers: [1, 4],
+    binEdges: [0, 1500, 3000],
+    binTime: [[20.0, 21.0], [20.12, 20.63]],
+    cumulativeDelta: [
+      [[0, 0], [120, -250]],
+      [[-120, 250], [0, 0]],
+    ],
+    dominance: [
+      [[0, 0], [1, -1]],
+      [[-1, 1], [0, 0]],
+    ],
+  };
+
+  it("reads one point per bin, positive = A ahead", () => {
+    expect(gapDeltaFromTable(deltas, 1, 4)).toEqual([
+      { progress: 50, delta: 0.12, deltaPositive: 0.12, deltaNegative: 0 },
+      { progress: 100, delta: -0.25, deltaPositive: 0, deltaNegative: -0.25 },
+    ]);
+  });
+
+  it("negates the gap when the drivers are swapped", () => {
+    const gap = gapDeltaFromTable(deltas, 4, 1);
+    expect(gap?.map((p) => p.delta)).toEqual([-0.12, 0.25]);
+    expect(gap?.map((p) => p.deltaPositive)).toEqual([0, 0.25]);
+  });
+
+  it("returns null when a driver is not in the table", () => {
+    expect(gapDeltaFromTable(deltas, 1, 16)).toBeNull();
+    expect(gapDeltaFromTable(deltas, 16, 4)).toBeNull();
+  });
+});
+
+describe("gapDeltaFromTraces", () => {
+  const trace = (distance: number[], speed: number[]) => ({
+    driverNumber: 1,
+    lapNumber: 1,
+    distance,
+    speed,
+    throttle: distance.map(() => 100),
+    brake: distance.map(() => false),
+  });
+  const a = trace([0, 1000, 2000, 3000], [200, 300, 280, 250]);
+
+  it("matches the driverDeltas table computed by the fetch script", () => {
+    // scripts/lib/deltas.py compute_driver_deltas on the same traces with 4 mini-sectors
+    const b = trace([5, 700, 1600, 2400, 3010], [196, 290, 305, 260, 244]);
+    expect(gapDeltaFromTraces(a, b, 4).map((p) => p.delta)).toEqual([0.193, -0.538, -0.648, -0.354]);
+    expect(gapDeltaFromTraces(a, b, 4).map((p) => p.progress)).toEqual([25, 50, 75, 100]);
+  });
+
+  it("compares at equal distances, not equal sample indices", () => {
+    // The same lap sampled at different points (and more of them) has no gap
+    const lap = trace([0, 1000, 2000, 3000], [200, 300, 300, 250]);
+    const resampled = trace([0, 1000, 1400, 1500, 2000, 3000], [200, 300, 300, 300, 300, 250]);
+    const gap = gapDeltaFromTraces(lap, resampled, 6);
+    expect(gap).toHaveLength(6);
+    for (const point of gap) expect(point.delta).toBeCloseTo(0, 3);
+  });
+
+  it("is empty for traces with fewer than two samples", () => {
+    expect(gapDeltaFromTraces(a, trace([0], [200]))).toEqual([]);
+  });
+});
+
+describe("computeComparison gap delta", () => {
+  const driver = (number: number, abbreviation: string) => ({
+    number,
+    abbreviation,
+    fullName: abbreviation,
+    teamName: "Team",
+    teamColor: "#3671C6",
+    position: number,
+    classifiedPosition: String(number),
+    gridPosition: number,
+    status: "Finished",
+    points: 0,
+    time: null,
+    q1: null,
+    q2: null,
+    q3: null,
+  });
+  const traces = [
+    {
+      driverNumber: 1,
+      lapNumber: 1,
+      distance: [0, 1000, 2000, 3000],
+      speed: [200, 300, 280, 250],
+      throttle: [100, 100, 80, 60],
+      brake: [false, false, true, false],
+    },
+    {
+      driverNumber: 4,
+      lapNumber: 1,
+      distance: [0, 1000, 2000, 3000],
+      speed: [195, 310, 275, 245],
+      throttle: [100, 100, 75, 55],
+      brake: [false, false, true, true],
+    },
+  ];
+  const session: TelemetrySession = {
+    year: 2025,
+    round: 1,
+    eventName: "Test GP",
+    sessionType: "Race",
+    circuitName: "Test Circuit",
+    country: "Testland",
+    drivers: [driver(1, "VER"), driver(4, "NOR")],
+    lapData: [mockLap({ driverNumber: 1 }), mockLap({ driverNumber: 4 })],
+    telemetryData: traces,
+    stintData: [],
+    driverDeltas: {
+      drivers: [1, 4],
+      binEdges: [0, 1500, 3000],
+      binTime: [[20.0, 21.0], [20.12, 20.63]],
+      cumulativeDelta: [
+        [[0, 0], [120, -250]],
+        [[-120, 250], [0, 0]],
+      ],
+      dominance: [
+        [[0, 0], [1, -1]],
+        [[-1, 1], [0, 0]],
+      ],
+    },
+  };
+
+  it("reads the gap from the driverDeltas table even when both traces are present", () => {
+    const result = computeComparison(session, 1, 4);
+    expect(result.gapDeltaData.map((p) => p.delta)).toEqual([0.12, -0.25]);
+    expect(result.gapDeltaData.map((p) => p.progress)).toEqual([50, 100]);
+  });
+
+  it("resamples the traces onto one grid when the table has no entry for the pair", () => {
+    const result = computeComparison({ ...session, driverDeltas: undefined }, 1, 4);
+    expect(result.gapDeltaData).toEqual(gapDeltaFromTraces(traces[0], traces[1]));
+    expect(result.gapDeltaData).toHaveLength(200);
+  });
+
+  it("is empty without traces or a table entry for the pair", () => {
+    const noTraces = { ...session, telemetryData: [] };
+    expect(computeComparison({ ...noTraces, driverDeltas: undefined }, 1, 4).gapDeltaData).toEqual([]);
+    expect(
+      computeComparison({ ...noTraces, driverDeltas: { ...session.driverDeltas!, drivers: [1, 16] } }, 1, 4)
+        .gapDeltaData,
+    ).toEqual([]);
+  });
+});
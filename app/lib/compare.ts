@@ -1,4 +1,5 @@
 import type {
+  DriverDeltas,
   TelemetrySession,
   TelemetryLap,
   TelemetryStint,
@@ -193,9 +194,51 @@ export function computeDriverMetrics(
 
 // ── New Computation Functions ────────────────────────────────────────────
 
-export function computeGapDelta(
+const GAP_GRID_POINTS = 200;
+const MIN_SPEED = 1; // km/h; keeps a stationary sample from producing an infinite segment time
+
+/**
+ * Elapsed seconds at each sample of a trace, as scripts/lib/deltas.py
+ * computes them: each segment takes its length over the mean of its end
+ * speeds, and a trace starting past the line is extended back to 0.
+ */
+function elapsedTime(trace: TelemetrySpeedTrace): { distance: number[]; time: number[] } {
+  const len = Math.min(trace.distance.length, trace.speed.length);
+  const distance: number[] = [];
+  const speed: number[] = [];
+  if (trace.distance[0] > 0) {
+    distance.push(0);
+    speed.push(Math.max(trace.speed[0] || 0, MIN_SPEED) / 3.6);
+  }
+  for (let i = 0; i < len; i++) {
+    distance.push(Math.max(trace.distance[i], distance[distance.length - 1] ?? -Infinity));
+    speed.push(Math.max(trace.speed[i] || 0, MIN_SPEED) / 3.6);
+  }
+  const time = [0];
+  for (let i = 1; i < distance.length; i++) {
+    time.push(time[i - 1] + (distance[i] - distance[i - 1]) / ((speed[i] + speed[i - 1]) / 2));
+  }
+  return { distance, time };
+}
+
+/** Linear interpolation of (xs, ys) at x; xs ascending, clamped at the ends. */
+function interpolate(xs: number[], ys: number[], x: number, from = 0): [number, number] {
+  let i = from;
+  while (i < xs.length - 2 && xs[i + 1] < x) i++;
+  const span = xs[i + 1] - xs[i];
+  const t = span > 0 ? Math.min(Math.max((x - xs[i]) / span, 0), 1) : 1;
+  return [ys[i] + (ys[i + 1] - ys[i]) * t, i];
+}
+
+/**
+ * Gap delta from two traces, each resampled onto one shared distance grid
+ * before subtracting (the traces' own samples sit at different distances).
+ * Only used when the driverDeltas table has no entry for the pair.
+ */
+export function gapDeltaFromTraces(
   traceA: TelemetrySpeedTrace,
   traceB: TelemetrySpeedTrace,
+  points: number = GAP_GRID_POINTS,
 ): GapDeltaPoint[] {
   const len = Math.min(
     traceA.distance.length,
@@ -205,38 +248,56 @@ export function computeGapDelta(
   );
   if (len < 2) return [];
 
-  const totalDistA = traceA.distance[len - 1] - traceA.distance[0];
-  const points: GapDeltaPoint[] = [];
-  let cumDelta = 0;
-
-  for (let i = 0; i < len - 1; i++) {
-    const segDistA = traceA.distance[i + 1] - traceA.distance[i];
-    const segDistB = traceB.distance[i + 1] - traceB.distance[i];
-    if (segDistA <= 0 && segDistB <= 0) continue;
-
-    // Average speed in m/s for each driver over this segment
-    const avgSpeedA = ((traceA.speed[i] + traceA.speed[i + 1]) / 2) / 3.6;
-    const avgSpeedB = ((traceB.speed[i] + traceB.speed[i + 1]) / 2) / 3.6;
-
-    if (avgSpeedA > 0 && avgSpeedB > 0) {
-      const dtA = segDistA / avgSpeedA;
-      const dtB = segDistB / avgSpeedB;
-      cumDelta += dtB - dtA; // positive = A ahead
-    }
-
-    const progress = totalDistA > 0
-      ? ((traceA.distance[i] - traceA.distance[0]) / totalDistA) * 100
-      : (i / (len - 1)) * 100;
-
-    points.push({
-      progress: Math.round(progress * 100) / 100,
-      delta: Math.round(cumDelta * 1000) / 1000,
-      deltaPositive: cumDelta > 0 ? Math.round(cumDelta * 1000) / 1000 : 0,
-      deltaNegative: cumDelta < 0 ? Math.round(cumDelta * 1000) / 1000 : 0,
+  const a = elapsedTime(traceA);
+  const b = elapsedTime(traceB);
+  const end = Math.min(a.distance[a.distance.length - 1], b.distance[b.distance.length - 1]);
+  if (!(end > 0)) return [];
+
+  const result: GapDeltaPoint[] = [];
+  let fromA = 0;
+  let fromB = 0;
+  for (let k = 1; k <= points; k++) {
+    const at = (end * k) / points;
+    const [timeA, nextA] = interpolate(a.distance, a.time, at, fromA);
+    const [timeB, nextB] = interpolate(b.distance, b.time, at, fromB);
+    fromA = nextA;
+    fromB = nextB;
+    const delta = Math.round((timeB - timeA) * 1000) / 1000; // positive = A ahead
+    result.push({
+      progress: Math.round((k / points) * 100 * 100) / 100,
+      delta,
+      deltaPositive: delta > 0 ? delta : 0,
+      deltaNegative: delta < 0 ? delta : 0,
     });
   }
+  return result;
+}
 
-  return points;
+/**
+ * Gap delta from the precomputed distance-aligned table (one point per bin),
+ * or null if a driver is missing from it.
+ */
+export function gapDeltaFromTable(
+  deltas: DriverDeltas,
+  driverANumber: number,
+  driverBNumber: number,
+): GapDeltaPoint[] | null {
+  const a = deltas.drivers.indexOf(driverANumber);
+  const b = deltas.drivers.indexOf(driverBNumber);
+  if (a < 0 || b < 0) return null;
+
+  const edges = deltas.binEdges;
+  const total = edges[edges.length - 1] - edges[0];
+  return deltas.cumulativeDelta[a][b].map((ms, m) => {
+    const delta = ms / 1000; // positive = A ahead
+    const progress = total > 0 ? ((edges[m + 1] - edges[0]) / total) * 100 : 0;
+    return {
+      progress: Math.round(progress * 100) / 100,
+      delta,
+      deltaPositive: delta > 0 ? delta : 0,
+      deltaNegative: delta < 0 ? delta : 0,
+    };
+  });
 }
 
 export function computeDrivingDNA(
@@ -538,8 +599,13 @@ export function computeComparison(
     (t) => t.driverNumber === driverBNumber,
   );
 
+  // Gap from the shared-grid driverDeltas table; the traces are resampled the same way
+  // only for sessions (or pairs) the table doesn't cover
+  const tableGap = session.driverDeltas
+    ? gapDeltaFromTable(session.driverDeltas, driverANumber, driverBNumber)
+    : null;
   const gapDeltaData =
-    traceA && traceB ? computeGapDelta(traceA, traceB) : [];
+    tableGap ?? (traceA && traceB ? gapDeltaFromTraces(traceA, traceB) : []);
 
   const drivingDNA: [DrivingDNABreakdown, DrivingDNABreakdown] = [
     traceA
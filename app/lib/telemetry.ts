@@ -35,8 +35,9 @@ export async function listTelemetryFiles(): Promise<TelemetryFileInfo[]> {
     return files
       .filter((f) => f.endsWith(".json"))
       .map((filename) => {
-        // Parse filename: 2025-R01-australian-gp.json
-        const match = filename.match(/^(\d{4})-R(\d{2})-(.+)\.json$/);
+        // Parse filename: 2025-R01-australian-gp.json (skips sidecars like *.profile.json
+        // and non-race sessions like *.q.json)
+        const match = filename.match(/^(\d{4})-R(\d{2})-([^.]+)\.json$/);
         if (!match) return null;
         return {
           filename,
@@ -55,9 +55,51 @@ export interface TelemetrySpeedTrace {
   z?: (number | null)[];
 }
 
+/** [minX, minY, maxX, maxY] in rotated track coordinates */
+export type BoundingBox = [number, number, number, number];
+
+export interface TrackBoundaryLevel {
+  points: number;
+  bbox: BoundingBox;
+  inner: { x: number[]; y: number[] };
+  outer: { x: number[]; y: number[] };
+}
+
 export interface TrackBoundary {
   inner: { x: number[]; y: number[] };
   outer: { x: number[]; y: number[] };
+  bbox?: BoundingBox;
+  levels?: TrackBoundaryLevel[];   // reduced (~200, ~1000 points), coarsest first, each under 70% of full = inner/outer
+}
+
+export interface TrackPathLevel {
+  points: number;
+  bbox: BoundingBox;
+  index: number[];         // sample index into the driver's telemetryData trace
+  x: number[];
+  y: number[];
+}
+
+export interface TrackPath {
+  driverNumber: number;
+  points: number;          // full resolution = the telemetryData trace's x/y
+  bbox: BoundingBox;
+  levels: TrackPathLevel[];   // never empty: paths too short to reduce are left out of trackPaths
+}
+
+/** All-pairs comparison of fastest laps on shared mini-sector edges (times in ms) */
+export interface DriverDeltas {
+  drivers: number[];               // row/column order of the tables below
+  binEdges: number[];              // metres; bin m spans binEdges[m]..binEdges[m + 1]
+  binTime: number[][];             // [driver][bin] time through the mini-sector
+  cumulativeDelta: number[][][];   // [i][j][bin] time_j - time_i at bin end (positive = i ahead)
+  dominance: number[][][];         // [i][j][bin] 1 = i faster, -1 = j faster, 0 = level
+}
+
+export interface DrsZoneUsage {
+  driverNumber: number;
+  activations: number;     // times DRS was opened in this zone
+  distance: number;        // metres with DRS open, summed over activations
 }
 
 export interface DrsZone {
@@ -67,6 +109,7 @@ export interface DrsZone {
   startY: number;
   endX: number;
   endY: number;
+  usage?: DrsZoneUsage[];
 }
 
 export interface TelemetryStint {
@@ -98,6 +141,25 @@ export interface TelemetryRaceControlMessage {
   message: string;
 }
 
+export type TrackState = "GREEN" | "YELLOW" | "VSC_ENDING" | "VSC" | "SC" | "RED";
+
+/** Per-lap context columns; index i describes one lap */
+export interface LapContextColumns {
+  weather: (number | null)[];          // index into weatherData: last sample at or before the lap start
+  trackState: (TrackState | null)[];   // most severe track state during the lap
+  messageStart: number[];              // raceControlMessages.slice(start, start + count)
+  messageCount: number[];
+}
+
+export interface LapContext {
+  laps: LapContextColumns;             // row-aligned with lapData
+  index: LapContextColumns & {         // one row per lap number
+    lapNumber: number[];
+    start: (number | null)[];          // session seconds, first driver starting the lap
+    end: (number | null)[];            // session seconds, last driver finishing it
+  };
+}
+
 export interface TelemetryTeamRadio {
   driverNumber: number;
   timestamp: string;       // ISO datetime
@@ -113,6 +175,8 @@ export interface TelemetrySession {
   country: string;
   rotation?: number;
   trackBoundary?: TrackBoundary;
+  trackPaths?: TrackPath[];
+  driverDeltas?: DriverDeltas;
   drsZones?: DrsZone[];
   drivers: TelemetryDriver[];
   lapData: TelemetryLap[];
@@ -120,6 +184,7 @@ export interface TelemetrySession {
   stintData: TelemetryStint[];
   weatherData?: TelemetryWeatherEntry[];
   raceControlMessages?: TelemetryRaceControlMessage[];
+  lapContext?: LapContext;
   teamRadioMessages?: TelemetryTeamRadio[];
 }
 
@@ -129,3 +194,62 @@ export interface TelemetryFileInfo {
   round: number;
   slug: string;
 }
+
+/** app/data/telemetry-index/{year}.json, written by scripts/lib/seasonindex.py */
+export interface SeasonIndexDriverSession {
+  driverNumber: number;
+  abbreviation: string | null;
+  teamName: string | null;
+  position: number | null;
+  status: string | null;
+  dnf: boolean | null;                 // null outside races and sprints
+  fastestLap: number | null;           // seconds
+  topSpeed: number | null;             // km/h
+  laps: number;
+  stints: [compound: string, laps: number][];
+}
+
+export interface SeasonIndexSession {
+  file: string;
+  round: number;
+  sessionType: string;
+  eventName: string;
+  laps: number;
+  fastestLap: { driverNumber: number; lapNumber: number; time: number } | null;
+  topSpeed: { driverNumber: number; speed: number } | null;
+  drivers: SeasonIndexDriverSession[];
+}
+
+export interface SeasonIndexDriver {
+  driverNumber: number;
+  abbreviation: string | null;
+  sessions: number;
+  races: number;
+  dnfs: number;
+  fastestLaps: number;
+  topSpeed: number | null;
+  compoundLaps: Record<string, number>;
+}
+
+export interface SeasonIndex {
+  version: 1;
+  year: number;
+  sessions: SeasonIndexSession[];    // by round, then practice -> qualifying -> race
+  drivers: SeasonIndexDriver[];
+}
+
+/** app/data/telemetry/live/{label}/head.json, written in --watch mode (scripts/lib/watch.py) */
+export interface TelemetryLiveHead {
+  seq: number;                       // latest delta file
+  compactedThrough: number;          // deltas up to here are folded into `output`
+  output: string;                    // session JSON filename
+  finished: boolean;
+}
+
+/** app/data/telemetry/live/{label}/{seq:06d}.json — only what arrived since the previous delta */
+export interface TelemetryLiveDelta {
+  seq: number;
+  lapData: Partial<TelemetryLap>[];  // timing feed fields only: lap/sector times, position
+  raceControlMessages: TelemetryRaceControlMessage[];
+  teamRadioMessages: TelemetryTeamRadio[];
+}
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make `fetch_telemetry` and `lib.*` importable the same way the script sees them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,63 @@
+"""
+Test-only variants of the synthetic sessions in synthetic.py.
+
+LoadingSession behaves like FastF1 around load(): only the requested data
+is available, and loading fills a stand-in FastF1 cache.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastf1.exceptions import DataNotLoadedError
+
+from synthetic import SyntheticSession
+
+
+class LoadingSession(SyntheticSession):
+    """A SyntheticSession whose data, like FastF1's, exists only once loaded.
+
+    load() writes a stand-in for each FastF1 cache file the requested flags
+    would fill under cache_root, and every call is kept in load_calls.
+    """
+
+    DATA = {
+        "laps": ("laps", "track_status"),
+        "telemetry": ("t0_date",),  # FastF1 derives t0_date from the car data
+        "weather": ("weather_data",),
+        "messages": ("race_control_messages",),
+    }
+    CACHE_FILES = {
+        "laps": ("_extended_timing_data", "timing_app_data", "track_status_data"),
+        "telemetry": ("car_data", "position_data"),
+        "weather": ("weather_data",),
+        "messages": ("race_control_messages",),
+    }
+
+    def __init__(self, cache_root: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = Path(cache_root) / self.api_path.removeprefix("/static/")
+        self._source = {name: self.__dict__.pop(name) for names in self.DATA.values() for name in names}
+        self.load_calls: list[dict] = []
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get("_source", {}):
+            try:
+                return self.__dict__[f"_{name}"]
+            except KeyError:
+                raise DataNotLoadedError(f"The data you are trying to access has not been loaded yet ({name})") from None
+        raise AttributeError(name)
+
+    def load(self, **kwargs):
+        super().load(**kwargs)
+        self.load_calls.append(kwargs)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for file in ("session_info", "driver_info"):
+            (self.cache_dir / f"{file}.ff1pkl").write_bytes(file.encode())
+        for flag, names in self.DATA.items():
+            if not kwargs.get(flag, True):
+                continue
+            for name in names:
+                self.__dict__[f"_{name}"] = self._source[name]
+            for file in self.CACHE_FILES[flag]:
+                (self.cache_dir / f"{file}.ff1pkl").write_bytes(file.encode())
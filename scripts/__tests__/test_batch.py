@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+import fetch_telemetry
+from fetch_telemetry import (
+    output_filename,
+    parse_rounds,
+    parse_session_types,
+    run_batch,
+    run_job,
+    session_label,
+)
+from lib.seasonindex import OUTPUT_PATTERN
+
+
+def fake_worker(job):
+    year, round_num, session_type = job
+    ok = round_num != 2
+    return {
+        "job": job,
+        "ok": ok,
+        "output": f"{year}-{round_num}-{session_type}.json" if ok else None,
+        "error": None if ok else "ValueError: boom",
+        "seconds": 0.0,
+        "log": "",
+    }
+
+
+def test_parse_rounds():
+    assert parse_rounds("1-3,8, 2") == [1, 2, 3, 8]
+    with pytest.raises(ValueError):
+        parse_rounds("5-3")
+
+
+def test_parse_session_types():
+    assert parse_session_types("r, q,R,sq") == ["R", "Q", "SQ"]
+
+
+def test_non_race_sessions_get_their_own_files():
+    assert output_filename(2025, 1, "australian-grand-prix") == "2025-R01-australian-grand-prix.json"
+    assert output_filename(2025, 1, "australian-grand-prix", "Q") == "2025-R01-australian-grand-prix.q.json"
+    assert session_label(2025, 6, "SQ") == "2025-R06-SQ"
+
+
+def test_round_listing_only_takes_the_race_file():
+    # The pattern the telemetry manifest and app/lib/telemetry.ts list rounds with
+    listing = re.compile(r"^(\d{4})-R(\d{2})-([^.]+)\.json$")
+    race = output_filename(2025, 4, "bahrain-grand-prix")
+    assert listing.match(race).group(3) == "bahrain-grand-prix"
+    for session_type in ("Q", "S", "SQ"):
+        name = output_filename(2025, 4, "bahrain-grand-prix", session_type)
+        assert not listing.match(name)
+        assert OUTPUT_PATTERN.match(name)  # still summarized in the season index
+
+
+def test_run_job_isolates_failures(monkeypatch):
+    def boom(year, round_num, session_type):
+        print("loading...")
+        raise RuntimeError("no data")
+
+    monkeypatch.setattr(fetch_telemetry, "fetch_telemetry", boom)
+    result = run_job((2025, 1, "R"))
+    assert result["ok"] is False
+    assert result["error"] == "RuntimeError: no data"
+    assert result["log"] == "loading...\n"
+
+
+def test_run_batch_returns_results_in_job_order():
+    jobs = [(2025, r, s) for r in (1, 2, 3) for s in ("R", "Q")]
+    results = run_batch(jobs, max_workers=3, worker=fake_worker)
+    assert [r["job"] for r in results] == jobs
+    assert [r["ok"] for r in results] == [True, True, False, False, True, True]
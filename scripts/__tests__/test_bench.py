@@ -0,0 +1,32 @@
+from bench_telemetry import append_record, build_cases, compare, find_baseline, load_history, time_case
+
+
+def _record(commit, median):
+    return {"commit": commit, "results": {"race": {"laps": {"median": median}, "write": {"median": 0.2}}}}
+
+
+def test_history_round_trip_and_baseline_lookup(tmp_path):
+    path = tmp_path / "bench.jsonl"
+    assert load_history(path) == []
+    for record in (_record("aaa1111", 0.10), _record("bbb2222", 0.12), _record("aaa1111", 0.11)):
+        append_record(record, path)
+
+    history = load_history(path)
+    assert len(history) == 3
+    assert find_baseline(history, None)["results"]["race"]["laps"]["median"] == 0.11
+    assert find_baseline(history, "bbb")["commit"] == "bbb2222"
+    assert find_baseline(history, "ccc") is None
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    rows = compare(_record("new", 0.15), _record("old", 0.10), threshold=0.10)
+    by_case = {row["case"]: row for row in rows}
+    assert by_case["laps"]["ratio"] == 1.5 and by_case["laps"]["regression"]
+    assert by_case["write"]["ratio"] == 1.0 and not by_case["write"]["regression"]
+
+
+def test_sprint_cases_run():
+    cases = dict(build_cases("sprint"))
+    assert {"rotate_coords", "compute_track_boundary", "extract_drs_zones", "laps", "write"} <= set(cases)
+    timing = time_case(cases["extract_drs_zones"], repeat=2)
+    assert timing["repeat"] == 2 and timing["min"] <= timing["median"] <= timing["max"]
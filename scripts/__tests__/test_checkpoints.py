@@ -0,0 +1,60 @@
+from lib.checkpoints import CheckpointStore, hash_tree, stage_keys
+
+STAGES = {
+    "laps": (1, ()),
+    "telemetry": (1, ("laps",)),
+    "drs_zones": (1, ("telemetry",)),
+    "weather": (1, ()),
+}
+IDENTITY = {"year": 2025, "round": 1, "session": "R"}
+
+
+def test_hash_tree_tracks_names_and_contents(tmp_path):
+    assert hash_tree(tmp_path / "missing") is None
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "car_data.ff1pkl").write_bytes(b"x" * 10)
+    first = hash_tree(tmp_path)
+    assert hash_tree(tmp_path) == first
+    (tmp_path / "a" / "car_data.ff1pkl").write_bytes(b"y" * 10)
+    assert hash_tree(tmp_path) != first
+    (tmp_path / "a" / "car_data.ff1pkl").rename(tmp_path / "a" / "pos_data.ff1pkl")
+    assert hash_tree(tmp_path) not in (first, None)
+
+
+def test_keys_chain_through_upstream_versions_and_options():
+    base = stage_keys(STAGES, IDENTITY, "abc")
+    bumped = stage_keys({**STAGES, "laps": (2, ())}, IDENTITY, "abc")
+    assert bumped["telemetry"] != base["telemetry"] and bumped["drs_zones"] != base["drs_zones"]
+    assert bumped["weather"] == base["weather"]
+
+    sampled = stage_keys(STAGES, IDENTITY, "abc", {"telemetry": {"sampling": "fixed"}})
+    assert sampled["laps"] == base["laps"] and sampled["telemetry"] != base["telemetry"]
+    assert stage_keys(STAGES, IDENTITY, "def")["weather"] != base["weather"]
+
+    per_stage = stage_keys(STAGES, IDENTITY, {"laps": "abc", "weather": "new"})
+    assert per_stage["laps"] == stage_keys(STAGES, IDENTITY, {"laps": "abc", "weather": "old"})["laps"]
+    assert per_stage["weather"] != base["weather"]
+
+
+def test_store_round_trip_and_plan(tmp_path):
+    store = CheckpointStore(tmp_path, "2025-R01")
+    keys = stage_keys(STAGES, IDENTITY, "abc")
+    assert store.plan(STAGES, keys) == {name: "no checkpoint" for name in STAGES}
+
+    for name in STAGES:
+        store.save(name, keys[name], {"stage": name, "rows": [1, None, 2.5]})
+    assert store.load("telemetry") == {"stage": "telemetry", "rows": [1, None, 2.5]}
+    assert store.plan(STAGES, keys) == {name: None for name in STAGES}
+    assert not list(store.dir.glob(".*.part"))
+
+    assert store.plan(STAGES, keys, force={"telemetry"}) == {
+        "laps": None,
+        "telemetry": "forced",
+        "drs_zones": "upstream telemetry forced",
+        "weather": None,
+    }
+    changed = stage_keys(STAGES, IDENTITY, "xyz")
+    assert set(store.plan(STAGES, changed).values()) == {"inputs or code changed"}
+
+    (store.dir / "weather.json").write_text("not json")
+    assert store.plan(STAGES, keys)["weather"] == "no checkpoint"
@@ -0,0 +1,275 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fetch_telemetry import safe_int
+from lib.columnar import (
+    seconds_column,
+    serialize_laps,
+    serialize_race_control,
+    serialize_results,
+    serialize_stints,
+    serialize_weather,
+)
+
+# ---------------------------------------------------------------------------
+# Reference per-row serializers — the iterrows() path fetch_telemetry used
+# before the columnar layer. Kept verbatim as the equivalence oracle.
+# ---------------------------------------------------------------------------
+
+
+def format_lap_time(td) -> float | None:
+    return None if pd.isna(td) else td.total_seconds()
+
+
+def safe_float(val) -> float | None:
+    return None if pd.isna(val) else float(val)
+
+
+def safe_bool(val) -> bool | None:
+    return None if pd.isna(val) else bool(val)
+
+
+def safe_str(val) -> str | None:
+    return None if pd.isna(val) else str(val)
+
+
+def rows_results(results):
+    out = []
+    for _, row in results.iterrows():
+        out.append({
+            "number": int(row["DriverNumber"]),
+            "abbreviation": str(row["Abbreviation"]),
+            "fullName": f"{row['FirstName']} {row['LastName']}",
+            "teamName": str(row["TeamName"]),
+            "teamColor": f"#{row['TeamColor']}" if pd.notna(row.get("TeamColor")) else None,
+            "position": safe_int(row.get("Position")),
+            "classifiedPosition": safe_str(row.get("ClassifiedPosition")),
+            "gridPosition": safe_int(row.get("GridPosition")),
+            "status": str(row.get("Status", "")),
+            "points": safe_float(row.get("Points")),
+            "time": format_lap_time(row.get("Time")),
+            "q1": format_lap_time(row.get("Q1")),
+            "q2": format_lap_time(row.get("Q2")),
+            "q3": format_lap_time(row.get("Q3")),
+        })
+    return out
+
+
+def rows_laps(laps):
+    out = []
+    for _, lap in laps.iterrows():
+        out.append({
+            "driverNumber": int(lap["DriverNumber"]),
+            "lapNumber": int(lap["LapNumber"]),
+            "lapTime": format_lap_time(lap.get("LapTime")),
+            "sector1": format_lap_time(lap.get("Sector1Time")),
+            "sector2": format_lap_time(lap.get("Sector2Time")),
+            "sector3": format_lap_time(lap.get("Sector3Time")),
+            "speedI1": safe_float(lap.get("SpeedI1")),
+            "speedI2": safe_float(lap.get("SpeedI2")),
+            "speedFL": safe_float(lap.get("SpeedFL")),
+            "speedST": safe_float(lap.get("SpeedST")),
+            "compound": safe_str(lap.get("Compound")),
+            "tyreLife": safe_int(lap.get("TyreLife")),
+            "freshTyre": safe_bool(lap.get("FreshTyre")),
+            "stint": safe_int(lap.get("Stint")),
+            "position": safe_int(lap.get("Position")),
+            "trackStatus": safe_str(lap.get("TrackStatus")),
+            "isPersonalBest": safe_bool(lap.get("IsPersonalBest")),
+            "isAccurate": safe_bool(lap.get("IsAccurate")),
+            "deleted": safe_bool(lap.get("Deleted")),
+            "deletedReason": safe_str(lap.get("DeletedReason")),
+            "isPitOutLap": bool(lap.get("PitOutTime") is not pd.NaT and pd.notna(lap.get("PitOutTime"))),
+            "isPitInLap": bool(lap.get("PitInTime") is not pd.NaT and pd.notna(lap.get("PitInTime"))),
+        })
+    return out
+
+
+def rows_weather(weather):
+    out = []
+    for _, row in weather.iterrows():
+        out.append({
+            "airTemp": safe_float(row.get("AirTemp")),
+            "trackTemp": safe_float(row.get("TrackTemp")),
+            "humidity": safe_float(row.get("Humidity")),
+            "pressure": safe_float(row.get("Pressure")),
+            "rainfall": safe_bool(row.get("Rainfall")),
+            "windDirection": safe_int(row.get("WindDirection")),
+            "windSpeed": safe_float(row.get("WindSpeed")),
+        })
+    return out
+
+
+def rows_race_control(messages):
+    out = []
+    for _, row in messages.iterrows():
+        out.append({
+            "lapNumber": safe_int(row.get("Lap")),
+            "category": safe_str(row.get("Category")),
+            "flag": safe_str(row.get("Flag")),
+            "scope": safe_str(row.get("Scope")),
+            "sector": safe_int(row.get("Sector")),
+            "driverNumber": safe_str(row.get("RacingNumber")),
+            "message": str(row.get("Message", "")),
+        })
+    return out
+
+
+def rows_stints(all_laps):
+    out = []
+    for driver_num in all_laps["DriverNumber"].unique():
+        driver_laps = all_laps[all_laps["DriverNumber"] == driver_num].sort_values("LapNumber")
+        for stint_num, stint_laps in driver_laps.groupby("Stint"):
+            compound = stint_laps["Compound"].iloc[0] if pd.notna(stint_laps["Compound"].iloc[0]) else "UNKNOWN"
+            fresh = (
+                stint_laps["FreshTyre"].iloc[0]
+                if "FreshTyre" in stint_laps.columns and pd.notna(stint_laps["FreshTyre"].iloc[0])
+                else None
+            )
+            out.append({
+                "driverNumber": int(driver_num),
+                "stintNumber": int(stint_num),
+                "compound": str(compound),
+                "freshTyre": bool(fresh) if fresh is not None else None,
+                "lapStart": int(stint_laps["LapNumber"].min()),
+                "lapEnd": int(stint_laps["LapNumber"].max()),
+            })
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Synthetic FastF1-shaped tables (same dtypes as fastf1.core)
+# ---------------------------------------------------------------------------
+
+rng = np.random.default_rng(7)
+
+
+def _sprinkle_nan(values, rate=0.05):
+    values = pd.Series(values)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def _timedeltas(n, low, high, rate=0.05):
+    ns = rng.integers(int(low * 1e9), int(high * 1e9), size=n)
+    series = pd.Series(pd.to_timedelta(ns, unit="ns"))
+    series[rng.random(n) < rate] = pd.NaT
+    return series
+
+
+def make_results(n=20):
+    return pd.DataFrame({
+        "DriverNumber": [str(i) for i in range(1, n + 1)],
+        "Abbreviation": [f"D{i:02d}" for i in range(n)],
+        "FirstName": [f"First{i}" for i in range(n)],
+        "LastName": _sprinkle_nan([f"Last{i}" for i in range(n)], 0.1),
+        "TeamName": [f"Team {i // 2}" for i in range(n)],
+        "TeamColor": _sprinkle_nan(["3671C6"] * n, 0.2),
+        "Position": _sprinkle_nan(rng.integers(1, n + 1, size=n).astype(float), 0.1).astype(float),
+        "ClassifiedPosition": _sprinkle_nan([str(i) for i in range(1, n)] + ["R"], 0.1),
+        "GridPosition": rng.integers(0, n + 1, size=n).astype(float),
+        "Status": _sprinkle_nan(["Finished"] * (n - 2) + ["+1 Lap", "Retired"], 0.1),
+        "Points": _sprinkle_nan(rng.choice([0.0, 1.0, 25.0, 18.5], size=n), 0.1).astype(float),
+        "Time": _timedeltas(n, 5000, 6000, 0.2),
+        "Q1": _timedeltas(n, 80, 95),
+        "Q2": _timedeltas(n, 80, 95, 0.3),
+        "Q3": _timedeltas(n, 80, 95, 0.5),
+    })
+
+
+def make_laps(n=1200):
+    bools = lambda rate: _sprinkle_nan((rng.random(n) < 0.5).astype(object), rate)  # noqa: E731
+    return pd.DataFrame({
+        "DriverNumber": [str(i % 20 + 1) for i in range(n)],
+        "LapNumber": np.arange(n, dtype=float) // 20 + 1,
+        "LapTime": _timedeltas(n, 78, 120),
+        "Sector1Time": _timedeltas(n, 20, 40),
+        "Sector2Time": _timedeltas(n, 20, 40),
+        "Sector3Time": _timedeltas(n, 20, 40),
+        "SpeedI1": _sprinkle_nan(rng.uniform(200, 330, size=n)).astype(float),
+        "SpeedI2": _sprinkle_nan(rng.uniform(200, 330, size=n)).astype(float),
+        "SpeedFL": _sprinkle_nan(rng.uniform(200, 330, size=n)).astype(float),
+        "SpeedST": _sprinkle_nan(rng.uniform(200, 340, size=n)).astype(float),
+        "Compound": _sprinkle_nan(rng.choice(["SOFT", "MEDIUM", "HARD"], size=n)),
+        "TyreLife": _sprinkle_nan(rng.integers(1, 40, size=n).astype(float)).astype(float),
+        "FreshTyre": bools(0.05),
+        "Stint": _sprinkle_nan(rng.integers(1, 4, size=n).astype(float)).astype(float),
+        "Position": _sprinkle_nan(rng.integers(1, 21, size=n).astype(float)).astype(float),
+        "TrackStatus": _sprinkle_nan(rng.choice(["1", "12", "4", "671"], size=n)),
+        "IsPersonalBest": bools(0.05),
+        "IsAccurate": rng.random(n) < 0.9,
+        "Deleted": bools(0.3),
+        "DeletedReason": _sprinkle_nan(["TRACK LIMITS AT TURN 4"] * n, 0.9),
+        "PitOutTime": _timedeltas(n, 100, 5000, 0.9),
+        "PitInTime": _timedeltas(n, 100, 5000, 0.9),
+    })
+
+
+def make_weather(n=150):
+    return pd.DataFrame({
+        "Time": _timedeltas(n, 0, 7200, 0),
+        "AirTemp": _sprinkle_nan(rng.uniform(15, 35, size=n)).astype(float),
+        "TrackTemp": rng.uniform(20, 55, size=n),
+        "Humidity": rng.uniform(20, 90, size=n),
+        "Pressure": rng.uniform(990, 1020, size=n),
+        "Rainfall": rng.random(n) < 0.1,
+        "WindDirection": rng.integers(0, 360, size=n),
+        "WindSpeed": rng.uniform(0, 8, size=n),
+    })
+
+
+def make_race_control(n=80):
+    return pd.DataFrame({
+        "Time": pd.date_range("2025-03-16 04:00", periods=n, freq="min"),
+        "Category": rng.choice(["Flag", "Other", "SafetyCar", "Drs"], size=n),
+        "Message": _sprinkle_nan([f"MESSAGE {i}" for i in range(n)], 0.05),
+        "Status": _sprinkle_nan(["ENABLED"] * n, 0.8),
+        "Flag": _sprinkle_nan(rng.choice(["GREEN", "YELLOW", "CLEAR"], size=n), 0.4),
+        "Scope": _sprinkle_nan(rng.choice(["Track", "Sector", "Driver"], size=n), 0.4),
+        "Sector": _sprinkle_nan(rng.integers(1, 20, size=n).astype(float), 0.7).astype(float),
+        "RacingNumber": _sprinkle_nan([str(i % 20 + 1) for i in range(n)], 0.7),
+        "Lap": rng.integers(1, 58, size=n),
+    })
+
+
+def _dump(records):
+    return json.dumps(records, indent=2)
+
+
+@pytest.mark.parametrize(
+    ("make", "columnar", "per_row"),
+    [
+        (make_results, serialize_results, rows_results),
+        (make_laps, serialize_laps, rows_laps),
+        (make_weather, serialize_weather, rows_weather),
+        (make_race_control, serialize_race_control, rows_race_control),
+        (make_laps, serialize_stints, rows_stints),
+    ],
+)
+def test_columnar_matches_per_row_bytes(make, columnar, per_row):
+    frame = make()
+    assert _dump(columnar(frame)) == _dump(per_row(frame))
+
+
+def test_missing_optional_columns_serialize_as_none():
+    laps = make_laps(40).drop(columns=["Deleted", "DeletedReason", "PitInTime", "SpeedST"])
+    assert _dump(serialize_laps(laps)) == _dump(rows_laps(laps))
+
+
+def test_empty_and_none_tables():
+    assert serialize_laps(None) == []
+    assert serialize_weather(pd.DataFrame()) == []
+
+
+def test_seconds_column_matches_timedelta_total_seconds():
+    ns = rng.integers(-(10**15), 10**15, size=5000)
+    frame = pd.DataFrame({"t": pd.to_timedelta(ns, unit="ns")})
+    assert seconds_column(frame, "t") == [td.total_seconds() for td in frame["t"]]
+
+
+def test_stints_without_fresh_tyre_column():
+    laps = make_laps(200).drop(columns=["FreshTyre"])
+    assert _dump(serialize_stints(laps)) == _dump(rows_stints(laps))
@@ -0,0 +1,50 @@
+import numpy as np
+
+from lib.decimate import DEFAULT_TOLERANCES, decimate_telemetry, simplify_indices
+from synthetic import make_lap_telemetry as make_lap
+
+
+def _max_error(tel, idx, name):
+    d = tel["Distance"].to_numpy()
+    v = tel[name].to_numpy(dtype=float)
+    return np.abs(np.interp(d, d[idx], v[idx]) - v).max()
+
+
+def test_all_channels_within_tolerance():
+    tel = make_lap(n=3000)
+    sampled, stats = decimate_telemetry(tel)
+    idx = tel.index.get_indexer(sampled.index)
+
+    assert stats["source"] == len(tel)
+    assert stats["points"] == len(sampled) < len(tel) // 4
+    assert idx[0] == 0 and idx[-1] == len(tel) - 1
+    for name, tol in DEFAULT_TOLERANCES.items():
+        assert _max_error(tel, idx, name) <= tol + 1e-9
+        assert stats["maxError"][name] <= tol
+
+
+def test_step_channels_keep_every_transition():
+    tel = make_lap(n=3000)
+    sampled, _ = decimate_telemetry(tel)
+    for name in ("Brake", "nGear"):
+        full = tel[name].to_numpy()
+        edges = np.flatnonzero(full[1:] != full[:-1])
+        assert set(edges) <= set(sampled.index)
+        assert set(edges + 1) <= set(sampled.index)
+
+
+def test_beats_fixed_stride_at_same_size():
+    tel = make_lap(n=3000)
+    sampled, stats = decimate_telemetry(tel)
+    stride = len(tel) // stats["points"] + 1
+    fixed = np.arange(0, len(tel), stride)
+    idx = tel.index.get_indexer(sampled.index)
+    assert len(fixed) <= stats["points"]
+    assert _max_error(tel, idx, "Speed") < _max_error(tel, fixed, "Speed")
+
+
+def test_short_and_flat_inputs():
+    assert simplify_indices(np.array([0.0, 1.0]), {}, {}).tolist() == [0, 1]
+    d = np.arange(100, dtype=float)
+    kept = simplify_indices(d, {"Speed": np.full(100, 200.0)}, {"Speed": 1.0})
+    assert kept.tolist() == [0, 99]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from lib.deltas import bin_edges, compute_driver_deltas, delta_tables, elapsed_time, resample_times
+
+
+def trace(driver, speed_kmh, length=1000.0, n=101, offset=0.0):
+    distance = np.linspace(offset, length, n)
+    speed = np.broadcast_to(np.asarray(speed_kmh, dtype=float), distance.shape)
+    return {"driverNumber": driver, "distance": distance.tolist(), "speed": speed.tolist()}
+
+
+def test_elapsed_time_at_constant_speed():
+    distance, elapsed = elapsed_time([0.0, 50.0, 100.0], [36.0, 36.0, 36.0])
+    np.testing.assert_allclose(elapsed, [0.0, 5.0, 10.0])
+    # Backwards steps add no time; standing still does not divide by zero
+    _, elapsed = elapsed_time([0.0, 10.0, 5.0, 20.0], [0.0, 36.0, 36.0, 36.0])
+    assert np.all(np.isfinite(elapsed)) and np.all(np.diff(elapsed) >= 0)
+
+
+def test_traces_are_aligned_by_distance_not_index():
+    # Same 180 km/h lap sampled at different positions (and density)
+    a = trace(1, 180.0, n=101)
+    b = trace(44, 180.0, n=37, offset=3.0)
+    times = resample_times([a, b], bin_edges([a, b], bins=10))
+    np.testing.assert_allclose(times[0], times[1], atol=1e-3)
+
+
+def test_delta_tables_broadcast_over_pairs():
+    times = np.array([
+        [0.0, 1.0, 2.0, 3.0],
+        [0.0, 1.1, 2.1, 2.9],
+        [0.0, 1.0, 2.0, 3.0],
+    ])
+    tables = delta_tables(times)
+    assert tables["binTime"].tolist() == [[1000, 1000, 1000], [1100, 1000, 800], [1000, 1000, 1000]]
+    assert tables["cumulativeDelta"].shape == (3, 3, 3)
+    assert tables["cumulativeDelta"][0, 1].tolist() == [100, 100, -100]
+    np.testing.assert_array_equal(tables["cumulativeDelta"], -tables["cumulativeDelta"].transpose(1, 0, 2))
+    assert tables["dominance"][0, 1].tolist() == [1, 0, -1]
+    assert tables["dominance"][0, 2].tolist() == [0, 0, 0]
+    assert not tables["cumulativeDelta"][np.arange(3), np.arange(3)].any()
+
+
+def test_compute_driver_deltas():
+    speed = np.r_[np.full(50, 200.0), np.full(51, 100.0)]
+    fast_then_slow = trace(1, speed)
+    steady = trace(16, 150.0)
+    deltas = compute_driver_deltas([fast_then_slow, steady, {"driverNumber": 4, "distance": [], "speed": []}], bins=4)
+
+    assert deltas["drivers"] == [1, 16]
+    assert deltas["binEdges"] == [0.0, 250.0, 500.0, 750.0, 1000.0]
+    assert deltas["dominance"][0][1] == [1, 1, -1, -1]
+    gap = deltas["cumulativeDelta"][0][1]
+    assert gap[1] > gap[0] > 0 and gap[3] < gap[2]
+    assert sum(deltas["binTime"][1]) == pytest.approx(24000, abs=1)
+
+
+def test_needs_two_drivers():
+    assert compute_driver_deltas([trace(1, 200.0)]) is None
+    assert compute_driver_deltas([]) is None
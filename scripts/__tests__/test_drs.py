@@ -0,0 +1,101 @@
+import numpy as np
+
+from lib.drs import extract_drs_zones, nearest_indices
+
+
+def reference_zones(entries, distance_gap=200.0):
+    """The original per-point implementation, run over every entry."""
+    drs_distances = sorted(d for e in entries for d, on in zip(e["distance"], e["drs"]) if on)
+    if not drs_distances:
+        return []
+    zones = []
+    zone_start = zone_end = drs_distances[0]
+    for d in drs_distances[1:]:
+        if d - zone_end > distance_gap:
+            zones.append((zone_start, zone_end))
+            zone_start = d
+        zone_end = d
+    zones.append((zone_start, zone_end))
+
+    ref_dist, ref_x, ref_y = (np.array(entries[0][k]) for k in ("distance", "x", "y"))
+    result = []
+    for start_d, end_d in zones:
+        si = int(np.argmin(np.abs(ref_dist - start_d)))
+        ei = int(np.argmin(np.abs(ref_dist - end_d)))
+        result.append({
+            "startDistance": round(start_d, 1),
+            "endDistance": round(end_d, 1),
+            "startX": round(float(ref_x[si]), 1),
+            "startY": round(float(ref_y[si]), 1),
+            "endX": round(float(ref_x[ei]), 1),
+            "endY": round(float(ref_y[ei]), 1),
+        })
+    return result
+
+
+def make_entry(driver, zones, seed, n=600, length=5300.0):
+    rng = np.random.default_rng(seed)
+    distance = np.sort(rng.uniform(0, length, n))
+    drs = np.zeros(n, dtype=bool)
+    for start, end in zones:
+        drs |= (distance >= start + rng.uniform(-20, 20)) & (distance <= end + rng.uniform(-20, 20))
+    return {
+        "driverNumber": driver,
+        "distance": distance.tolist(),
+        "drs": drs.tolist(),
+        "x": (distance * 3).tolist(),
+        "y": np.sin(distance / 500).tolist(),
+    }
+
+
+def test_matches_per_point_clustering_across_all_drivers():
+    zones = [(300, 900), (2000, 2600), (4200, 4900)]
+    # Only driver 7 uses the third zone, beyond the old first-five-drivers cut-off
+    entries = [make_entry(d, zones[:2], seed=d) for d in range(1, 7)] + [make_entry(7, zones, seed=7)]
+
+    result = extract_drs_zones(entries)
+    assert len(result) == 3
+    assert [{k: v for k, v in z.items() if k != "usage"} for z in result] == reference_zones(entries)
+
+
+def test_usage_per_driver_and_lap():
+    lap = {"distance": [0, 100, 200, 300, 400, 2000, 2100, 2200], "drs": [0, 1, 1, 0, 0, 1, 1, 0]}
+    entries = [
+        {"driverNumber": 44, "lapNumber": 1, "x": list(range(8)), "y": list(range(8)), **lap},
+        {"driverNumber": 44, "lapNumber": 2, **lap},
+        {"driverNumber": 1, "lapNumber": 1, "distance": lap["distance"], "drs": [0, 0, 1, 1, 0, 0, 0, 0]},
+    ]
+    first, second = extract_drs_zones(entries)
+
+    assert (first["startDistance"], first["endDistance"]) == (100, 300)
+    assert first["usage"] == [
+        {"driverNumber": 44, "activations": 2, "distance": 200.0},
+        {"driverNumber": 1, "activations": 1, "distance": 100.0},
+    ]
+    assert (second["startX"], second["endX"]) == (5, 6)
+    assert second["usage"] == [{"driverNumber": 44, "activations": 2, "distance": 200.0}]
+
+
+def test_runs_do_not_join_across_entries():
+    # Open at the end of one lap and the start of the next: two runs, not one
+    entries = [
+        {"driverNumber": 1, "distance": [0, 100, 5200, 5300], "drs": [1, 0, 0, 1]},
+        {"driverNumber": 1, "distance": [0, 100, 5200, 5300], "drs": [1, 0, 0, 1]},
+    ]
+    zones = extract_drs_zones(entries)
+    assert [(z["startDistance"], z["endDistance"]) for z in zones] == [(0, 0), (5300, 5300)]
+    assert zones[0]["usage"][0]["activations"] == 2
+
+
+def test_empty_and_inactive():
+    assert extract_drs_zones([]) == []
+    assert extract_drs_zones([{"distance": [0, 1], "drs": [False, False]}]) == []
+
+
+def test_nearest_indices_matches_argmin():
+    rng = np.random.default_rng(3)
+    values = np.sort(rng.uniform(0, 100, 50))
+    values[10] = values[11]  # duplicate
+    targets = np.r_[rng.uniform(-10, 110, 200), values[:5], (values[20] + values[21]) / 2]
+    expected = [int(np.argmin(np.abs(values - t))) for t in targets]
+    assert nearest_indices(values, targets).tolist() == expected
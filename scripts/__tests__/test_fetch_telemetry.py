@@ -0,0 +1,373 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+import fetch_telemetry
+from fakes import LoadingSession
+from lib.laparchive import LapArchive
+from synthetic import SyntheticSession, make_lap_telemetry
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Run fetch_telemetry against SyntheticSession with outputs under tmp_path."""
+    monkeypatch.setattr(fetch_telemetry, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(fetch_telemetry, "OUTPUT_DIR", tmp_path / "telemetry")
+    monkeypatch.setattr(fetch_telemetry, "RADIO_DIR", tmp_path / "radio")
+    monkeypatch.setattr(fetch_telemetry, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(fetch_telemetry, "SEASON_INDEX_DIR", tmp_path / "index")
+    monkeypatch.setattr(fetch_telemetry, "LIVETIMING_BASE", "http://127.0.0.1:9")  # refused -> no radio
+    monkeypatch.setattr(fetch_telemetry.fastf1.Cache, "enable_cache", lambda *a, **k: None)
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", lambda *a, **k: SyntheticSession(drivers=6, laps=10))
+    return tmp_path
+
+
+def test_writes_session_json(offline):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R")
+    assert path.name == "2025-R01-australian-grand-prix.json"
+    data = json.loads(path.read_text())
+    assert data["rotation"] == 92.0
+    assert len(data["drivers"]) == 6
+    assert len(data["lapData"]) == 60
+    assert len(data["telemetryData"]) == 6
+    assert len(data["stintData"]) == 18
+    assert "trackBoundary" in data
+    assert len(data["trackBoundary"]["bbox"]) == 4
+    # Decimated fastest laps (~280 points) are too close to the smallest level to get one
+    assert all(len(t["x"]) < 200 / 0.7 for t in data["telemetryData"])
+    assert "trackPaths" not in data
+    deltas = data["driverDeltas"]
+    assert deltas["drivers"] == [t["driverNumber"] for t in data["telemetryData"]]
+    assert len(deltas["cumulativeDelta"]) == len(deltas["dominance"]) == 6
+    context = data["lapContext"]
+    assert all(len(column) == 60 for column in context["laps"].values())
+    assert context["index"]["lapNumber"] == list(range(1, 11))
+    assert "SC" in context["index"]["trackState"]
+    assert sum(context["index"]["messageCount"]) > 0
+    assert "teamRadioMessages" not in data
+    assert not path.with_name(path.stem + ".profile.json").exists()
+
+
+def test_profile_report(offline):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", profile=True, profile_stage="telemetry")
+    report = json.loads(path.with_name(path.stem + ".profile.json").read_text())
+
+    names = [s["name"] for s in report["stages"]]
+    assert names == [n for n in fetch_telemetry.PROFILE_STAGES if n not in ("write_binary_traces", "all_laps_archive")]
+    stages = {s["name"]: s for s in report["stages"]}
+    assert stages["laps"]["counts"] == {"rows": 60, "drivers": 6}
+    assert stages["telemetry"]["counts"]["traces"] == 6
+    assert stages["telemetry"]["tracemalloc"]["peakBytes"] > 0
+    assert all(s["seconds"] >= 0 for s in report["stages"])
+    assert report["outputBytes"]["telemetryData"] > report["outputBytes"]["stintData"]
+    assert report["cprofile"].endswith(".telemetry.prof")
+
+
+def test_all_laps_archive(offline):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", archive_all_laps=True)
+    archive = LapArchive(path.with_suffix(".laps.bin"))
+
+    assert archive.drivers == [1, 2, 3, 4, 5, 6]
+    assert archive.laps(4) == list(range(1, 11))
+    assert archive.rotation == 92.0
+    lap = archive.lap(4, 7)
+    expected = make_lap_telemetry(seed=4 * 1000 + 7)
+    np.testing.assert_allclose(lap["speed"], expected["Speed"], rtol=1e-6)
+    assert lap["gear"].tolist() == expected["nGear"].tolist()
+
+
+def test_rerun_reassembles_from_checkpoints(offline, monkeypatch, capsys):
+    sessions = []
+
+    def get_session(*args, **kwargs):
+        sessions.append(SyntheticSession(drivers=6, laps=10))
+        return sessions[-1]
+
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", get_session)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R")
+    first = path.read_text()
+    assert sessions[0].load_kwargs is not None
+
+    # Everything current: no session.load(), identical output
+    path.unlink()
+    fetch_telemetry.fetch_telemetry(2025, 1, "R")
+    assert sessions[1].load_kwargs is None
+    assert path.read_text() == first
+
+    # Team radio failed last time, so it is the only stage left to retry
+    capsys.readouterr()
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", dry_run=True)
+    plan = capsys.readouterr().out
+    assert "team_radio     recompute: no checkpoint" in plan
+    assert "telemetry      cached" in plan
+
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", dry_run=True, force_stages=["telemetry"])
+    plan = capsys.readouterr().out
+    assert "telemetry      recompute: forced" in plan
+    assert "drs_zones      recompute: upstream telemetry forced" in plan
+    assert "laps           cached" in plan
+
+    # New lap data in the FastF1 cache invalidates the stages reading laps and those downstream
+    cache_dir = fetch_telemetry.session_cache_dir(sessions[0])
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "timing_app_data.ff1pkl").write_bytes(b"new")
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", dry_run=True)
+    plan = capsys.readouterr().out
+    assert plan.count("recompute: inputs or code changed") == len(fetch_telemetry.CHECKPOINT_STAGES) - 4
+    assert "drs_zones      recompute: inputs or code changed" in plan
+    assert "results        cached" in plan and "weather        cached" in plan
+    assert all(s.load_kwargs is None for s in sessions[2:])
+
+
+def test_runs_with_different_selections_share_checkpoints(offline, monkeypatch, capsys):
+    sessions = []
+
+    def get_session(*args, **kwargs):
+        sessions.append(LoadingSession(fetch_telemetry.CACHE_DIR, drivers=6, laps=10))
+        return sessions[-1]
+
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", get_session)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["weather"])
+    weather = json.loads(path.read_text())["weatherData"]
+    assert sessions[0].load_calls == [{"laps": False, "telemetry": False, "weather": True, "messages": False}]
+
+    # Caching laps, telemetry and messages leaves the weather checkpoint current
+    capsys.readouterr()
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", skip=["lap_context"])
+    out = capsys.readouterr().out
+    assert "Could not compute" not in out
+    assert sessions[1].load_calls == [{"laps": True, "telemetry": True, "weather": False, "messages": True}]
+    data = json.loads(path.read_text())
+    assert data["weatherData"] == weather
+    assert data["raceControlMessages"] and data["telemetryData"]
+
+
+def test_lap_context_without_telemetry_stage_skips_telemetry_load(offline, monkeypatch):
+    sessions = []
+
+    def get_session(*args, **kwargs):
+        sessions.append(LoadingSession(fetch_telemetry.CACHE_DIR, drivers=6, laps=10))
+        return sessions[-1]
+
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", get_session)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", skip=["telemetry"], checkpoints=False)
+    assert sessions[0].load_calls == [{"laps": True, "telemetry": False, "weather": True, "messages": True}]
+    skipped = json.loads(path.read_text())["lapContext"]
+
+    path.unlink()
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["lap_context"], checkpoints=False)
+    assert sessions[1].load_calls[0]["telemetry"] is False
+    assert json.loads(path.read_text())["lapContext"] == skipped
+
+
+def test_cache_refreshed_by_loading_reloads_stale_stages(offline, monkeypatch, capsys):
+    sessions = []
+
+    def get_session(*args, **kwargs):
+        sessions.append(LoadingSession(fetch_telemetry.CACHE_DIR, drivers=6, laps=10))
+        return sessions[-1]
+
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", get_session)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["weather"])
+    weather = json.loads(path.read_text())["weatherData"]
+
+    # FastF1 re-downloads the session info, which every stage reads: weather must be recomputed
+    load = LoadingSession.load
+
+    def refreshing_load(self, **kwargs):
+        load(self, **kwargs)
+        (self.cache_dir / "session_info.ff1pkl").write_bytes(b"refreshed")
+
+    monkeypatch.setattr(LoadingSession, "load", refreshing_load)
+    capsys.readouterr()
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["weather", "race_control"])
+    assert "Could not compute" not in capsys.readouterr().out
+    assert sessions[1].load_calls == [
+        {"laps": False, "telemetry": False, "weather": False, "messages": True},
+        {"laps": False, "telemetry": False, "weather": True, "messages": True},
+    ]
+    data = json.loads(path.read_text())
+    assert data["weatherData"] == weather and data["raceControlMessages"]
+
+
+def test_stage_selection():
+    assert fetch_telemetry.parse_stage_list("laps, stints,radio") == ["laps", "stints", "team_radio"]
+    with pytest.raises(ValueError):
+        fetch_telemetry.parse_stage_list("laps,tyres")
+
+    select = fetch_telemetry.select_stages
+    assert select(only=["laps", "stints", "weather"]) == ["laps", "stints", "weather"]
+    assert select(only=["drs_zones"]) == ["circuit_info", "laps", "telemetry", "drs_zones"]
+    assert select(skip=["telemetry", "team_radio"]) == [
+        "results", "laps", "stints", "weather", "race_control", "lap_context"
+    ]
+    assert select(skip=["results"])[-1] == "lap_context"
+    assert "lap_context" not in select(skip=["weather"])
+    assert select(only=["lap_context"]) == ["laps", "weather", "race_control", "lap_context"]
+    assert select() == list(fetch_telemetry.CHECKPOINT_STAGES)
+
+
+def test_only_loads_what_it_needs_and_merges_previous_output(offline, monkeypatch):
+    sessions = []
+
+    def get_session(*args, **kwargs):
+        sessions.append(SyntheticSession(drivers=6, laps=10, seed=len(sessions)))
+        return sessions[-1]
+
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", get_session)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R")
+    before = json.loads(path.read_text())
+
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["weather"], checkpoints=False)
+    after = json.loads(path.read_text())
+    assert sessions[1].load_kwargs == {"laps": False, "telemetry": False, "weather": True, "messages": False}
+    assert after["weatherData"] != before["weatherData"]
+    assert list(after) == list(before)
+    assert {k: v for k, v in after.items() if k != "weatherData"} == {
+        k: v for k, v in before.items() if k != "weatherData"
+    }
+
+
+def test_skip_without_previous_output_stays_schema_valid(offline):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", skip=["telemetry", "team_radio"])
+    data = json.loads(path.read_text())
+    required = ["year", "round", "eventName", "sessionType", "circuitName", "country", "rotation",
+                "drivers", "lapData", "telemetryData", "stintData"]
+    assert list(data)[:len(required)] == required
+    assert data["telemetryData"] == [] and data["rotation"] == 0.0
+    assert "trackBoundary" not in data and "drsZones" not in data
+    assert len(data["lapData"]) == 60 and data["weatherData"]
+
+
+def test_compact_output_with_gzip_sibling(offline, capsys):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", compress=("gz",))
+    raw = path.read_bytes()
+    assert b"\n" not in raw and b'"year":2025,' in raw
+    assert gzip.decompress(path.with_name(path.name + ".gz").read_bytes()) == raw
+    assert f"{path.name}.gz:" in capsys.readouterr().out
+
+    pretty = fetch_telemetry.fetch_telemetry(2025, 1, "R", indent=2)
+    assert json.loads(pretty.read_text()) == json.loads(raw)
+    assert pretty.read_text() == json.dumps(json.loads(raw), indent=2)
+
+
+def test_low_memory_mode_releases_session_data(offline, monkeypatch, capsys):
+    sessions = []
+
+    def get_session(*args, **kwargs):
+        # Whole-number car and position data: downcast to float32, merged in the channels' dtype
+        sessions.append(SyntheticSession(drivers=6, laps=10, channels=True))
+        return sessions[-1]
+
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", get_session)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", checkpoints=False)
+    normal = path.read_bytes()
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", checkpoints=False, low_memory=True)
+    out = capsys.readouterr().out
+
+    assert path.read_bytes() == normal
+    session = sessions[-1]
+    for name in ("laps", "track_status", "car_data", "pos_data", "weather_data", "race_control_messages"):
+        assert not hasattr(session, name)
+    # lap_context is the last stage reading laps, weather and race control
+    assert "Released laps, track_status after lap_context" in out
+    assert "Released weather_data after lap_context" in out
+    assert "Peak RSS:" in out
+
+
+def test_updates_season_index(offline, capsys):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R")
+    index = json.loads((offline / "index" / "2025.json").read_text())
+    assert [s["file"] for s in index["sessions"]] == [path.name]
+    assert len(index["drivers"]) == 6
+    fetch_telemetry.fetch_telemetry(2025, 1, "R")
+    assert "Season index unchanged" in capsys.readouterr().out
+
+
+def test_output_manifest_diffs_against_previous_run(offline):
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", compress=("gz",))
+    manifest = json.loads(path.with_suffix(".manifest.json").read_text())
+    keys = [f"telemetry/{path.name}", f"telemetry/{path.name}.gz"]
+    assert list(manifest["objects"]) == keys
+    assert manifest["objects"][keys[0]]["size"] == path.stat().st_size
+    assert manifest["changes"]["upload"] == keys
+
+    fetch_telemetry.fetch_telemetry(2025, 1, "R", compress=("gz",))
+    manifest = json.loads(path.with_suffix(".manifest.json").read_text())
+    assert manifest["changes"] == {"upload": [], "removed": [], "unchanged": 2}
+
+
+class RadioArchiveHandler(BaseHTTPRequestHandler):
+    """Serves a TeamRadio stream for SyntheticSession whose last clip repeats the first one's audio."""
+
+    api_path = SyntheticSession.api_path
+    stream = (
+        '00:00:01.000{"Captures":[{"Utc":"2025-03-16T04:00:00Z","RacingNumber":"1","Path":"TeamRadio/a.mp3"}]}\n'
+        '00:01:00.000{"Captures":{"1":{"Utc":"2025-03-16T04:01:00Z","RacingNumber":"1","Path":"TeamRadio/b.mp3"}}}\n'
+    ).encode()
+    files = {f"{api_path}TeamRadio.jsonStream": stream, f"{api_path}TeamRadio/a.mp3": b"audio", f"{api_path}TeamRadio/b.mp3": b"audio"}
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        self.send_response(200 if body is not None else 404)
+        self.send_header("Content-Length", str(len(body or b"")))
+        self.end_headers()
+        self.wfile.write(body or b"")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_duplicate_radio_clips_share_one_file(offline, monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RadioArchiveHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setattr(fetch_telemetry, "LIVETIMING_BASE", f"http://127.0.0.1:{httpd.server_address[1]}")
+        path = fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["team_radio"])
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    data = json.loads(path.read_text())
+    first = data["teamRadioMessages"][0]["audioFile"]
+    assert [m["audioFile"] for m in data["teamRadioMessages"]] == [first, first]
+    objects = json.loads(path.with_suffix(".manifest.json").read_text())["objects"]
+    clips = [key for key in objects if key.startswith("radio/")]
+    assert first == clips[0]
+    assert objects[clips[1]]["duplicateOf"] == clips[0]
+    assert objects[clips[0]]["contentType"] == "audio/mpeg"
+
+
+def test_every_audio_file_is_uploaded(offline, monkeypatch):
+    # A clip left over from an earlier run, with the same audio and a name sorting first
+    radio_dir = fetch_telemetry.RADIO_DIR / "2025-R01"
+    radio_dir.mkdir(parents=True)
+    (radio_dir / "000_1.mp3").write_bytes(b"audio")
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RadioArchiveHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setattr(fetch_telemetry, "LIVETIMING_BASE", f"http://127.0.0.1:{httpd.server_address[1]}")
+        path = fetch_telemetry.fetch_telemetry(2025, 1, "R", only=["team_radio"])
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    audio_files = {m["audioFile"] for m in json.loads(path.read_text())["teamRadioMessages"]}
+    manifest = json.loads(path.with_suffix(".manifest.json").read_text())
+    assert audio_files and audio_files <= set(manifest["changes"]["upload"])
+    assert manifest["objects"]["radio/2025-R01/000_1.mp3"]["duplicateOf"] in audio_files
+
+
+def test_unencodable_binary_traces_are_skipped(offline, monkeypatch, capsys):
+    def fail(*args):
+        raise ValueError("rpm out of range for <i2 at scale 1.0")
+
+    monkeypatch.setattr(fetch_telemetry, "write_traces", fail)
+    path = fetch_telemetry.fetch_telemetry(2025, 1, "R", binary_traces=True)
+    assert "Could not write binary traces: rpm out of range" in capsys.readouterr().out
+    assert not path.with_suffix(".traces.bin").exists()
+    assert len(json.loads(path.read_text())["telemetryData"]) == 6
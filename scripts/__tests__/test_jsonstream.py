@@ -0,0 +1,78 @@
+import gzip
+import json
+
+import pytest
+
+from lib import jsonstream
+from lib.jsonstream import JsonSectionWriter
+
+
+@pytest.fixture
+def document():
+    return {
+        "year": 2025,
+        "eventName": "São Paulo Grand Prix",
+        "rotation": 92.0,
+        "drivers": [],
+        "lapData": [{"lapTime": 81.25, "compound": None, "deleted": False, "n": i} for i in range(700)],
+        "trackBoundary": {"inner": {"x": [1.5, 2.5]}, "outer": {}},
+        "telemetryData": [{"speed": list(range(5)), "nested": [[1], []]}] * 300,
+    }
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_matches_json_dumps(document, tmp_path, indent):
+    path = tmp_path / "session.json"
+    with JsonSectionWriter(path, indent=indent) as writer:
+        for key, value in document.items():
+            writer.section(key, value)
+
+    separators = None if indent else (",", ":")
+    assert path.read_text() == json.dumps(document, indent=indent, separators=separators)
+    assert sum(writer.section_bytes.values()) == path.stat().st_size - 2 - (indent is not None)
+
+
+def test_empty_document(tmp_path):
+    with JsonSectionWriter(tmp_path / "a.json", indent=2):
+        pass
+    assert (tmp_path / "a.json").read_text() == "{}"
+
+
+def test_gzip_sibling(document, tmp_path):
+    path = tmp_path / "session.json"
+    with JsonSectionWriter(path, compress=("gz",)) as writer:
+        for key, value in document.items():
+            writer.section(key, value)
+
+    gz = tmp_path / "session.json.gz"
+    assert gzip.decompress(gz.read_bytes()) == path.read_bytes()
+    assert writer.sizes == {path: path.stat().st_size, gz: gz.stat().st_size}
+    assert gz.stat().st_size < path.stat().st_size / 5
+
+
+def test_brotli_sibling(document, tmp_path):
+    brotli = pytest.importorskip("brotli")
+    path = tmp_path / "session.json"
+    with JsonSectionWriter(path, compress=("br",)) as writer:
+        for key, value in document.items():
+            writer.section(key, value)
+    assert brotli.decompress((tmp_path / "session.json.br").read_bytes()) == path.read_bytes()
+
+
+def test_brotli_requires_package(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonstream, "brotli", None)
+    with pytest.raises(RuntimeError):
+        JsonSectionWriter(tmp_path / "a.json", compress=("br",))
+    with pytest.raises(ValueError):
+        JsonSectionWriter(tmp_path / "a.json", compress=("zip",))
+
+
+def test_failure_keeps_previous_output(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text('{"old":true}')
+    with pytest.raises(RuntimeError):
+        with JsonSectionWriter(path, compress=("gz",)) as writer:
+            writer.section("year", 2025)
+            raise RuntimeError("stage crashed")
+    assert path.read_text() == '{"old":true}'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["session.json"]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.laparchive import LapArchive, LapArchiveWriter
+from synthetic import make_lap_telemetry
+
+
+def test_round_trip_and_lap_slicing(tmp_path):
+    path = tmp_path / "2025-R01-test.laps.bin"
+    laps = {d: [(n, make_lap_telemetry(n=300 + n, seed=d * 100 + n)) for n in range(1, 6)] for d in (1, 44)}
+    with LapArchiveWriter(path, rotation=45.0) as writer:
+        for driver, driver_laps in laps.items():
+            assert writer.add_driver(driver, driver_laps) == sum(len(t) for _, t in driver_laps)
+
+    archive = LapArchive(path)
+    assert archive.drivers == [1, 44]
+    assert archive.laps(44) == [1, 2, 3, 4, 5]
+    assert archive.rotation == 45.0
+    for driver, driver_laps in laps.items():
+        for lap_number, tel in driver_laps:
+            lap = archive.lap(driver, lap_number)
+            assert len(lap["distance"]) == len(tel)
+            np.testing.assert_allclose(lap["x"], tel["X"], rtol=1e-6)
+            assert lap["brake"].astype(bool).tolist() == tel["Brake"].tolist()
+            assert lap["drs"].tolist() == tel["DRS"].tolist()
+            assert isinstance(lap["speed"].base, np.memmap) or isinstance(lap["speed"], np.memmap)
+    assert len(archive.channel(1, "speed")) == sum(len(t) for _, t in laps[1])
+
+
+def test_missing_values_and_columns(tmp_path):
+    tel = make_lap_telemetry(n=50).drop(columns=["Z"])
+    tel["RPM"] = tel["RPM"].astype(object)
+    tel.loc[3, "RPM"] = None
+    tel["nGear"] = tel["nGear"].astype("Int64")
+    tel.loc[4, "nGear"] = pd.NA
+    path = tmp_path / "x.laps.bin"
+    with LapArchiveWriter(path) as writer:
+        writer.add_driver(16, [(1, tel), (2, None), (3, tel.iloc[:0])])
+
+    archive = LapArchive(path)
+    assert archive.laps(16) == [1]
+    lap = archive.lap(16, 1)
+    assert np.isnan(lap["rpm"][3]) and lap["gear"][4] == -1
+    assert np.isnan(lap["z"]).all()
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    path = tmp_path / "x.laps.bin"
+    with pytest.raises(RuntimeError):
+        with LapArchiveWriter(path) as writer:
+            writer.add_driver(1, [(1, make_lap_telemetry(n=10))])
+            raise RuntimeError("boom")
+    assert not path.exists()
+
+
+def test_bad_magic(tmp_path):
+    path = tmp_path / "bad.laps.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        LapArchive(path)
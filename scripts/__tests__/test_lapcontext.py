@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from lib.lapcontext import build_lap_context, lap_windows, message_ranges, track_severity, weather_at
+
+
+def seconds(values):
+    return pd.to_timedelta(values, unit="s")
+
+
+def make_laps():
+    # Two drivers, three laps of 100 s each; driver 2 runs 5 s behind
+    return pd.DataFrame({
+        "DriverNumber": ["1", "1", "1", "2", "2", "2"],
+        "LapNumber": [1.0, 2.0, 3.0, 1.0, 2.0, 3.0],
+        "LapStartTime": seconds([0, 100, 200, 5, 105, 205]),
+        "Time": seconds([100, 200, 300, 105, 205, 305]),
+        "TrackStatus": ["1", "14", "1", "1", "41", "671"],
+    })
+
+
+def test_weather_is_the_last_sample_before_the_lap():
+    weather = pd.DataFrame({"Time": seconds([60, 0, 120, 240])})  # unsorted on purpose
+    starts = np.array([-1.0, 0.0, 100.0, 130.0, np.nan, 500.0])
+    assert weather_at(starts, weather).tolist() == [-1, 1, 0, 2, -1, 3]
+    assert weather_at(starts, None).tolist() == [-1] * 6
+
+
+def test_track_severity_from_status_series():
+    windows = lap_windows(make_laps())
+    status = pd.DataFrame({"Time": seconds([0, 150, 190, 260]), "Status": ["1", "4", "1", "6"]})
+    names = np.array(["GREEN", "YELLOW", "VSC_ENDING", "VSC", "SC", "RED"])
+    assert names[track_severity(windows, status)].tolist() == ["GREEN", "SC", "VSC", "GREEN", "SC", "VSC"]
+
+
+def test_track_severity_from_lap_codes():
+    laps = make_laps()
+    severity = track_severity(lap_windows(laps), None, laps["TrackStatus"].to_numpy())
+    assert severity.tolist() == [0, 4, 0, 0, 4, 3]
+
+
+def test_message_ranges():
+    windows = lap_windows(make_laps())
+    first, count = message_ranges(windows, np.array([50.0, 99.0, 100.0, 104.0, np.nan, 250.0]))
+    assert first.tolist() == [0, 2, 5, 0, 5, 5]
+    assert count.tolist() == [2, 3, 1, 5, 0, 1]
+
+
+def test_build_lap_context():
+    laps = make_laps()
+    weather = pd.DataFrame({"Time": seconds([0, 180])})
+    messages = pd.DataFrame({
+        "Time": pd.Timestamp("2025-03-16 03:00") + seconds([10, 150, 210]),
+        "Lap": [1, 2, 3],
+    })
+    context = build_lap_context(laps, weather, None, messages, pd.Timestamp("2025-03-16 03:00"))
+
+    assert context["laps"]["weather"] == [0, 0, 1, 0, 0, 1]
+    assert context["laps"]["trackState"] == ["GREEN", "SC", "GREEN", "GREEN", "SC", "VSC"]
+    assert context["laps"]["messageCount"] == [1, 1, 1, 1, 1, 1]
+    index = context["index"]
+    assert index["lapNumber"] == [1, 2, 3]
+    assert index["start"] == [0.0, 100.0, 200.0] and index["end"] == [105.0, 205.0, 305.0]
+    assert index["trackState"] == ["GREEN", "SC", "VSC"]
+    assert index["messageStart"] == [0, 1, 2]
+
+    # Without t0_date, messages fall back to their Lap column
+    by_lap = build_lap_context(laps, weather, None, messages)
+    assert by_lap["laps"]["messageStart"] == [0, 1, 2, 0, 1, 2]
+    assert build_lap_context(pd.DataFrame()) == {}
@@ -0,0 +1,126 @@
+import json
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lib.livetiming import LivetimingClient, iter_captures, parse_stream, stream_seconds
+
+API_PATH = "/static/2025/2025-03-16_Australian_Grand_Prix/2025-03-16_Race/"
+
+
+def capture(number: str, clip: int) -> dict:
+    return {"Utc": f"2025-03-16T04:{clip:02d}:00Z", "RacingNumber": number, "Path": f"TeamRadio/{number}_{clip}.mp3"}
+
+
+TEAM_RADIO = (
+    "\ufeff00:00:05.000" + json.dumps({"Captures": [capture("1", 1), capture("4", 2)]}) + "\r\n"
+    "00:10:00.500" + json.dumps({"Captures": {"2": capture("44", 3)}}) + "\r\n"
+    "00:10:00.600" + json.dumps({"Captures": {"2": capture("44", 3), "3": capture("1", 4)}}) + "\r\n"
+    "00:20:00.000{\"Captures\": {\"4\": {\"Path\""  # truncated last line
+).encode()
+FILES = {
+    f"{API_PATH}TeamRadio.jsonStream": TEAM_RADIO,
+    f"{API_PATH}TrackStatus.jsonStream": b'00:00:01.000{"Status":"1","Message":"AllClear"}\n',
+    f"{API_PATH}SessionInfo.json": "\ufeff{\"Key\": 9693}".encode(),
+}
+ETAG = '"v1"'
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    """Livetiming stand-in: serves FILES with an ETag and honours If-None-Match."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        body = FILES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", "Sun, 16 Mar 2025 06:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ArchiveHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    return LivetimingClient(f"http://127.0.0.1:{server.server_address[1]}", tmp_path / "livetiming")
+
+
+def test_parse_stream_and_dedupe_captures():
+    messages = list(parse_stream(TEAM_RADIO.splitlines(keepends=True)))
+    assert [t for t, _ in messages] == [5.0, 600.5, 600.6]
+    assert [c["Path"] for c in iter_captures(messages)] == [
+        "TeamRadio/1_1.mp3",
+        "TeamRadio/4_2.mp3",
+        "TeamRadio/44_3.mp3",
+        "TeamRadio/1_4.mp3",
+    ]
+    assert stream_seconds("01:02:03.5") == 3723.5
+    assert stream_seconds("") is None
+
+
+def test_caches_and_revalidates(client, server, tmp_path):
+    first = list(client.topic(API_PATH, "TeamRadio"))
+    assert client.last_status == "fetched"
+    cached = client.cache_path(f"{API_PATH}TeamRadio.jsonStream")
+    assert cached.read_bytes() == TEAM_RADIO
+    assert not list(cached.parent.glob("*.part"))
+
+    again = list(client.topic(API_PATH, "TeamRadio"))
+    assert client.last_status == "not-modified"
+    assert again == first
+    assert server.requests == [(f"{API_PATH}TeamRadio.jsonStream", None), (f"{API_PATH}TeamRadio.jsonStream", ETAG)]
+
+
+def test_other_topics_and_keyframes(client):
+    assert list(client.topic(API_PATH, "TrackStatus")) == [(1.0, {"Status": "1", "Message": "AllClear"})]
+    assert client.keyframe(API_PATH, "SessionInfo") == {"Key": 9693}
+
+
+def test_stopping_early_caches_nothing(client):
+    messages = client.topic(API_PATH, "TeamRadio")
+    next(messages)
+    messages.close()
+    cached = client.cache_path(f"{API_PATH}TeamRadio.jsonStream")
+    assert not cached.exists()
+    assert not list(cached.parent.glob("*.part"))
+
+
+def test_unreachable_archive_falls_back_to_cache(client, server, tmp_path):
+    expected = list(client.topic(API_PATH, "TeamRadio"))
+    offline = LivetimingClient("http://127.0.0.1:9", client.cache_dir)
+    assert list(offline.topic(API_PATH, "TeamRadio")) == expected
+    assert offline.last_status == "stale"
+
+    with pytest.raises(OSError):
+        list(offline.topic(API_PATH, "RaceControlMessages"))
+
+
+def test_missing_topic_raises_http_error(client):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        list(client.topic(API_PATH, "Missing"))
+    assert excinfo.value.code == 404
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from fetch_telemetry import compute_track_boundary
+from lib.lod import arc_length, bbox, boundary_pyramid, budget_indices, path_pyramid
+
+
+def circuit_points(n: int):
+    t = np.linspace(0, 2 * np.pi, n)
+    return 5000 * np.cos(t) + 800 * np.cos(5 * t), 3000 * np.sin(t) + 300 * np.sin(7 * t)
+
+
+@pytest.fixture
+def circuit():
+    return circuit_points(3000)
+
+
+def test_bbox_and_arc_length():
+    xs, ys = np.array([0.0, 3.0, 3.0]), np.array([0.0, 4.0, -1.04])
+    assert bbox(xs, ys) == [0.0, -1.0, 3.0, 4.0]
+    assert bbox(np.array([]), np.array([])) == []
+    np.testing.assert_allclose(arc_length(xs, ys), [0.0, 5.0, 10.04])
+
+
+def test_budget_indices_fit_the_target(circuit):
+    xs, ys = circuit
+    kept = budget_indices(arc_length(xs, ys), {"x": xs, "y": ys}, 200)
+    assert 180 <= len(kept) <= 200
+    assert kept[0] == 0 and kept[-1] == len(xs) - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_path_pyramid(circuit):
+    xs, ys = circuit
+    pyramid = path_pyramid(xs, ys)
+    assert pyramid["points"] == 3000
+    assert pyramid["bbox"] == [-5800.0, -3052.5, 5800.0, 3052.5]
+    coarse, fine = pyramid["levels"]
+    assert coarse["points"] <= 200 < fine["points"] <= 1000
+    for level in pyramid["levels"]:
+        index = np.array(level["index"])
+        assert len(index) == len(level["x"]) == len(level["y"]) == level["points"]
+        np.testing.assert_allclose(level["x"], xs[index], atol=0.05)
+        lo_x, lo_y, hi_x, hi_y = level["bbox"]
+        assert pyramid["bbox"][0] <= lo_x and hi_x <= pyramid["bbox"][2]
+        assert pyramid["bbox"][1] <= lo_y and hi_y <= pyramid["bbox"][3]
+
+
+def test_small_paths_have_no_reduced_levels():
+    pyramid = path_pyramid([0.0, 1.0, 2.0], [0.0, 1.0, 0.0])
+    assert pyramid == {"points": 3, "bbox": [0.0, 0.0, 2.0, 1.0], "levels": []}
+    assert len(path_pyramid(np.arange(500.0), np.zeros(500))["levels"]) == 1
+    # A level must drop at least 30% of the points to be worth shipping
+    assert path_pyramid(np.arange(280.0), np.zeros(280))["levels"] == []
+    assert [level["points"] <= 200 for level in path_pyramid(*circuit_points(1400))["levels"]] == [True]
+
+
+def test_boundary_levels_keep_matching_edges(circuit):
+    boundary = compute_track_boundary(*circuit)
+    pyramid = boundary_pyramid(boundary)
+    assert pyramid["bbox"] == bbox(
+        np.r_[boundary["inner"]["x"], boundary["outer"]["x"]],
+        np.r_[boundary["inner"]["y"], boundary["outer"]["y"]],
+    )
+    assert [level["points"] <= target for level, target in zip(pyramid["levels"], (200, 1000))] == [True, True]
+    for level in pyramid["levels"]:
+        for side in ("inner", "outer"):
+            assert len(level[side]["x"]) == len(level[side]["y"]) == level["points"]
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from lib.lowmem import downcast_frame, full_precision, loaded_attr, release_plan, release_session_data
+
+
+def test_downcast_is_lossless():
+    frame = pd.DataFrame({
+        "DriverNumber": ["1", "44"] * 50,
+        "Speed": np.tile([301.0, 287.0], 50),
+        "Exact": np.linspace(0, 1, 100) ** 0.5,     # not representable in float32
+        "Gear": np.tile([7, 8], 50).astype("int64"),
+        "Big": np.full(100, 100_000, dtype="int64"),
+        "Compound": ["SOFT", "MEDIUM", None, "SOFT"] * 25,
+        "Message": [f"message {i}" for i in range(100)],
+    })
+    original = frame.copy()
+    assert downcast_frame(frame) > 0
+
+    dtypes = frame.dtypes.astype(str).to_dict()
+    assert dtypes == {
+        "DriverNumber": "object",
+        "Speed": "float32",
+        "Exact": "float64",
+        "Gear": "int16",
+        "Big": "int64",
+        "Compound": "category",
+        "Message": "object",
+    }
+    numeric = ["Speed", "Exact", "Gear", "Big"]
+    pd.testing.assert_frame_equal(frame[numeric], original[numeric], check_dtype=False)
+    assert frame["Compound"].astype(object).where(frame["Compound"].notna(), None).tolist() == original["Compound"].tolist()
+
+
+def test_full_precision_restores_one_driver():
+    class Session:
+        car_data = {d: pd.DataFrame({"Speed": [301.0, 287.0], "nGear": np.array([7, 8])}) for d in ("1", "44")}
+        pos_data = {d: pd.DataFrame({"X": [1200.0, -350.0]}) for d in ("1", "44")}
+
+    session = Session()
+    for frames in (session.car_data, session.pos_data):
+        for frame in frames.values():
+            downcast_frame(frame, keep=(), categories=False)
+
+    with full_precision(session, "1"):
+        assert session.car_data["1"].dtypes.astype(str).tolist() == ["float64", "int64"]
+        assert session.pos_data["1"]["X"].dtype == "float64"
+        assert session.car_data["44"]["Speed"].dtype == "float32"
+        assert session.car_data["1"]["Speed"].tolist() == [301.0, 287.0]
+    assert session.car_data["1"].dtypes.astype(str).tolist() == ["float32", "int16"]
+
+    with full_precision(None, "1"):
+        pass
+
+
+class FastF1Like:
+    """Loaded data behind read-only properties, as fastf1.core.Session keeps it."""
+
+    def __init__(self):
+        self._laps = pd.DataFrame({"LapNumber": [1.0]})
+        self._track_status = pd.DataFrame()
+
+    @property
+    def laps(self):
+        if not hasattr(self, "_laps"):
+            raise RuntimeError("not loaded")
+        return self._laps
+
+    @property
+    def track_status(self):
+        return self._track_status
+
+
+def test_release_session_data():
+    session = FastF1Like()
+    assert release_session_data(session, "laps") == ["laps", "track_status"]
+    assert loaded_attr(session, "laps") is None
+    assert release_session_data(session, "weather") == []
+
+
+def test_release_plan():
+    loads = {"laps": {"laps"}, "telemetry": {"laps", "telemetry"}, "weather": {"weather"}, "lap_context": {"laps", "weather"}}
+    assert release_plan(["laps", "telemetry"], loads) == {"telemetry": ["laps", "telemetry"]}
+    assert release_plan(["laps", "telemetry", "weather", "lap_context"], loads) == {
+        "telemetry": ["telemetry"],
+        "lap_context": ["laps", "weather"],
+    }
+    assert release_plan(["telemetry"], loads, keep={"laps", "telemetry"}) == {}
@@ -0,0 +1,112 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lib.radio import RadioDownloader
+
+CLIPS = {f"/static/TeamRadio/clip{i}.mp3": bytes([i]) * (200_000 + i) for i in range(12)}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Livetiming stand-in: serves CLIPS, fails /flaky.mp3 twice, 404s the rest."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.client_ports.add(self.client_address[1])
+        if self.path == "/static/TeamRadio/flaky.mp3":
+            with server.lock:
+                server.flaky_hits += 1
+                fail = server.flaky_hits <= 2
+            body = b"x" * 1000
+            self.send_response(503 if fail else 200)
+        elif self.path in CLIPS:
+            body = CLIPS[self.path]
+            self.send_response(200)
+        else:
+            body = b"not found"
+            self.send_response(404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = 0
+    httpd.flaky_hits = 0
+    httpd.client_ports = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _base(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_downloads_concurrently_over_reused_connections(server, tmp_path):
+    items = [(path, tmp_path / path.rsplit("/", 1)[1]) for path in CLIPS]
+    with RadioDownloader(_base(server), workers=4) as downloader:
+        results = downloader.download_all(items)
+
+    assert [r.status for r in results] == ["downloaded"] * len(CLIPS)
+    assert [r.local_path for r in results] == [p for _, p in items]
+    for (path, local), result in zip(items, results):
+        assert local.read_bytes() == CLIPS[path]
+        assert result.bytes == len(CLIPS[path])
+        assert result.seconds > 0
+    # 12 clips over at most 4 keep-alive connections
+    assert len(server.client_ports) <= 4
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_repeated_batches_reuse_workers_and_connections(server, tmp_path):
+    items = [(path, tmp_path / path.rsplit("/", 1)[1]) for path in CLIPS]
+    with RadioDownloader(_base(server), workers=3) as downloader:
+        for start in range(0, len(items), 2):  # one small batch per poll, as --watch does
+            results = downloader.download_all(items[start:start + 2])
+            assert [r.status for r in results] == ["downloaded"] * 2
+            assert len(downloader._connections) <= 3
+    assert downloader._connections == []
+    assert len(server.client_ports) <= 3
+
+
+def test_existing_files_are_not_refetched(server, tmp_path):
+    path = next(iter(CLIPS))
+    local = tmp_path / "clip0.mp3"
+    local.write_bytes(b"cached")
+    with RadioDownloader(_base(server)) as downloader:
+        result = downloader.download(path, local)
+    assert result.status == "cached"
+    assert local.read_bytes() == b"cached"
+    assert server.requests == 0
+
+
+def test_retries_with_backoff_then_succeeds(server, tmp_path):
+    with RadioDownloader(_base(server), retries=3, backoff=0.01) as downloader:
+        result = downloader.download("/static/TeamRadio/flaky.mp3", tmp_path / "flaky.mp3")
+    assert result.status == "downloaded"
+    assert result.attempts == 3
+    assert (tmp_path / "flaky.mp3").read_bytes() == b"x" * 1000
+
+
+def test_missing_clip_fails_without_retrying(server, tmp_path):
+    with RadioDownloader(_base(server), retries=3, backoff=0.01) as downloader:
+        result = downloader.download("/static/TeamRadio/missing.mp3", tmp_path / "missing.mp3")
+    assert not result.ok
+    assert result.error == "HTTP 404"
+    assert result.attempts == 1
+    assert not (tmp_path / "missing.mp3").exists()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,107 @@
+import json
+
+from lib.seasonindex import index_path, rebuild_season_index, summarize_session, update_season_index
+
+
+def session_doc(round_number: int, session_type: str = "R", retired: int | None = None) -> dict:
+    drivers = [
+        {"number": n, "abbreviation": a, "teamName": "Team", "position": p, "status": "Finished",
+         "classifiedPosition": str(p)}
+        for n, a, p in ((1, "VER", 1), (4, "NOR", 2), (44, "HAM", 3))
+    ]
+    if retired is not None:
+        driver = next(d for d in drivers if d["number"] == retired)
+        driver.update(status="Retired", classifiedPosition="R")
+    laps = [
+        {"driverNumber": n, "lapNumber": lap, "lapTime": 90.0 + offset + lap / 10, "speedST": 310.0 + offset,
+         "deleted": False}
+        for n, offset in ((1, 0.0), (4, 0.5), (44, 1.0))
+        for lap in (1, 2, 3)
+    ]
+    laps.append({"driverNumber": 44, "lapNumber": 4, "lapTime": 80.0, "speedST": None, "deleted": True})
+    return {
+        "year": 2025,
+        "round": round_number,
+        "sessionType": session_type,
+        "eventName": f"Round {round_number}",
+        "drivers": drivers,
+        "lapData": laps,
+        "telemetryData": [{"driverNumber": 4, "speed": [200.0, 330.5, None]}],
+        "stintData": [
+            {"driverNumber": 1, "compound": "MEDIUM", "lapStart": 1, "lapEnd": 2},
+            {"driverNumber": 1, "compound": "HARD", "lapStart": 3, "lapEnd": 3},
+        ],
+    }
+
+
+def write_output(directory, round_number: int, **kwargs):
+    session_type = kwargs.get("session_type", "R")
+    suffix = "" if session_type == "R" else f"-{session_type.lower()}"
+    path = directory / f"2025-R{round_number:02d}-round-{round_number}{suffix}.json"
+    path.write_text(json.dumps(session_doc(round_number, **kwargs)))
+    return path
+
+
+def test_summarize_session():
+    entry = summarize_session(session_doc(1, retired=44), "2025-R01-round-1.json")
+    # The deleted 80.0 lap doesn't count
+    assert entry["fastestLap"] == {"driverNumber": 1, "lapNumber": 1, "time": 90.1}
+    assert entry["topSpeed"] == {"driverNumber": 4, "speed": 330.5}
+    assert entry["laps"] == 10
+    drivers = {d["driverNumber"]: d for d in entry["drivers"]}
+    assert drivers[1]["stints"] == [["MEDIUM", 2], ["HARD", 1]]
+    assert drivers[44]["dnf"] is True and drivers[1]["dnf"] is False
+    assert drivers[44]["laps"] == 4 and drivers[44]["fastestLap"] == 91.1
+
+    qualifying = summarize_session(session_doc(1, session_type="Q"), "2025-R01-round-1.q.json")
+    assert all(d["dnf"] is None for d in qualifying["drivers"])
+
+
+def test_update_is_incremental_and_idempotent(tmp_path):
+    outputs, index_dir = tmp_path / "telemetry", tmp_path / "index"
+    outputs.mkdir()
+    first = write_output(outputs, 1)
+    path, changed = update_season_index(index_dir, first)
+    assert changed and path == index_path(index_dir, 2025)
+    before = path.read_bytes()
+    assert update_season_index(index_dir, first) == (path, False)
+    assert path.read_bytes() == before
+
+    # Out of order and with a qualifying session: still sorted by round, then session
+    write_output(outputs, 3)
+    update_season_index(index_dir, outputs / "2025-R03-round-3.json")
+    update_season_index(index_dir, write_output(outputs, 3, session_type="Q"))
+    update_season_index(index_dir, write_output(outputs, 2, retired=4))
+    index = json.loads(path.read_text())
+    assert [(s["round"], s["sessionType"]) for s in index["sessions"]] == [(1, "R"), (2, "R"), (3, "Q"), (3, "R")]
+    drivers = {d["driverNumber"]: d for d in index["drivers"]}
+    assert drivers[4]["sessions"] == 4 and drivers[4]["races"] == 3 and drivers[4]["dnfs"] == 1
+    assert drivers[1]["fastestLaps"] == 4
+    assert drivers[1]["compoundLaps"] == {"HARD": 4, "MEDIUM": 8}
+
+    # A re-fetched session replaces its entry instead of adding one
+    update_season_index(index_dir, write_output(outputs, 2))
+    index = json.loads(path.read_text())
+    assert len(index["sessions"]) == 4
+    assert {d["driverNumber"]: d["dnfs"] for d in index["drivers"]}[4] == 0
+
+    incremental = path.read_bytes()
+    path.unlink()
+    assert rebuild_season_index(index_dir, outputs, 2025)
+    assert path.read_bytes() == incremental
+
+
+def test_missing_index_is_rebuilt_from_outputs(tmp_path):
+    outputs, index_dir = tmp_path / "telemetry", tmp_path / "index"
+    outputs.mkdir()
+    write_output(outputs, 1)
+    (outputs / "2025-R01-round-1.profile.json").write_text("{}")
+    index_dir.mkdir()
+    index_path(index_dir, 2025).write_text("not json")
+
+    path, changed = update_season_index(index_dir, write_output(outputs, 2))
+    assert changed
+    assert [s["file"] for s in json.loads(path.read_text())["sessions"]] == [
+        "2025-R01-round-1.json",
+        "2025-R02-round-2.json",
+    ]
@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+from lib.tracepack import decode_traces, encode_traces, read_header, read_traces, write_traces
+
+
+def make_entry(driver_number, n=800, seed=0):
+    rng = np.random.default_rng(seed)
+    distance = np.cumsum(rng.uniform(20, 95, size=n)) - 12.3
+    speed = rng.uniform(80, 340, size=n)
+    rpm = [int(v) for v in rng.integers(8000, 12500, size=n)]
+    rpm[5] = None
+    z = [round(float(v), 1) for v in rng.uniform(-5, 40, size=n)]
+    z[7] = None
+    return {
+        "driverNumber": driver_number,
+        "lapNumber": 40 + driver_number,
+        "distance": distance.tolist(),
+        "speed": speed.tolist(),
+        "throttle": rng.choice([0.0, 17.0, 99.0, 100.0, 104.0], size=n).tolist(),
+        "brake": (rng.random(n) < 0.2).tolist(),
+        "drs": (rng.random(n) < 0.3).tolist(),
+        "rpm": rpm,
+        "gear": [int(v) for v in rng.integers(1, 9, size=n)],
+        "x": [round(float(v), 1) for v in 4000 * np.cos(np.linspace(0, 2 * np.pi, n))],
+        "y": [round(float(v), 1) for v in 2500 * np.sin(np.linspace(0, 2 * np.pi, n))],
+        "z": z,
+    }
+
+
+@pytest.fixture
+def entries():
+    return [make_entry(d, seed=d) for d in (1, 4, 16, 44, 81)]
+
+
+def test_round_trip_within_quantization(entries, tmp_path):
+    path = tmp_path / "2025-R01-test.traces.bin"
+    write_traces(entries, path)
+    decoded = read_traces(path)
+
+    assert len(decoded) == len(entries)
+    for original, back in zip(entries, decoded):
+        assert back["driverNumber"] == original["driverNumber"]
+        assert back["lapNumber"] == original["lapNumber"]
+        np.testing.assert_allclose(back["distance"], original["distance"], atol=0.005 + 1e-9)
+        np.testing.assert_allclose(back["speed"], original["speed"], atol=0.05 + 1e-9)
+        np.testing.assert_allclose(back["throttle"], original["throttle"], atol=0.05 + 1e-9)
+        np.testing.assert_allclose(back["x"], original["x"], atol=1e-6)
+        np.testing.assert_allclose(back["y"], original["y"], atol=1e-6)
+        assert back["brake"] == original["brake"]
+        assert back["drs"] == original["drs"]
+        assert back["gear"] == original["gear"]
+        assert back["rpm"] == original["rpm"]
+        assert back["z"][7] is None
+        np.testing.assert_allclose(
+            [v for v in back["z"] if v is not None],
+            [v for v in original["z"] if v is not None],
+            atol=1e-6,
+        )
+
+
+def test_arrays_are_aligned_for_typed_array_views(entries):
+    blob = encode_traces(entries)
+    header = read_header(blob)
+    assert header["dataOffset"] % 8 == 0
+    for trace in header["traces"]:
+        for meta in trace["channels"].values():
+            assert meta["offset"] % 8 == 0
+            assert meta["offset"] + meta["length"] <= header["dataLength"]
+    assert len(blob) == header["dataOffset"] + header["dataLength"]
+
+
+def test_much_smaller_than_json(entries):
+    blob = encode_traces(entries)
+    as_json = json.dumps(entries, indent=2).encode()
+    assert len(blob) * 8 < len(as_json)
+
+
+def test_empty_channels_and_bad_magic():
+    entry = {"driverNumber": 1, "lapNumber": 1, "distance": [0.0, 10.0], "speed": [100.0, 110.0],
+             "throttle": [100.0, 100.0], "brake": [False, True], "drs": [], "rpm": [], "gear": [],
+             "x": [], "y": [], "z": []}
+    (back,) = decode_traces(encode_traces([entry]))
+    assert back["drs"] == [] and back["x"] == []
+    assert back["brake"] == [False, True]
+
+    entry.update(x=[1.0, None], y=[2.0, 3.0])
+    (back,) = decode_traces(encode_traces([entry]))
+    assert back["x"] == [1.0, None]
+    assert back["y"] == [2.0, 3.0]
+    with pytest.raises(ValueError):
+        decode_traces(b"JSON" + bytes(20))
+
+
+def test_high_elevation_round_trips():
+    entry = make_entry(1, n=50)
+    entry["z"] = [4500.3, -3500.0, None] + entry["z"][3:]
+    (back,) = decode_traces(encode_traces([entry]))
+    assert back["z"][:3] == pytest.approx([4500.3, -3500.0, None])
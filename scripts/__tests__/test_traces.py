@@ -0,0 +1,38 @@
+import json
+
+from fetch_telemetry import build_telemetry_traces
+from lib.lapindex import LapIndex
+from synthetic import make_laps
+
+
+def test_parallel_extraction_matches_serial():
+    laps = make_laps(drivers=8, laps=5)
+    drivers = laps["DriverNumber"].unique()
+    index = LapIndex(laps)
+
+    serial = build_telemetry_traces(index, rotation_angle=37.0, workers=1)
+    parallel = build_telemetry_traces(index, rotation_angle=37.0, workers=4)
+
+    assert [e["driverNumber"] for e in parallel] == [int(d) for d in drivers]
+    assert json.dumps(parallel) == json.dumps(serial)
+
+
+def test_fixed_sampling_and_missing_drivers():
+    laps = make_laps(drivers=3, laps=4)
+    laps.loc[laps["DriverNumber"] == "2", "LapTime"] = None  # no timed lap -> no trace
+
+    traces = build_telemetry_traces(LapIndex(laps), rotation_angle=0.0, sampling="fixed", workers=2)
+    assert [e["driverNumber"] for e in traces] == [1, 3]
+    assert all(len(e["distance"]) == 75 for e in traces)
+
+
+def test_lap_index_groups_by_driver():
+    laps = make_laps(drivers=3, laps=6).sample(frac=1, random_state=1)  # shuffled rows
+    index = LapIndex(laps)
+
+    assert index.drivers == list(laps["DriverNumber"].unique())
+    driver_laps = index.driver_laps("2")
+    assert driver_laps["LapNumber"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert set(driver_laps["DriverNumber"]) == {"2"}
+    assert index.driver_laps("99").empty
+    assert len(LapIndex(None)) == 0
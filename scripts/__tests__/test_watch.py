@@ -0,0 +1,240 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetch_telemetry
+from lib.livetiming import LivetimingClient
+from lib.watch import DeltaLog, LiveSession, fold_deltas, lap_seconds, merge_patch
+from synthetic import SyntheticSession
+
+API_PATH = SyntheticSession.api_path
+DRIVERS = {"1": "VER", "4": "NOR", "16": "LEC"}
+LAPS = 5
+POLL_SECONDS = 100  # stream time revealed per poll
+
+
+def timing(number: str, lap: int) -> dict:
+    base = 90 + int(number) / 10
+    return {"Lines": {number: {
+        "NumberOfLaps": lap,
+        "LastLapTime": {"Value": f"1:{base - 60 + lap / 100:06.3f}"},
+        "Sectors": {"0": {"Value": "28.100"}, "1": {"Value": "31.200"}, "2": {"Value": f"{base - 59.3:.3f}"}},
+        "Position": str(list(DRIVERS).index(number) + 1),
+    }}}
+
+
+def recording() -> dict[str, list[tuple[float, dict]]]:
+    """A short session as recorded topic streams: (session seconds, message)."""
+    drivers = {n: {"RacingNumber": n, "Tla": t, "TeamName": "Team", "TeamColour": "3671C6", "Line": i + 1}
+               for i, (n, t) in enumerate(DRIVERS.items())}
+    streams = {
+        "SessionStatus": [(0.0, {"Status": "Started"})],
+        "DriverList": [(0.0, drivers)],
+        "TimingData": [(0.0, {"Lines": {n: {"NumberOfLaps": 0} for n in DRIVERS}})],
+        "RaceControlMessages": [(0.0, {"Messages": [{"Utc": "2025-03-16T04:00:00", "Category": "Flag",
+                                                     "Flag": "GREEN", "Message": "GREEN LIGHT - PIT EXIT OPEN"}]})],
+        "TeamRadio": [],
+    }
+    for lap in range(1, LAPS + 1):
+        for offset, number in enumerate(DRIVERS):
+            streams["TimingData"].append((lap * 90.0 + offset, timing(number, lap)))
+    message = {"Utc": "2025-03-16T04:05:00", "Lap": 3, "Category": "Flag", "Flag": "YELLOW",
+               "Scope": "Sector", "Sector": 4, "Message": "YELLOW IN TRACK SECTOR 4"}
+    streams["RaceControlMessages"] += [(250.0, {"Messages": {"1": message}}), (251.0, {"Messages": {"1": message}})]
+    capture = {"Utc": "2025-03-16T04:03:00Z", "RacingNumber": "4", "Path": "TeamRadio/NOR_1.mp3"}
+    streams["TeamRadio"] = [(150.0, {"Captures": [capture]}), (320.0, {"Captures": {"0": capture, "1": {
+        "Utc": "2025-03-16T04:06:00Z", "RacingNumber": "1", "Path": "TeamRadio/VER_1.mp3"}}})]
+    streams["SessionStatus"] += [(460.0, {"Status": "Finished"}), (470.0, {"Status": "Finalised"})]
+    return streams
+
+
+def encode(seconds: float, message: dict) -> bytes:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}{json.dumps(message)}\r\n".encode()
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serves the recording as it would have looked `clock` seconds into the session.
+
+    Every poll ends with SessionStatus, which moves the clock on; Range
+    requests get only the bytes past the offset. Clips in `missing` are
+    not in the archive yet: the first request for each gets a 404.
+    """
+
+    def do_GET(self):
+        server = self.server
+        path = self.path
+        if path.endswith(".mp3"):
+            with server.lock:
+                missing = path in server.missing
+                server.missing.discard(path)
+            if missing:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        topic = path.removeprefix(API_PATH).removesuffix(".jsonStream")
+        with server.lock:
+            clock = server.clock
+            if topic == "SessionStatus":
+                server.clock += POLL_SECONDS
+        body = b"".join(encode(t, m) for t, m in server.streams.get(topic, []) if t <= clock)
+        if topic == "TimingData" and clock < 1000:
+            body += b'00:59:59.000{"Lines": {"1": {"Numb'  # a line still being written
+        byte_range = self.headers.get("Range")
+        server.ranges.append(byte_range)
+        start = int(byte_range.removeprefix("bytes=").rstrip("-")) if byte_range else 0
+        if start and start >= len(body):
+            self.send_response(416)
+            body = b""
+        elif start:
+            self.send_response(206)
+            body = body[start:]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ReplayHandler)
+    httpd.lock = threading.Lock()
+    httpd.clock = 0.0
+    httpd.streams = recording()
+    httpd.ranges = []
+    httpd.missing = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(fetch_telemetry, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(fetch_telemetry, "OUTPUT_DIR", tmp_path / "telemetry")
+    monkeypatch.setattr(fetch_telemetry, "RADIO_DIR", tmp_path / "radio")
+    monkeypatch.setattr(fetch_telemetry, "LIVETIMING_BASE", f"http://127.0.0.1:{httpd.server_address[1]}")
+    monkeypatch.setattr(fetch_telemetry.fastf1.Cache, "enable_cache", lambda *a, **k: None)
+    monkeypatch.setattr(fetch_telemetry.fastf1, "get_session", lambda *a, **k: SyntheticSession(drivers=3, laps=5))
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_merge_patch_and_lap_seconds():
+    state = merge_patch({}, {"Lines": {"1": {"Sectors": [{"Value": "28.1"}, {"Value": ""}]}}})
+    merge_patch(state, {"Lines": {"1": {"Sectors": {"1": {"Value": "31.2"}}, "NumberOfLaps": 2}}})
+    assert state == {"Lines": {"1": {"Sectors": {"0": {"Value": "28.1"}, "1": {"Value": "31.2"}}, "NumberOfLaps": 2}}}
+    assert lap_seconds("1:32.456") == 92.456
+    assert lap_seconds("28.1") == 28.1
+    assert lap_seconds("") is None and lap_seconds("1:xx") is None
+
+
+def test_fold_keeps_full_laps_and_skips_listed_clips():
+    document = {"lapData": [{"driverNumber": 1, "lapNumber": 1, "lapTime": 90.0, "compound": "SOFT"}],
+                "teamRadioMessages": [{"audioFile": "radio/x/000_VER.mp3"}]}
+    deltas = [
+        {"lapData": [{"driverNumber": 1, "lapNumber": 1, "lapTime": 90.1}, {"driverNumber": 1, "lapNumber": 2}],
+         "raceControlMessages": [{"message": "GREEN"}],
+         "teamRadioMessages": [{"audioFile": "radio/x/000_VER.mp3"}, {"audioFile": "radio/x/001_NOR.mp3"}]},
+    ]
+    folded = fold_deltas(document, deltas)
+    assert folded["lapData"][0]["compound"] == "SOFT"
+    assert [lap["lapNumber"] for lap in folded["lapData"]] == [1, 2]
+    assert folded["raceControlMessages"] == [{"message": "GREEN"}]
+    assert len(folded["teamRadioMessages"]) == 2
+
+
+def test_watch_replays_stream_into_deltas_and_compacts(replay, capsys):
+    path = fetch_telemetry.watch_session(2025, 1, "R", interval=0, compact_every=3)
+    out = capsys.readouterr().out
+    live_dir = fetch_telemetry.OUTPUT_DIR / "live" / "2025-R01"
+
+    head = json.loads((live_dir / "head.json").read_text())
+    assert head["finished"] is True
+    assert head["output"] == path.name
+    assert head["compactedThrough"] == head["seq"] >= 4
+    assert not list(live_dir.glob("0*.json"))  # every delta folded
+    assert "Compacted 3 delta(s)" in out
+
+    data = json.loads(path.read_text())
+    assert [d["abbreviation"] for d in data["drivers"]] == list(DRIVERS.values())
+    assert len(data["lapData"]) == LAPS * len(DRIVERS)
+    assert {(lap["driverNumber"], lap["lapNumber"]) for lap in data["lapData"]} == {
+        (int(n), lap) for n in DRIVERS for lap in range(1, LAPS + 1)
+    }
+    ver_lap_3 = next(l for l in data["lapData"] if l["driverNumber"] == 1 and l["lapNumber"] == 3)
+    assert ver_lap_3 == {"driverNumber": 1, "lapNumber": 3, "lapTime": 90.13, "sector1": 28.1,
+                         "sector2": 31.2, "sector3": 30.8, "position": 1}
+    assert [m["flag"] for m in data["raceControlMessages"]] == ["GREEN", "YELLOW"]
+    assert [m["audioFile"] for m in data["teamRadioMessages"]] == [
+        "radio/2025-R01/000_NOR.mp3", "radio/2025-R01/001_VER.mp3",
+    ]
+    assert (fetch_telemetry.RADIO_DIR / "2025-R01" / "001_VER.mp3").exists()
+    # After the first poll, only the new bytes of each topic were requested
+    assert any(r and r.startswith("bytes=") for r in replay.ranges)
+
+    # A restarted watcher resumes from its state: nothing new, no new deltas
+    seq = head["seq"]
+    fetch_telemetry.watch_session(2025, 1, "R", interval=0)
+    assert json.loads((live_dir / "head.json").read_text())["seq"] == seq
+
+
+def test_deltas_are_published_per_poll(replay, tmp_path):
+    client = LivetimingClient(fetch_telemetry.LIVETIMING_BASE, tmp_path / "cache")
+    live, log = LiveSession(), DeltaLog(tmp_path / "live", "out.json")
+    sizes = []
+    while not live.finished:
+        delta, _ = live.poll(client, API_PATH, "2025-R01")
+        path = log.write(delta)
+        log.commit()
+        if path:
+            sizes.append(path.stat().st_size)
+            assert json.loads(path.read_text())["seq"] == log.head["seq"]
+    assert log.pending() == list(range(1, len(sizes) + 1))
+    assert max(sizes) < 2048
+
+
+def test_failed_radio_clip_is_retried_next_poll(replay):
+    replay.missing.add(f"{API_PATH}TeamRadio/VER_1.mp3")
+    path = fetch_telemetry.watch_session(2025, 1, "R", interval=0)
+    live_dir = fetch_telemetry.OUTPUT_DIR / "live" / "2025-R01"
+
+    data = json.loads(path.read_text())
+    assert [m["audioFile"] for m in data["teamRadioMessages"]] == [
+        "radio/2025-R01/000_NOR.mp3", "radio/2025-R01/001_VER.mp3",
+    ]
+    assert (fetch_telemetry.RADIO_DIR / "2025-R01" / "001_VER.mp3").exists()
+    assert json.loads((live_dir / "state.json").read_text())["pendingClips"] == []
+
+
+def test_restart_publishes_delta_left_by_crash_before_commit(replay, monkeypatch, capsys):
+    commit = DeltaLog.commit
+
+    def crash_after_first_delta(self):
+        if self.written is not None:
+            raise KeyboardInterrupt
+        commit(self)
+
+    monkeypatch.setattr(DeltaLog, "commit", crash_after_first_delta)
+    with pytest.raises(KeyboardInterrupt):
+        fetch_telemetry.watch_session(2025, 1, "R", interval=0)
+    live_dir = fetch_telemetry.OUTPUT_DIR / "live" / "2025-R01"
+    assert json.loads((live_dir / "state.json").read_text())["seq"] == 1
+    assert not (live_dir / "head.json").exists()
+
+    monkeypatch.setattr(DeltaLog, "commit", commit)
+    path = fetch_telemetry.watch_session(2025, 1, "R", interval=0)
+    assert "Published delta 1, left unpublished by the previous run" in capsys.readouterr().out
+    data = json.loads(path.read_text())
+    assert len(data["lapData"]) == LAPS * len(DRIVERS)
+    assert [m["flag"] for m in data["raceControlMessages"]] == ["GREEN", "YELLOW"]
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the fetch_telemetry pipeline.
+
+Builds synthetic FastF1-shaped sessions (synthetic.py) at several scales
+and times the pure helpers and each serialization stage of fetch_telemetry,
+without the network or the FastF1 cache. Every run is appended to a JSON
+Lines history keyed by git commit, so a later run can be compared against
+any earlier commit.
+
+Usage:
+    python scripts/bench_telemetry.py
+    python scripts/bench_telemetry.py --scale race --repeat 10
+    python scripts/bench_telemetry.py --compare HEAD~1 --threshold 0.15
+
+Results:
+    .benchmarks/telemetry.jsonl  (one record per run)
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fetch_telemetry import (
+    build_telemetry_traces,
+    compute_track_boundary,
+    extract_drs_zones,
+    rotate_coords,
+    write_lap_archive,
+)
+from lib.columnar import (
+    serialize_laps,
+    serialize_race_control,
+    serialize_results,
+    serialize_stints,
+    serialize_weather,
+)
+from lib.jsonstream import JsonSectionWriter
+from lib.lapindex import LapIndex
+from lib.tracepack import encode_traces
+from synthetic import SCALES, SyntheticCircuitInfo, SyntheticSession
+
+REPO_ROOT = Path(__file__).parent.parent
+RESULTS_PATH = REPO_ROOT / ".benchmarks" / "telemetry.jsonl"
+
+
+def git_commit() -> str | None:
+    """Short hash of HEAD, with a '+dirty' suffix for uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}+dirty" if dirty else commit
+
+
+def resolve_commit(ref: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", ref], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_json(output: dict, path: Path, compress: tuple[str, ...] = ()) -> dict:
+    """Stream a session document to disk the way fetch_telemetry does."""
+    with JsonSectionWriter(path, compress=compress) as writer:
+        for key, value in output.items():
+            writer.section(key, value)
+    return writer.sizes
+
+
+def build_cases(scale: str) -> list[tuple[str, callable]]:
+    """Set up one synthetic session and return (case name, zero-arg callable) pairs."""
+    preset = SCALES[scale]
+    session = SyntheticSession.at_scale(scale)
+    rotation = SyntheticCircuitInfo.rotation
+    laps = session.laps
+    lap_index = LapIndex(laps)
+
+    build_traces = lambda: build_telemetry_traces(lap_index, rotation)  # noqa: E731
+    with contextlib.redirect_stdout(io.StringIO()):
+        entries = build_traces()
+
+    xs = np.concatenate([e["x"] for e in entries])
+    ys = np.concatenate([e["y"] for e in entries])
+    ref_x, ref_y = np.array(entries[0]["x"]), np.array(entries[0]["y"])
+    output = {
+        "drivers": serialize_results(session.results),
+        "lapData": serialize_laps(laps),
+        "telemetryData": entries,
+        "stintData": serialize_stints(laps),
+        "trackBoundary": compute_track_boundary(ref_x, ref_y),
+        "drsZones": extract_drs_zones(entries),
+        "weatherData": serialize_weather(session.weather_data),
+        "raceControlMessages": serialize_race_control(session.race_control_messages),
+    }
+
+    scratch = Path(tempfile.mkdtemp(prefix="bench-telemetry-"))
+    atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+
+    def quiet(fn):
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return fn()
+        return run
+
+    cases = [
+        ("rotate_coords", lambda: rotate_coords(xs, ys, rotation)),
+        ("compute_track_boundary", lambda: compute_track_boundary(ref_x, ref_y)),
+        ("extract_drs_zones", lambda: extract_drs_zones(entries)),
+        ("results", lambda: serialize_results(session.results)),
+        ("laps", lambda: serialize_laps(laps)),
+        ("lap_index", lambda: LapIndex(laps)),
+        ("telemetry", quiet(build_traces)),
+        ("stints", lambda: serialize_stints(laps)),
+        ("weather", lambda: serialize_weather(session.weather_data)),
+        ("race_control", lambda: serialize_race_control(session.race_control_messages)),
+        ("write", lambda: write_json(output, scratch / "session.json")),
+        ("write_gz", lambda: write_json(output, scratch / "session.json", compress=("gz",))),
+        ("write_binary_traces", lambda: encode_traces(entries)),
+    ]
+    if preset["all_laps_telemetry"]:
+        # The --all-laps archive, through the same extraction fetch_telemetry runs
+        cases.append(("all_laps_archive", quiet(lambda: write_lap_archive(lap_index, scratch / "laps.bin", rotation))))
+    return cases
+
+
+def time_case(fn, repeat: int) -> dict:
+    """Run fn `repeat` times (after one warm-up) and summarize wall time in seconds."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        "min": round(min(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "max": round(max(samples), 6),
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(scales: list[str], repeat: int, cases: set[str] | None = None) -> dict:
+    """Time every case at every scale; returns {scale: {case: timing}}."""
+    results: dict[str, dict] = {}
+    for scale in scales:
+        print(f"{scale}:")
+        results[scale] = {}
+        for name, fn in build_cases(scale):
+            if cases and name not in cases:
+                continue
+            timing = time_case(fn, repeat)
+            results[scale][name] = timing
+            print(f"  {name:24s} {timing['median'] * 1000:10.2f} ms  (min {timing['min'] * 1000:.2f})")
+    return results
+
+
+def load_history(path: Path = RESULTS_PATH) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_record(record: dict, path: Path = RESULTS_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def find_baseline(history: list[dict], commit: str | None) -> dict | None:
+    """Latest record for `commit` (prefix match), or the latest record if commit is None."""
+    for record in reversed(history):
+        if commit is None or (record.get("commit") or "").startswith(commit):
+            return record
+    return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Per-case median ratios vs a baseline record; flags slowdowns beyond threshold."""
+    rows = []
+    for scale, cases in current["results"].items():
+        for name, timing in cases.items():
+            base = baseline["results"].get(scale, {}).get(name)
+            if not base or not base["median"]:
+                continue
+            ratio = timing["median"] / base["median"]
+            rows.append({
+                "scale": scale,
+                "case": name,
+                "baseline": base["median"],
+                "current": timing["median"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + threshold,
+            })
+    return rows
+
+
+def print_comparison(rows: list[dict], baseline: dict) -> None:
+    print(f"\nCompared with {baseline.get('commit') or 'unknown'} ({baseline.get('timestamp')}):")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"  {row['scale']:14s} {row['case']:24s} {row['baseline'] * 1000:9.2f} -> "
+            f"{row['current'] * 1000:9.2f} ms  x{row['ratio']:.2f}{flag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetch_telemetry stages on synthetic sessions")
+    parser.add_argument("--scale", action="append", choices=list(SCALES),
+                        help="Scale(s) to run (default: all)")
+    parser.add_argument("--case", action="append", help="Only run these case(s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument("--results", type=Path, default=RESULTS_PATH,
+                        help=f"JSON Lines history file (default: {RESULTS_PATH.relative_to(REPO_ROOT)})")
+    parser.add_argument("--no-save", action="store_true", help="Don't append this run to the history")
+    parser.add_argument("--compare", metavar="COMMIT", nargs="?", const="",
+                        help="Compare with the latest run at COMMIT (default: the previous run)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Median slowdown counted as a regression (default: 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    history = load_history(args.results)
+    record = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": run_benchmarks(args.scale or list(SCALES), args.repeat, set(args.case or [])),
+    }
+    if not args.no_save:
+        append_record(record, args.results)
+        print(f"\nResults appended to {args.results}")
+
+    if args.compare is not None:
+        commit = resolve_commit(args.compare) or args.compare if args.compare else None
+        baseline = find_baseline(history, commit)
+        if baseline is None:
+            print(f"No earlier benchmark run found{f' for {args.compare}' if args.compare else ''}")
+            sys.exit(1)
+        rows = compare(record, baseline, args.threshold)
+        print_comparison(rows, baseline)
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,100 @@ Usage:
     python scripts/fetch_telemetry.py --year 2025 --round 1
     python scripts/fetch_telemetry.py --year 2025 --round 1 --session R
 
+Re-runs reuse stage checkpoints in .telemetry-checkpoints/ and only recompute
+stale stages:
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --dry-run
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --force-stage telemetry
+
+Refresh some sections only, keeping the rest of the existing output:
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --session Q --only laps,stints,weather
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --skip telemetry,radio
+
+Output is compact JSON, streamed section by section; --pretty indents it and
+--compress writes pre-compressed siblings for the CDN:
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --compress gz,br
+
+On small machines, --low-memory downcasts the loaded data and releases it
+stage by stage (peak RSS is printed at the end); the output is identical:
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --low-memory
+
+Every run lists its artifacts with content hashes in a manifest and diffs it
+against the previous one (or the last deployed copy) so deploys upload only
+changed objects:
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --previous-manifest deployed.json
+
+Each run also updates the season index of per-session and per-driver
+summaries (--no-index to skip); rebuild it from the outputs on disk with:
+    python scripts/fetch_telemetry.py --year 2025 --rebuild-index
+
+During a session, --watch polls the live archive and writes small
+sequence-numbered delta files, folded into the session JSON as it goes:
+    python scripts/fetch_telemetry.py --year 2025 --round 1 --watch --watch-interval 20
+
+Batch mode (one worker process per session):
+    python scripts/fetch_telemetry.py --year 2025 --season --session R,Q --jobs 4
+    python scripts/fetch_telemetry.py --year 2025 --rounds 1-5,8 --session R,S
+
 Output:
     app/data/telemetry/{year}-R{round:02d}-{event-slug}.json
+    app/data/telemetry/{year}-R{round:02d}-{event-slug}.{session}.json  (non-race sessions)
+    app/data/telemetry/{...}.json.gz / .json.br  (with --compress)
+    app/data/telemetry/{...}.manifest.json  (content hashes, and what changed since the last run)
+    app/data/telemetry/live/{year}-R{round:02d}/{seq:06d}.json, head.json  (with --watch)
+    app/data/telemetry-index/{year}.json  (season index)
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
+import io
 import json
+import multiprocessing as mp
 import os
 import re
 import sys
-import urllib.request
+import time
+import urllib.error
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import numpy as np
 import fastf1
 import pandas as pd
 
+from lib.checkpoints import CheckpointStore, combine_hashes, file_hashes, stage_keys
+from lib.columnar import (
+    serialize_laps,
+    serialize_race_control,
+    serialize_results,
+    serialize_stints,
+    serialize_weather,
+)
+from lib.decimate import decimate_telemetry
+from lib.deltas import compute_driver_deltas
+from lib.drs import extract_drs_zones
+from lib.jsonstream import COMPRESSIONS, JsonSectionWriter
+from lib.laparchive import LapArchiveWriter
+from lib.lapcontext import build_lap_context
+from lib.lapindex import LapIndex
+from lib.livetiming import LivetimingClient, iter_captures
+from lib.lod import boundary_pyramid, path_pyramid
+from lib.lowmem import downcast_session, full_precision, loaded_attr, release_plan, release_session_data
+from lib.manifest import file_digest, load_manifest, write_manifest
+from lib.profiling import StageProfiler, peak_rss_bytes
+from lib.radio import RadioDownloader
+from lib.seasonindex import rebuild_season_index, update_season_index
+from lib.tracepack import write_traces
+from lib.watch import DeltaLog, LiveSession
+
 # Cache directory for FastF1
 CACHE_DIR = Path(__file__).parent.parent / ".fastf1-cache"
 OUTPUT_DIR = Path(__file__).parent.parent / "app" / "data" / "telemetry"
 RADIO_DIR = Path(__file__).parent.parent / "app" / "data" / "radio"
+CHECKPOINT_DIR = Path(__file__).parent.parent / ".telemetry-checkpoints"
+SEASON_INDEX_DIR = Path(__file__).parent.parent / "app" / "data" / "telemetry-index"
 
 LIVETIMING_BASE = "https://livetiming.formula1.com"
 
@@ -43,39 +115,38 @@ def slugify(text: str) -> str:
     )
 
 
-def format_lap_time(td) -> float | None:
-    """Convert timedelta to seconds."""
-    if pd.isna(td):
-        return None
-    return td.total_seconds()
-
-
-def safe_int(val) -> int | None:
-    """Safely convert to int, returning None for NaN/NaT."""
-    if pd.isna(val):
-        return None
-    return int(val)
+def session_label(year: int, round_num: int, session_type: str = "R") -> str:
+    """Short session identifier used for file and folder names.
 
+    Races keep the historical ``2025-R01`` form; other sessions get a suffix
+    (``2025-R01-Q``) so a batch run over several session types never has two
+    jobs writing the same file.
+    """
+    label = f"{year}-R{round_num:02d}"
+    if session_type.upper() != "R":
+        label += f"-{session_type.upper()}"
+    return label
 
-def safe_float(val) -> float | None:
-    """Safely convert to float, returning None for NaN/NaT."""
-    if pd.isna(val):
-        return None
-    return float(val)
 
+def output_filename(year: int, round_num: int, slug: str, session_type: str = "R") -> str:
+    """Telemetry JSON filename for a session.
 
-def safe_bool(val) -> bool | None:
-    """Safely convert to bool, returning None for NaN."""
-    if pd.isna(val):
-        return None
-    return bool(val)
+    Non-race sessions get a ``.q`` (``.s``, ``.sq``, ...) tag before the
+    extension. The round listings (the telemetry manifest, app/lib/telemetry.ts)
+    only take ``{year}-R{round}-{slug}.json``, so they keep listing the race
+    alone, the same way they skip ``.profile.json`` sidecars.
+    """
+    name = f"{year}-R{round_num:02d}-{slug}"
+    if session_type.upper() != "R":
+        name += f".{session_type.lower()}"
+    return f"{name}.json"
 
 
-def safe_str(val) -> str | None:
-    """Safely convert to str, returning None for NaN."""
+def safe_int(val) -> int | None:
+    """Safely convert to int, returning None for NaN/NaT."""
     if pd.isna(val):
         return None
-    return str(val)
+    return int(val)
 
 
 def rotate_coords(
@@ -122,179 +193,115 @@ def compute_track_boundary(
     }
 
 
-def extract_drs_zones(telemetry_entries: list[dict], distance_gap: float = 200.0) -> list[dict]:
-    """Extract DRS activation zones from multiple drivers' telemetry.
+# ---------------------------------------------------------------------------
+# Telemetry traces — per-driver extraction, optionally in worker processes
+# ---------------------------------------------------------------------------
 
-    Scans up to 5 drivers for DRS-active points, clusters them by distance,
-    and returns zone start/end distances with coordinates.
-    """
-    # Collect all DRS-active distances from a few drivers
-    drs_distances = []
-    for entry in telemetry_entries[:5]:
-        drs = entry.get("drs", [])
-        dist = entry.get("distance", [])
-        for i, active in enumerate(drs):
-            if active and i < len(dist):
-                drs_distances.append(dist[i])
-
-    if not drs_distances:
-        return []
-
-    drs_distances.sort()
-
-    # Cluster into zones (gap > distance_gap starts a new zone)
-    zones = []
-    zone_start = drs_distances[0]
-    zone_end = drs_distances[0]
-
-    for d in drs_distances[1:]:
-        if d - zone_end > distance_gap:
-            zones.append((zone_start, zone_end))
-            zone_start = d
-        zone_end = d
-
-    zones.append((zone_start, zone_end))
-
-    # Map zone distances to X/Y coords using first driver that has them
-    ref = telemetry_entries[0] if telemetry_entries else None
-    if not ref:
-        return [{"startDistance": s, "endDistance": e} for s, e in zones]
-
-    ref_dist = np.array(ref["distance"])
-    ref_x = np.array(ref["x"])
-    ref_y = np.array(ref["y"])
-
-    result = []
-    for start_d, end_d in zones:
-        si = int(np.argmin(np.abs(ref_dist - start_d)))
-        ei = int(np.argmin(np.abs(ref_dist - end_d)))
-        result.append({
-            "startDistance": round(start_d, 1),
-            "endDistance": round(end_d, 1),
-            "startX": round(float(ref_x[si]), 1),
-            "startY": round(float(ref_y[si]), 1),
-            "endX": round(float(ref_x[ei]), 1),
-            "endY": round(float(ref_y[ei]), 1),
-        })
+TRACE_COLUMNS = ("Distance", "Speed", "Throttle", "Brake", "DRS", "RPM", "nGear", "X", "Y", "Z")
 
-    return result
+# Lap index (and downcast session) shared with forked trace workers (inherited copy-on-write, never pickled)
+_TRACE_INDEX: LapIndex | None = None
+_TRACE_SESSION = None
 
 
-def fetch_telemetry(year: int, round_num: int, session_type: str = "R"):
-    """Fetch telemetry for a specific session and output JSON."""
-    CACHE_DIR.mkdir(exist_ok=True)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    fastf1.Cache.enable_cache(str(CACHE_DIR))
+def sample_driver_telemetry(
+    driver_laps, sampling: str = "adaptive"
+) -> tuple[int, pd.DataFrame, dict | None] | None:
+    """Get and decimate the fastest lap's telemetry for one driver.
 
-    print(f"Loading {year} Round {round_num} ({session_type})...")
-    session = fastf1.get_session(year, round_num, session_type)
-    session.load()
+    Returns (lap number, plain DataFrame of TRACE_COLUMNS, decimation stats),
+    or None if the driver has no usable lap. The frame is detached from the
+    FastF1 session so it is cheap to send back from a worker process.
+    """
+    fastest = driver_laps.pick_fastest()
+    if fastest is None:
+        return None
+
+    tel = fastest.get_telemetry()
+    if tel is None or tel.empty:
+        return None
+
+    stats = None
+    if sampling == "fixed":
+        # Sample every 10th point to keep file size reasonable
+        sampled = tel.iloc[::10]
+    else:
+        # Keep only the points needed to stay within per-channel tolerances
+        sampled, stats = decimate_telemetry(tel)
+
+    frame = pd.DataFrame({c: sampled[c].to_numpy() for c in TRACE_COLUMNS if c in sampled.columns})
+    return int(fastest["LapNumber"]), frame, stats
 
-    event_name = session.event["EventName"]
-    slug = slugify(event_name)
 
-    # Extract circuit rotation angle
-    rotation_angle = 0.0
+def _sample_driver_worker(driver_num, sampling: str):
+    """Process-pool entry point: returns (result, error message)."""
     try:
-        circuit_info = session.get_circuit_info()
-        rotation_angle = float(circuit_info.rotation)
-        print(f"  Circuit rotation: {rotation_angle}°")
+        with full_precision(_TRACE_SESSION, driver_num):
+            return sample_driver_telemetry(_TRACE_INDEX.driver_laps(driver_num), sampling), None
     except Exception as e:
-        print(f"  Could not get circuit rotation: {e}")
-
-    output: dict = {
-        "year": year,
-        "round": round_num,
-        "eventName": event_name,
-        "sessionType": session_type,
-        "circuitName": session.event.get("Location", ""),
-        "country": session.event.get("Country", ""),
-        "rotation": rotation_angle,
-        "drivers": [],
-        "lapData": [],
-        "telemetryData": [],
-        "stintData": [],
-    }
+        return None, str(e)
 
-    # -----------------------------------------------------------------------
-    # Driver results — extract ALL available fields
-    # -----------------------------------------------------------------------
-    results = session.results
-    if results is not None and not results.empty:
-        for _, row in results.iterrows():
-            driver_entry = {
-                "number": int(row["DriverNumber"]),
-                "abbreviation": str(row["Abbreviation"]),
-                "fullName": f"{row['FirstName']} {row['LastName']}",
-                "teamName": str(row["TeamName"]),
-                "teamColor": f"#{row['TeamColor']}" if pd.notna(row.get("TeamColor")) else None,
-                "position": safe_int(row.get("Position")),
-                "classifiedPosition": safe_str(row.get("ClassifiedPosition")),
-                "gridPosition": safe_int(row.get("GridPosition")),
-                "status": str(row.get("Status", "")),
-                "points": safe_float(row.get("Points")),
-                "time": format_lap_time(row.get("Time")),
-                "q1": format_lap_time(row.get("Q1")),
-                "q2": format_lap_time(row.get("Q2")),
-                "q3": format_lap_time(row.get("Q3")),
-            }
-            output["drivers"].append(driver_entry)
-
-    # -----------------------------------------------------------------------
-    # Lap data — extract ALL available fields
-    # -----------------------------------------------------------------------
-    all_laps = session.laps
-    if all_laps is not None and not all_laps.empty:
-        for _, lap in all_laps.iterrows():
-            lap_entry = {
-                "driverNumber": int(lap["DriverNumber"]),
-                "lapNumber": int(lap["LapNumber"]),
-                "lapTime": format_lap_time(lap.get("LapTime")),
-                "sector1": format_lap_time(lap.get("Sector1Time")),
-                "sector2": format_lap_time(lap.get("Sector2Time")),
-                "sector3": format_lap_time(lap.get("Sector3Time")),
-                "speedI1": safe_float(lap.get("SpeedI1")),
-                "speedI2": safe_float(lap.get("SpeedI2")),
-                "speedFL": safe_float(lap.get("SpeedFL")),
-                "speedST": safe_float(lap.get("SpeedST")),
-                "compound": safe_str(lap.get("Compound")),
-                "tyreLife": safe_int(lap.get("TyreLife")),
-                "freshTyre": safe_bool(lap.get("FreshTyre")),
-                "stint": safe_int(lap.get("Stint")),
-                "position": safe_int(lap.get("Position")),
-                "trackStatus": safe_str(lap.get("TrackStatus")),
-                "isPersonalBest": safe_bool(lap.get("IsPersonalBest")),
-                "isAccurate": safe_bool(lap.get("IsAccurate")),
-                "deleted": safe_bool(lap.get("Deleted")),
-                "deletedReason": safe_str(lap.get("DeletedReason")),
-                "isPitOutLap": bool(lap.get("PitOutTime") is not pd.NaT and pd.notna(lap.get("PitOutTime"))),
-                "isPitInLap": bool(lap.get("PitInTime") is not pd.NaT and pd.notna(lap.get("PitInTime"))),
-            }
-            output["lapData"].append(lap_entry)
-
-    # -----------------------------------------------------------------------
-    # Telemetry traces — extract ALL channels including RPM, nGear, Z
-    # -----------------------------------------------------------------------
-    print("Fetching telemetry traces for fastest laps...")
-    driver_numbers = all_laps["DriverNumber"].unique() if all_laps is not None and not all_laps.empty else []
 
-    # Compute shared centroid from first driver for consistent rotation
-    shared_cx, shared_cy = None, None
+def sample_all_drivers(
+    lap_index: LapIndex, sampling: str = "adaptive", workers: int = 1, session=None
+) -> list:
+    """Run sample_driver_telemetry for every driver; results keep driver order.
 
-    for driver_num in driver_numbers:
-        try:
-            driver_laps = all_laps[all_laps["DriverNumber"] == driver_num]
-            fastest = driver_laps.pick_fastest()
-            if fastest is None:
-                continue
+    With workers > 1 the drivers are split across forked processes that
+    inherit the lap index (and its session) instead of receiving a pickled
+    copy. Each item is (result, error message). Pass the session when
+    --low-memory downcast it, so each driver is sampled at full precision.
+    """
+    global _TRACE_INDEX, _TRACE_SESSION
+    drivers = lap_index.drivers
+    if workers <= 1 or len(drivers) <= 1 or "fork" not in mp.get_all_start_methods():
+        results = []
+        for driver_num in drivers:
+            try:
+                with full_precision(session, driver_num):
+                    results.append((sample_driver_telemetry(lap_index.driver_laps(driver_num), sampling), None))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results
 
-            tel = fastest.get_telemetry()
-            if tel is None or tel.empty:
-                continue
+    _TRACE_INDEX, _TRACE_SESSION = lap_index, session
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+            return list(pool.map(_sample_driver_worker, drivers, [sampling] * len(drivers)))
+    finally:
+        _TRACE_INDEX, _TRACE_SESSION = None, None
+
+
+def build_telemetry_traces(
+    lap_index: LapIndex, rotation_angle: float, sampling: str = "adaptive", workers: int = 1, session=None
+) -> list[dict]:
+    """Build telemetryData entries for each driver's fastest lap.
 
-            # Sample every 10th point to keep file size reasonable
-            sampled = tel.iloc[::10]
+    Extraction may run in parallel; rotation is applied afterwards in driver
+    order, around the centroid of the first driver with coordinates, so the
+    result is identical to a serial run. session is the downcast session
+    in low-memory runs (see sample_all_drivers).
+    """
+    entries = []
+
+    # Compute shared centroid from first driver for consistent rotation
+    shared_cx, shared_cy = None, None
+
+    samples = sample_all_drivers(lap_index, sampling, workers, session)
+    for i, driver_num in enumerate(lap_index.drivers):
+        result, error = samples[i]
+        samples[i] = None  # each driver's frame can go once its entry is built
+        if error is not None:
+            print(f"  Skipping telemetry for driver {driver_num}: {error}")
+            continue
+        if result is None:
+            continue
+        lap_number, sampled, stats = result
+        if stats is not None:
+            errors = ", ".join(f"{k} {v}" for k, v in stats["maxError"].items())
+            print(f"  Driver {driver_num}: {stats['source']} -> {stats['points']} points (max error {errors})")
 
+        try:
             raw_x = np.array(sampled["X"].tolist()) if "X" in sampled.columns else np.array([])
             raw_y = np.array(sampled["Y"].tolist()) if "Y" in sampled.columns else np.array([])
 
@@ -326,9 +333,9 @@ def fetch_telemetry(year: int, round_num: int, session_type: str = "R"):
             if "Z" in sampled.columns:
                 raw_z = [round(float(v), 1) if pd.notna(v) else None for v in sampled["Z"].tolist()]
 
-            telemetry_entry = {
+            entries.append({
                 "driverNumber": int(driver_num),
-                "lapNumber": int(fastest["LapNumber"]),
+                "lapNumber": lap_number,
                 "distance": sampled["Distance"].tolist(),
                 "speed": sampled["Speed"].tolist(),
                 "throttle": sampled["Throttle"].tolist(),
@@ -339,226 +346,1140 @@ def fetch_telemetry(year: int, round_num: int, session_type: str = "R"):
                 "x": [round(float(v), 1) for v in raw_x] if len(raw_x) > 0 else [],
                 "y": [round(float(v), 1) for v in raw_y] if len(raw_y) > 0 else [],
                 "z": raw_z,
-            }
-            output["telemetryData"].append(telemetry_entry)
+            })
         except Exception as e:
             print(f"  Skipping telemetry for driver {driver_num}: {e}")
 
-    # Compute track boundary from first driver's rotated coords
-    if output["telemetryData"]:
-        ref = output["telemetryData"][0]
-        if ref["x"] and ref["y"]:
-            try:
-                boundary = compute_track_boundary(np.array(ref["x"]), np.array(ref["y"]))
-                output["trackBoundary"] = boundary
-                print(f"  Track boundary computed ({len(ref['x'])} points)")
-            except Exception as e:
-                print(f"  Could not compute track boundary: {e}")
+    return entries
 
-    # Extract DRS zones
-    try:
-        drs_zones = extract_drs_zones(output["telemetryData"])
-        if drs_zones:
-            output["drsZones"] = drs_zones
-            print(f"  Found {len(drs_zones)} DRS zone(s)")
-    except Exception as e:
-        print(f"  Could not extract DRS zones: {e}")
-
-    # -----------------------------------------------------------------------
-    # Stint data
-    # -----------------------------------------------------------------------
-    if all_laps is not None and not all_laps.empty:
-        for driver_num in driver_numbers:
-            driver_laps = all_laps[all_laps["DriverNumber"] == driver_num].sort_values("LapNumber")
-            stints = driver_laps.groupby("Stint")
-
-            for stint_num, stint_laps in stints:
-                compound = stint_laps["Compound"].iloc[0] if pd.notna(stint_laps["Compound"].iloc[0]) else "UNKNOWN"
-                fresh = stint_laps["FreshTyre"].iloc[0] if "FreshTyre" in stint_laps.columns and pd.notna(stint_laps["FreshTyre"].iloc[0]) else None
-                output["stintData"].append(
-                    {
-                        "driverNumber": int(driver_num),
-                        "stintNumber": int(stint_num),
-                        "compound": str(compound),
-                        "freshTyre": bool(fresh) if fresh is not None else None,
-                        "lapStart": int(stint_laps["LapNumber"].min()),
-                        "lapEnd": int(stint_laps["LapNumber"].max()),
-                    }
-                )
 
-    # -----------------------------------------------------------------------
-    # Weather data from session
-    # -----------------------------------------------------------------------
-    try:
-        weather = session.weather_data
-        if weather is not None and not weather.empty:
-            weather_entries = []
-            for _, row in weather.iterrows():
-                weather_entries.append({
-                    "airTemp": safe_float(row.get("AirTemp")),
-                    "trackTemp": safe_float(row.get("TrackTemp")),
-                    "humidity": safe_float(row.get("Humidity")),
-                    "pressure": safe_float(row.get("Pressure")),
-                    "rainfall": safe_bool(row.get("Rainfall")),
-                    "windDirection": safe_int(row.get("WindDirection")),
-                    "windSpeed": safe_float(row.get("WindSpeed")),
-                })
-            output["weatherData"] = weather_entries
-            print(f"  {len(weather_entries)} weather entries")
-    except Exception as e:
-        print(f"  Could not get weather data: {e}")
+def write_lap_archive(lap_index: LapIndex, path: Path, rotation_angle: float, session=None) -> tuple[int, int, int]:
+    """Write telemetry for every lap of every driver to a memory-mappable archive.
 
-    # -----------------------------------------------------------------------
-    # Race control messages from session
-    # -----------------------------------------------------------------------
+    Drivers are extracted and flushed one at a time, so memory holds at most
+    one driver's laps (at full precision when session was downcast).
+    Returns (file size in bytes, laps written, samples).
+    """
+    columns = list(TRACE_COLUMNS)
+    laps_written = samples = 0
+    with LapArchiveWriter(path, rotation=rotation_angle) as writer:
+        for driver_num in lap_index.drivers:
+            driver_laps = []
+            with full_precision(session, driver_num):
+                for _, lap in lap_index.driver_laps(driver_num).iterrows():
+                    if pd.isna(lap["LapNumber"]):
+                        continue
+                    try:
+                        tel = lap.get_telemetry()
+                    except Exception as e:
+                        print(f"  Skipping driver {driver_num} lap {safe_int(lap['LapNumber'])}: {e}")
+                        continue
+                    if tel is None or tel.empty:
+                        continue
+                    driver_laps.append((int(lap["LapNumber"]), tel[[c for c in columns if c in tel.columns]]))
+            samples += writer.add_driver(int(driver_num), driver_laps)
+            laps_written += len(driver_laps)
+            del driver_laps
+    return path.stat().st_size, laps_written, samples
+
+
+# Stage names used by --profile / --profile-stage, in pipeline order
+PROFILE_STAGES = [
+    "session_load", "circuit_info", "results", "laps", "telemetry", "stints", "track_boundary",
+    "track_paths", "driver_deltas", "drs_zones", "write_binary_traces", "weather", "race_control", "lap_context", "team_radio", "write",
+    "all_laps_archive",
+]
+
+
+# Checkpointed stages: name -> (code version, upstream stages), in pipeline order,
+# which is also the order their sections appear in the output JSON.
+# Bump a stage's version whenever a change alters what it outputs.
+CHECKPOINT_STAGES: dict[str, tuple[int, tuple[str, ...]]] = {
+    "circuit_info": (1, ()),
+    "results": (1, ()),
+    "laps": (1, ()),
+    "telemetry": (1, ("laps", "circuit_info")),
+    "stints": (1, ("laps",)),
+    "track_boundary": (3, ("telemetry",)),
+    "track_paths": (2, ("telemetry",)),
+    "driver_deltas": (1, ("telemetry",)),
+    "drs_zones": (1, ("telemetry",)),
+    "weather": (1, ()),
+    "race_control": (1, ()),
+    "lap_context": (1, ("laps", "weather", "race_control")),
+    "team_radio": (1, ("results",)),
+}
+
+# Session data each stage needs loaded, as session.load() keyword arguments.
+# Stages with none are computed from other stages' values (and session metadata).
+STAGE_LOADS: dict[str, set[str]] = {
+    "circuit_info": {"laps", "telemetry"},  # marker distances use the fastest lap's position data
+    "results": set(),
+    "laps": {"laps"},
+    "telemetry": {"laps", "telemetry"},
+    "stints": {"laps"},
+    "track_boundary": set(),
+    "track_paths": set(),
+    "driver_deltas": set(),
+    "drs_zones": set(),
+    "weather": {"weather"},
+    "race_control": {"messages"},
+    "lap_context": {"laps", "weather", "messages"},  # track status is loaded with laps
+    "team_radio": set(),
+}
+SESSION_FREE_STAGES = {"track_boundary", "track_paths", "driver_deltas", "drs_zones", "team_radio"}
+LOAD_FLAGS = ("laps", "telemetry", "weather", "messages")
+
+# FastF1 cache files each load flag fills; the rest (session and driver info) is read on every load
+CACHE_FILES: dict[str, tuple[str, ...]] = {
+    "laps": ("_extended_timing_data.ff1pkl", "timing_app_data.ff1pkl", "track_status_data.ff1pkl",
+             "session_status_data.ff1pkl", "lap_count.ff1pkl"),
+    "telemetry": ("car_data.ff1pkl", "position_data.ff1pkl"),
+    "weather": ("weather_data.ff1pkl",),
+    "messages": ("race_control_messages.ff1pkl",),
+}
+
+# Output section written by each stage
+STAGE_SECTIONS: dict[str, str] = {
+    "circuit_info": "rotation",
+    "results": "drivers",
+    "laps": "lapData",
+    "telemetry": "telemetryData",
+    "stints": "stintData",
+    "track_boundary": "trackBoundary",
+    "track_paths": "trackPaths",
+    "driver_deltas": "driverDeltas",
+    "drs_zones": "drsZones",
+    "weather": "weatherData",
+    "race_control": "raceControlMessages",
+    "lap_context": "lapContext",
+    "team_radio": "teamRadioMessages",
+}
+STAGE_ALIASES = {"radio": "team_radio", "boundary": "track_boundary", "paths": "track_paths",
+                 "deltas": "driver_deltas", "drs": "drs_zones", "context": "lap_context"}
+
+
+def parse_stage_list(spec: str) -> list[str]:
+    """Parse "laps,stints,radio" into stage names, accepting short aliases."""
+    stages = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name = STAGE_ALIASES.get(part, part)
+        if name not in CHECKPOINT_STAGES:
+            raise ValueError(f"Unknown stage: {part}")
+        stages.append(name)
+    return stages
+
+
+def select_stages(only: list[str] | None = None, skip: list[str] | None = None) -> list[str]:
+    """Stages to run for --only/--skip, in pipeline order.
+
+    --only pulls in the stages it reads from; anything downstream of a
+    skipped stage is skipped too. Circuit info only feeds the telemetry
+    traces, so it is dropped with them unless asked for by name.
+    """
+    if only:
+        wanted = set(only)
+        for name in reversed(CHECKPOINT_STAGES):
+            if name in wanted:
+                wanted.update(CHECKPOINT_STAGES[name][1])
+    else:
+        wanted = set(CHECKPOINT_STAGES)
+    wanted -= set(skip or [])
+    for name, (_, upstream) in CHECKPOINT_STAGES.items():
+        if any(dep not in wanted for dep in upstream):
+            wanted.discard(name)
+    if "telemetry" not in wanted and "circuit_info" not in (only or []):
+        wanted.discard("circuit_info")
+    return [name for name in CHECKPOINT_STAGES if name in wanted]
+
+
+def load_previous_output(path: Path) -> dict:
+    """Sections of an earlier output file, or {} if there is none (or it is unreadable)."""
     try:
-        rc_messages = session.race_control_messages
-        if rc_messages is not None and not rc_messages.empty:
-            rc_entries = []
-            for _, row in rc_messages.iterrows():
-                rc_entries.append({
-                    "lapNumber": safe_int(row.get("Lap")),
-                    "category": safe_str(row.get("Category")),
-                    "flag": safe_str(row.get("Flag")),
-                    "scope": safe_str(row.get("Scope")),
-                    "sector": safe_int(row.get("Sector")),
-                    "driverNumber": safe_str(row.get("RacingNumber")),
-                    "message": str(row.get("Message", "")),
-                })
-            output["raceControlMessages"] = rc_entries
-            print(f"  {len(rc_entries)} race control messages")
-    except Exception as e:
-        print(f"  Could not get race control messages: {e}")
+        with open(path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return previous if isinstance(previous, dict) else {}
 
-    # -----------------------------------------------------------------------
-    # Team radio — fetch from F1 live timing archive and download MP3s
-    # -----------------------------------------------------------------------
-    try:
-        api_path = session.api_path
-        radio_url = f"{LIVETIMING_BASE}{api_path}TeamRadio.jsonStream"
-        print(f"  Fetching team radio from {radio_url}")
-
-        req = urllib.request.Request(radio_url, headers={"User-Agent": "f1-tracker/1.0"})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8-sig")
-
-        # Build driver abbreviation lookup from results
-        abbr_map: dict[str, str] = {}
-        for drv in output.get("drivers", []):
-            abbr_map[str(drv["number"])] = drv["abbreviation"]
-
-        # Parse line-delimited JSON: each line has a timestamp prefix then JSON
-        # Format: "HH:MM:SS.fff" followed by JSON like {"Captures": [...]}
-        radio_entries = []
-        for line in raw.strip().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            # Split on first '{' to separate timestamp prefix from JSON
-            brace_idx = line.find("{")
-            if brace_idx < 0:
-                continue
-            try:
-                data = json.loads(line[brace_idx:])
-            except json.JSONDecodeError:
-                continue
 
-            captures_raw = data.get("Captures", [])
-            # Captures can be a list (first message) or a dict with numeric keys
-            if isinstance(captures_raw, dict):
-                captures = list(captures_raw.values())
+class StageIncomplete(Exception):
+    """A stage produced a usable but partial value that must not be checkpointed."""
+
+    def __init__(self, value, message: str):
+        super().__init__(message)
+        self.value = value
+
+
+def session_cache_dir(session) -> Path:
+    """The FastF1 cache directory holding this session's downloaded data."""
+    return CACHE_DIR / session.api_path.removeprefix("/static/")
+
+
+def stage_inputs(cache_dir: Path, loads: dict[str, set[str]] = STAGE_LOADS) -> dict[str, str | None]:
+    """Per stage, a hash of the FastF1 cache files its session loads read.
+
+    Files filled by other load flags are left out, so caching data for one
+    stage doesn't invalidate the checkpoints of stages that never read it.
+    """
+    hashes = file_hashes(cache_dir) or {}
+    flag_of = {name: flag for flag, names in CACHE_FILES.items() for name in names}
+    inputs: dict[str, str | None] = {}
+    for stage, flags in loads.items():
+        read = {name: digest for name, digest in hashes.items() if flag_of.get(Path(name).name) in (None, *flags)}
+        inputs[stage] = combine_hashes(read) if read else None
+    return inputs
+
+
+# Sections every output has, with their value when the stage produced nothing
+REQUIRED_SECTIONS = {"circuit_info": 0.0, "results": [], "laps": [], "telemetry": [], "stints": []}
+
+
+def output_section(stage: str, value) -> tuple[str, object] | None:
+    """The (key, value) a stage contributes to the session JSON, if any.
+
+    Required sections are always present (empty when their stage did not
+    run); optional ones only when they have content.
+    """
+    key = STAGE_SECTIONS[stage]
+    if stage in REQUIRED_SECTIONS:
+        return key, value if value else REQUIRED_SECTIONS[stage]
+    if stage == "team_radio":
+        return (key, value) if value is not None else None
+    return (key, value) if value else None
+
+
+def fetch_team_radio(
+    session, drivers: list[dict], radio_label: str, radio_workers: int = 8
+) -> tuple[list[dict] | None, int]:
+    """Fetch the team radio index from the live timing archive and download MP3s.
+
+    Returns (TelemetryTeamRadio entries for clips available locally, number
+    of clips that failed to download). The entries are None, with 0
+    failures, when the session has no radio captures.
+    """
+    api_path = session.api_path
+    print(f"  Fetching team radio from {LIVETIMING_BASE}{api_path}TeamRadio.jsonStream")
+    client = LivetimingClient(LIVETIMING_BASE, CACHE_DIR / "livetiming")
+
+    # Build driver abbreviation lookup from results
+    abbr_map: dict[str, str] = {}
+    for drv in drivers:
+        abbr_map[str(drv["number"])] = drv["abbreviation"]
+
+    radio_entries = []
+    for cap in iter_captures(client.topic(api_path, "TeamRadio")):
+        racing_number = str(cap.get("RacingNumber", ""))
+        if not racing_number:
+            continue
+        radio_entries.append({
+            "racingNumber": racing_number,
+            "utc": cap.get("Utc", ""),
+            "path": cap["Path"],
+        })
+    if client.last_status != "fetched":
+        print(f"    Radio index from cache ({client.last_status})")
+
+    if not radio_entries:
+        return None, 0
+
+    radio_subdir = RADIO_DIR / radio_label
+    radio_subdir.mkdir(parents=True, exist_ok=True)
+
+    clips = []
+    for idx, entry in enumerate(radio_entries):
+        abbr = abbr_map.get(entry["racingNumber"], entry["racingNumber"])
+        local_name = f"{idx:03d}_{abbr}.mp3"
+        clips.append((entry, local_name, f"{api_path}{entry['path']}", radio_subdir / local_name))
+
+    # Download MP3s not already cached, several at a time over keep-alive connections
+    with RadioDownloader(LIVETIMING_BASE, workers=radio_workers) as downloader:
+        results = downloader.download_all([(url_path, path) for _, _, url_path, path in clips])
+
+    team_radio_messages = []
+    canonical: dict[str, str] = {}  # content hash -> first clip with that audio
+    for (entry, local_name, _, path), result in zip(clips, results):
+        if not result.ok:
+            print(f"    Failed to download {local_name}: {result.error} ({result.attempts} attempts)")
+            continue
+        # The archive sometimes lists the same recording twice; point both at one file
+        audio_name = canonical.setdefault(file_digest(path), local_name)
+        team_radio_messages.append({
+            "driverNumber": int(entry["racingNumber"]),
+            "timestamp": entry["utc"],
+            "audioFile": f"radio/{radio_label}/{audio_name}",
+        })
+
+    downloaded = [r for r in results if r.status == "downloaded"]
+    cached = sum(1 for r in results if r.status == "cached")
+    print(f"  {len(team_radio_messages)} team radio messages ({len(downloaded)} downloaded, {cached} cached)")
+    duplicates = len(team_radio_messages) - len(canonical)
+    if duplicates:
+        print(f"    {duplicates} duplicate clip(s) share audio with an earlier one")
+    if downloaded:
+        timings = sorted(r.seconds for r in downloaded)
+        total_kb = sum(r.bytes for r in downloaded) / 1024
+        print(
+            f"    {total_kb:.0f} KB, per clip median {timings[len(timings) // 2]:.2f}s, "
+            f"max {timings[-1]:.2f}s"
+        )
+    return team_radio_messages, len(clips) - len(team_radio_messages)
+
+
+def fetch_telemetry(
+    year: int,
+    round_num: int,
+    session_type: str = "R",
+    radio_workers: int = 8,
+    binary_traces: bool = False,
+    archive_all_laps: bool = False,
+    sampling: str = "adaptive",
+    workers: int = 1,
+    profile: bool = False,
+    profile_stage: str | None = None,
+    checkpoints: bool = True,
+    force_stages: list[str] | None = None,
+    dry_run: bool = False,
+    only: list[str] | None = None,
+    skip: list[str] | None = None,
+    indent: int | None = None,
+    compress: tuple[str, ...] = (),
+    low_memory: bool = False,
+    season_index: bool = True,
+    previous_manifest: Path | None = None,
+) -> Path:
+    """Fetch telemetry for a specific session, write JSON and return its path.
+
+    Stage outputs are checkpointed under CHECKPOINT_DIR; a re-run loads the
+    session and recomputes only stages whose checkpoint is stale or forced.
+    With dry_run, prints what would be recomputed and writes nothing.
+
+    only/skip select stages (see select_stages); session.load() then fetches
+    only the data the selected stages need, and sections of stages that did
+    not run are carried over from the previous output file.
+
+    The JSON is streamed section by section (compact unless indent is set),
+    optionally with .json.gz / .json.br siblings (compress=("gz", "br")).
+
+    With low_memory, loaded laps and telemetry are downcast in place (each
+    driver's telemetry is restored to full precision while its traces are
+    extracted) and each kind of session data is released once the last
+    stage reading it has finished (see lib/lowmem.py).
+
+    Every artifact (the JSON and its siblings, binary traces, radio clips)
+    is listed with its content hash in {output}.manifest.json, together with
+    what changed since previous_manifest (default: the manifest already at
+    that path), see lib/manifest.py.
+
+    Afterwards the session's summary is folded into the season index under
+    SEASON_INDEX_DIR (unless season_index is False).
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    fastf1.Cache.enable_cache(str(CACHE_DIR))
+    profiler = StageProfiler(enabled=profile, cprofile_stage=profile_stage)
+
+    print(f"Loading {year} Round {round_num} ({session_type})...")
+    session = fastf1.get_session(year, round_num, session_type)
+    event_name = session.event["EventName"]
+    slug = slugify(event_name)
+    output_path = OUTPUT_DIR / output_filename(year, round_num, slug, session_type)
+    radio_label = session_label(year, round_num, session_type)
+
+    # Decide which stages are stale before paying for session.load()
+    store = CheckpointStore(CHECKPOINT_DIR, radio_label)
+    force = set(force_stages or [])
+    identity = {"year": year, "round": round_num, "session": session_type}
+    stage_options = {"telemetry": {"sampling": sampling}}
+    selected = select_stages(only, skip)
+
+    # lap_context places race control messages on the session clock with t0_date, which
+    # FastF1 only derives when telemetry is loaded. It does so only in runs that select the
+    # telemetry stage anyway; other runs match messages by their Lap column, so selecting
+    # fewer stages never costs a telemetry load. The choice is part of the stage's key.
+    timed_messages = "telemetry" in selected
+    loads = {**STAGE_LOADS, "lap_context": STAGE_LOADS["lap_context"] | ({"telemetry"} if timed_messages else set())}
+    stage_options["lap_context"] = {"messageTimes": "session" if timed_messages else "lap"}
+
+    def plan() -> tuple[dict[str, str], dict[str, str | None]]:
+        keys = stage_keys(CHECKPOINT_STAGES, identity, stage_inputs(session_cache_dir(session), loads), stage_options)
+        if not checkpoints:
+            return keys, {name: "checkpoints disabled" for name in CHECKPOINT_STAGES}
+        return keys, store.plan(CHECKPOINT_STAGES, keys, force)
+
+    keys, reasons = plan()
+    if dry_run:
+        print(f"Dry run for {output_path.name} (checkpoints in {store.dir}):")
+        for name, reason in reasons.items():
+            if name not in selected:
+                status = "skipped"
             else:
-                captures = captures_raw
-            for cap in captures:
-                racing_number = str(cap.get("RacingNumber", ""))
-                utc = cap.get("Utc", "")
-                audio_path = cap.get("Path", "")
-                if not racing_number or not audio_path:
-                    continue
-                radio_entries.append({
-                    "racingNumber": racing_number,
-                    "utc": utc,
-                    "path": audio_path,
-                })
-
-        if radio_entries:
-            radio_subdir = RADIO_DIR / f"{year}-R{round_num:02d}"
-            radio_subdir.mkdir(parents=True, exist_ok=True)
-
-            team_radio_messages = []
-            downloaded = 0
-            skipped = 0
-
-            for idx, entry in enumerate(radio_entries):
-                abbr = abbr_map.get(entry["racingNumber"], entry["racingNumber"])
-                local_name = f"{idx:03d}_{abbr}.mp3"
-                local_path = radio_subdir / local_name
-                rel_path = f"radio/{year}-R{round_num:02d}/{local_name}"
-
-                # Download MP3 if not already cached
-                if not local_path.exists():
-                    mp3_url = f"{LIVETIMING_BASE}{api_path}{entry['path']}"
-                    try:
-                        mp3_req = urllib.request.Request(mp3_url, headers={"User-Agent": "f1-tracker/1.0"})
-                        with urllib.request.urlopen(mp3_req, timeout=15) as mp3_resp:
-                            mp3_data = mp3_resp.read()
-                        with open(local_path, "wb") as mp3f:
-                            mp3f.write(mp3_data)
-                        downloaded += 1
-                    except Exception as dl_err:
-                        print(f"    Failed to download {local_name}: {dl_err}")
-                        continue
+                status = f"recompute: {reason}" if reason else "cached"
+            print(f"  {name:14s} {status}")
+        return output_path
+
+    # Only load the session data that stale, selected stages actually read
+    def needed_loads(reasons: dict[str, str | None]) -> tuple[list[str], set[str]]:
+        stale = [name for name in selected if reasons[name] and name not in SESSION_FREE_STAGES]
+        needed = set().union(*(loads[name] for name in stale))
+        if archive_all_laps:
+            needed |= {"laps", "telemetry"}
+        return stale, needed
+
+    stale, needed = needed_loads(reasons)
+    lap_index = None
+    if stale or archive_all_laps:
+        with profiler.stage("session_load"):
+            loaded = None
+            while needed != loaded:
+                session.load(**{flag: flag in needed for flag in LOAD_FLAGS})
+                loaded = needed
+                # Loading may have filled or refreshed the FastF1 cache, making more
+                # stages stale; load again with their data too (at most once per flag)
+                keys, reasons = plan()
+                needed = loaded | needed_loads(reasons)[1]
+            if low_memory:
+                saved = downcast_session(session)
+                profiler.count(savedBytes=saved)
+                print(f"  Downcast session data ({saved / 1024 / 1024:.1f} MB saved)")
+            if "laps" in needed:
+                lap_index = LapIndex(session.laps)
+
+    # Session data each stage is the last reader of, dropped once that stage is done
+    release_after: dict[str, list[str]] = {}
+    if low_memory:
+        readers = [name for name in selected if reasons[name] and name not in SESSION_FREE_STAGES]
+        kept = {"laps", "telemetry"} if archive_all_laps else set()
+        release_after = release_plan(readers, loads, keep=kept)
+
+    def release(stage: str) -> None:
+        nonlocal lap_index
+        for flag in release_after.get(stage, []):
+            if flag == "laps":
+                lap_index = None
+            released = release_session_data(session, flag)
+            if released:
+                print(f"  Released {', '.join(released)} after {stage}")
+
+    previous = load_previous_output(output_path) if len(selected) < len(CHECKPOINT_STAGES) else {}
+
+    # Sections are streamed to disk as each stage finishes
+    writer = JsonSectionWriter(output_path, indent=indent, compress=compress)
+    counts: dict[str, int] = {}
+
+    def emit(name: str, value) -> None:
+        section = output_section(name, value)
+        if section is not None:
+            writer.section(*section)
+            counts[section[0]] = len(section[1]) if isinstance(section[1], (list, dict)) else 1
+
+    def run_stage(name: str, compute, default=None):
+        """Get a stage's value and write its section.
+
+        The value comes from a current checkpoint, or is computed (and
+        checkpointed); a stage that is not selected keeps its section from
+        the previous output.
+        """
+        if name not in selected:
+            value = previous.get(STAGE_SECTIONS[name], default)
+            emit(name, value)
+            return value
+        with profiler.stage(name):
+            if reasons[name] is None:
+                value = store.load(name)
+                profiler.count(checkpoint=1)
+            else:
+                try:
+                    value = compute()
+                except StageIncomplete as e:
+                    print(f"  {name} incomplete, not checkpointed: {e}")
+                    value = e.value
+                except Exception as e:
+                    print(f"  Could not compute {name}: {e}")
+                    value = default
+                else:
+                    if checkpoints:
+                        store.save(name, keys[name], value)
+            emit(name, value)
+        release(name)
+        return value
+
+    try:
+        for key, value in (
+            ("year", year),
+            ("round", round_num),
+            ("eventName", event_name),
+            ("sessionType", session_type),
+            ("circuitName", session.event.get("Location", "")),
+            ("country", session.event.get("Country", "")),
+        ):
+            writer.section(key, value)
+
+        # Circuit rotation angle
+        def circuit_info():
+            rotation = float(session.get_circuit_info().rotation)
+            print(f"  Circuit rotation: {rotation}°")
+            return rotation
+
+        rotation_angle = run_stage("circuit_info", circuit_info, default=0.0) or 0.0
+
+        # Driver results — extract ALL available fields
+        def results():
+            rows = serialize_results(session.results)
+            profiler.count(rows=len(rows))
+            return rows
+
+        drivers = run_stage("results", results, default=[])
+
+        # Lap data — extract ALL available fields
+        def laps():
+            lap_data = serialize_laps(session.laps)
+            profiler.count(rows=len(lap_data), drivers=len(lap_index))
+            return lap_data
+
+        run_stage("laps", laps, default=[])
+
+        # Telemetry traces — extract ALL channels including RPM, nGear, Z
+        def telemetry():
+            print("Fetching telemetry traces for fastest laps...")
+            entries = build_telemetry_traces(
+                lap_index, rotation_angle, sampling=sampling, workers=workers, session=session if low_memory else None
+            )
+            profiler.count(traces=len(entries), points=sum(len(t["distance"]) for t in entries))
+            return entries
+
+        traces = run_stage("telemetry", telemetry, default=[])
+
+        # Stint data
+        def stints():
+            stint_data = serialize_stints(session.laps)
+            profiler.count(rows=len(stint_data))
+            return stint_data
+
+        run_stage("stints", stints, default=[])
+
+        # Track boundary from first driver's rotated coords
+        def track_boundary():
+            if not traces or not traces[0]["x"] or not traces[0]["y"]:
+                return None
+            ref = traces[0]
+            boundary = compute_track_boundary(np.array(ref["x"]), np.array(ref["y"]))
+            boundary.update(boundary_pyramid(boundary))
+            levels = [str(level["points"]) for level in boundary["levels"]] + [str(len(ref["x"]))]
+            print(f"  Track boundary computed ({' / '.join(levels)} points)")
+            profiler.count(points=len(ref["x"]))
+            return boundary
+
+        run_stage("track_boundary", track_boundary)
+
+        # Level-of-detail pyramid of each driver's fastest-lap path
+        def track_paths():
+            pyramids = (
+                {"driverNumber": t["driverNumber"], **path_pyramid(t["x"], t["y"])}
+                for t in traces
+                if t.get("x") and t.get("y")
+            )
+            # Paths too short to reduce have no levels; the section is left out if none has any
+            paths = [p for p in pyramids if p["levels"]]
+            profiler.count(paths=len(paths), levels=sum(len(p["levels"]) for p in paths))
+            return paths
+
+        run_stage("track_paths", track_paths, default=[])
+
+        # All-pairs time deltas and mini-sector dominance on a shared distance grid
+        def driver_deltas():
+            deltas = compute_driver_deltas(traces)
+            if deltas:
+                n = len(deltas["drivers"])
+                print(f"  Driver deltas: {n}x{n} drivers x {len(deltas['binEdges']) - 1} mini-sectors")
+                profiler.count(drivers=n, bins=len(deltas["binEdges"]) - 1)
+            return deltas
+
+        run_stage("driver_deltas", driver_deltas)
+
+        # DRS zones
+        def drs_zones():
+            zones = extract_drs_zones(traces)
+            if zones:
+                print(f"  Found {len(zones)} DRS zone(s)")
+            profiler.count(zones=len(zones))
+            return zones
+
+        run_stage("drs_zones", drs_zones, default=[])
+
+        if binary_traces and traces:
+            with profiler.stage("write_binary_traces"):
+                traces_path = output_path.with_suffix(".traces.bin")
+                try:
+                    size = write_traces(traces, traces_path)
+                except ValueError as e:
+                    # Optional sidecar: a channel that doesn't fit its encoding skips the pack only
+                    size = None
+                    traces_path.unlink(missing_ok=True)  # don't leave an earlier run's pack behind
+                    print(f"  Could not write binary traces: {e}")
                 else:
-                    skipped += 1
+                    profiler.count(bytes=size)
+            if size is not None:
+                print(f"Binary traces written to {traces_path} ({size / 1024:.0f} KB)")
+        traces = None  # written out; nothing downstream reads the traces
+
+        # Weather data from session
+        def weather():
+            entries = serialize_weather(session.weather_data)
+            if entries:
+                print(f"  {len(entries)} weather entries")
+            profiler.count(rows=len(entries))
+            return entries
+
+        run_stage("weather", weather, default=[])
+
+        # Race control messages from session
+        def race_control():
+            entries = serialize_race_control(session.race_control_messages)
+            if entries:
+                print(f"  {len(entries)} race control messages")
+            profiler.count(rows=len(entries))
+            return entries
+
+        run_stage("race_control", race_control, default=[])
+
+        # Per-lap weather, track state and race control references, joined on session time
+        def lap_context():
+            context = build_lap_context(
+                session.laps,
+                session.weather_data,
+                loaded_attr(session, "track_status"),
+                session.race_control_messages,
+                loaded_attr(session, "t0_date") if timed_messages else None,
+            )
+            if context:
+                profiler.count(rows=len(context["laps"]["weather"]), laps=len(context["index"]["lapNumber"]))
+            return context
+
+        run_stage("lap_context", lap_context)
+
+        # Team radio — fetch from F1 live timing archive and download MP3s
+        def team_radio():
+            try:
+                messages, failed = fetch_team_radio(session, drivers or [], radio_label, radio_workers)
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    raise StageIncomplete(None, "no team radio archive available for this session") from e
+                raise StageIncomplete(None, f"HTTP {e.code}") from e
+            except OSError as e:
+                raise StageIncomplete(None, str(e)) from e
+            if messages is not None:
+                profiler.count(clips=len(messages))
+            if failed:
+                raise StageIncomplete(messages, f"{failed} clip(s) failed to download")
+            return messages
+
+        radio_messages = run_stage("team_radio", team_radio)
+
+        # Finish the document and move it (and compressed siblings) into place
+        with profiler.stage("write"):
+            sizes = writer.close()
+            profiler.count(bytes=sizes[output_path])
+    except BaseException:
+        writer.abort()
+        raise
+
+    print(f"Written to {output_path} ({sizes[output_path] / 1024:.0f} KB)")
+    for path, size in sizes.items():
+        if path != output_path:
+            ratio = size / sizes[output_path] if sizes[output_path] else 0
+            print(f"  {path.name}: {size / 1024:.0f} KB ({ratio:.0%})")
+    if archive_all_laps and lap_index.drivers:
+        print("Extracting telemetry for every lap...")
+        with profiler.stage("all_laps_archive"):
+            archive_path = output_path.with_suffix(".laps.bin")
+            size, lap_count, samples = write_lap_archive(
+                lap_index, archive_path, rotation_angle, session=session if low_memory else None
+            )
+            profiler.count(bytes=size, laps=lap_count, points=samples)
+        print(f"All-laps archive written to {archive_path} ({lap_count} laps, {size / 1024 / 1024:.1f} MB)")
+    artifacts = {f"telemetry/{path.name}": path for path in sizes}
+    for suffix, produced in ((".traces.bin", binary_traces), (".laps.bin", archive_all_laps)):
+        extra = output_path.with_suffix(suffix)
+        if produced and extra.exists():
+            artifacts[f"telemetry/{extra.name}"] = extra
+    for clip in sorted((RADIO_DIR / radio_label).glob("*.mp3")):
+        artifacts[f"radio/{radio_label}/{clip.name}"] = clip
+    manifest_path = output_path.with_suffix(".manifest.json")
+    previous = load_manifest(previous_manifest or manifest_path)
+    # Clips the JSON links to must be uploaded even when they share audio with another file
+    referenced = {message["audioFile"] for message in radio_messages or []}
+    changes = write_manifest(manifest_path, artifacts, previous, referenced)["changes"]
+    print(
+        f"Manifest written to {manifest_path} ({len(changes['upload'])} to upload, "
+        f"{changes['unchanged']} unchanged, {len(changes['removed'])} removed)"
+    )
+    recomputed = [name for name in selected if reasons[name]]
+    print(f"  Stages recomputed: {', '.join(recomputed) if recomputed else 'none (all from checkpoints)'}")
+    if len(selected) < len(CHECKPOINT_STAGES):
+        kept = [name for name in CHECKPOINT_STAGES if name not in selected]
+        print(f"  Stages skipped (previous output kept): {', '.join(kept)}")
+    print(f"  {counts['drivers']} drivers")
+    print(f"  {counts['lapData']} laps")
+    print(f"  {counts['telemetryData']} telemetry traces")
+    print(f"  {counts['stintData']} stints")
+    print(f"  {counts.get('drsZones', 0)} DRS zones")
+    print(f"  Boundary: {'yes' if 'trackBoundary' in counts else 'no'}")
+    print(f"  Track paths: {counts.get('trackPaths', 0)} drivers")
+    print(f"  Weather: {counts.get('weatherData', 0)} entries")
+    print(f"  Race control: {counts.get('raceControlMessages', 0)} messages")
+    print(f"  Team radio: {counts.get('teamRadioMessages', 0)} clips")
+    peak = peak_rss_bytes()
+    if peak:
+        print(f"  Peak RSS: {peak / 1024 / 1024:.0f} MB{' (low-memory mode)' if low_memory else ''}")
+
+    profiler.record_output(writer.section_bytes, {path.name: size for path, size in sizes.items()})
+    report_path = profiler.write(
+        output_path, year=year, round=round_num, sessionType=session_type, output=str(output_path),
+        lowMemory=low_memory,
+    )
+    if report_path:
+        print(f"Profile report written to {report_path}")
+    if season_index:
+        index_file, changed = update_season_index(SEASON_INDEX_DIR, output_path)
+        print(f"Season index {'updated' if changed else 'unchanged'}: {index_file}")
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Watch mode — incremental deltas while a session is running
+# ---------------------------------------------------------------------------
+
+
+def watch_session(
+    year: int,
+    round_num: int,
+    session_type: str = "R",
+    interval: float = 30.0,
+    compact_every: int = 10,
+    radio_workers: int = 8,
+    indent: int | None = None,
+    compress: tuple[str, ...] = (),
+) -> Path:
+    """Poll the livetiming archive for a running session and write delta files.
+
+    Every poll that brings new laps, race control messages or radio clips
+    becomes one sequence-numbered delta under OUTPUT_DIR/live/{label}/ (see
+    lib/watch.py); every compact_every deltas, and once the session is
+    finalised, they are folded into the session JSON. Returns its path.
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    fastf1.Cache.enable_cache(str(CACHE_DIR))
+    session = fastf1.get_session(year, round_num, session_type)
+    event_name = session.event["EventName"]
+    output_path = OUTPUT_DIR / output_filename(year, round_num, slugify(event_name), session_type)
+    label = session_label(year, round_num, session_type)
+    live_dir = OUTPUT_DIR / "live" / label
+    state_path = live_dir / "state.json"
+
+    client = LivetimingClient(LIVETIMING_BASE, CACHE_DIR / "livetiming")
+    live = LiveSession.load(state_path)
+    log = DeltaLog(live_dir, output_path.name)
+    if log.recover(live.seq):
+        print(f"  Published delta {log.head['seq']}, left unpublished by the previous run")
+    print(f"Watching {year} Round {round_num} ({session_type}) every {interval:g}s, from delta {log.head['seq'] + 1}")
+
+    def compact() -> None:
+        skeleton = {
+            "year": year,
+            "round": round_num,
+            "eventName": event_name,
+            "sessionType": session_type,
+            "circuitName": session.event.get("Location", ""),
+            "country": session.event.get("Country", ""),
+            **{STAGE_SECTIONS[stage]: value for stage, value in REQUIRED_SECTIONS.items()},
+            "drivers": live.driver_entries(),
+        }
+        folded = log.compact(output_path, skeleton, indent=indent, compress=compress)
+        if folded:
+            print(f"  Compacted {folded} delta(s) into {output_path.name}")
+
+    with RadioDownloader(LIVETIMING_BASE, workers=radio_workers) as downloader:
+        while True:
+            delta, clips = live.poll(client, session.api_path, label)
+            if clips:
+                radio_dir = RADIO_DIR / label
+                radio_dir.mkdir(parents=True, exist_ok=True)
+                results = downloader.download_all(
+                    [(f"{session.api_path}{path}", radio_dir / name) for path, name in clips]
+                )
+                # Failed clips stay pending in the poll state and are retried next time
+                delta["teamRadioMessages"] = live.downloaded({r.local_path.name for r in results if r.ok})
+            # Delta first, then poll state (naming the delta's seq), then head. A crash before
+            # the state is saved re-polls the same data into the same seq; a crash after it
+            # leaves the delta for recover() to publish on restart.
+            path = log.write(delta)
+            if path:
+                live.seq = log.head["seq"] + 1
+            live.save(state_path)
+            log.commit()
+            if path:
+                print(
+                    f"  Delta {log.head['seq']}: {len(delta['lapData'])} laps, "
+                    f"{len(delta['raceControlMessages'])} messages, {len(delta['teamRadioMessages'])} clips "
+                    f"({path.stat().st_size / 1024:.1f} KB)"
+                )
+            if live.finished:
+                print(f"  Session status: {live.status}")
+                break
+            if len(log.pending()) >= compact_every:
+                compact()
+            time.sleep(interval)
+
+    compact()
+    log.finish()
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Batch mode — many sessions, one worker process each
+# ---------------------------------------------------------------------------
+
+
+def parse_rounds(spec: str) -> list[int]:
+    """Parse a round list like "1-5,8,10" into sorted unique round numbers."""
+    rounds: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(p) for p in part.split("-", 1))
+            if lo > hi:
+                raise ValueError(f"Invalid round range: {part}")
+            rounds.update(range(lo, hi + 1))
+        else:
+            rounds.add(int(part))
+    if not rounds:
+        raise ValueError(f"No rounds in {spec!r}")
+    return sorted(rounds)
+
+
+def parse_session_types(spec: str) -> list[str]:
+    """Parse "R,Q,S" into ["R", "Q", "S"], keeping order and dropping repeats."""
+    types: list[str] = []
+    for part in spec.split(","):
+        part = part.strip().upper()
+        if part and part not in types:
+            types.append(part)
+    if not types:
+        raise ValueError(f"No session types in {spec!r}")
+    return types
+
+
+def plan_jobs(
+    year: int, rounds: list[int] | None, session_types: list[str]
+) -> list[tuple[int, int, str]]:
+    """Expand rounds x session types into (year, round, session) jobs.
+
+    Uses the event schedule to drop sessions an event doesn't have (e.g. "S"
+    on a conventional weekend) and sessions that haven't started yet.
+    rounds=None means every round of the season.
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    fastf1.Cache.enable_cache(str(CACHE_DIR))
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
 
-                team_radio_messages.append({
-                    "driverNumber": int(entry["racingNumber"]),
-                    "timestamp": entry["utc"],
-                    "audioFile": rel_path,
-                })
+    if rounds is None:
+        rounds = sorted(int(r) for r in schedule["RoundNumber"] if r > 0)
 
-            output["teamRadioMessages"] = team_radio_messages
-            print(f"  {len(team_radio_messages)} team radio messages ({downloaded} downloaded, {skipped} cached)")
+    jobs: list[tuple[int, int, str]] = []
+    for round_num in rounds:
+        try:
+            event = schedule.get_event_by_round(round_num)
+        except ValueError as e:
+            print(f"  Skipping round {round_num}: {e}")
+            continue
+        for session_type in session_types:
+            try:
+                start = event.get_session_date(session_type, utc=True)
+            except ValueError:
+                continue  # session type not part of this weekend's format
+            if pd.notna(start) and start > now:
+                continue
+            jobs.append((year, round_num, session_type))
+    return jobs
 
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            print("  No team radio archive available for this session")
-        else:
-            print(f"  Could not fetch team radio: HTTP {e.code}")
+
+def run_job(job: tuple[int, int, str], **options) -> dict:
+    """Run one fetch_telemetry job, capturing its log and any failure.
+
+    Executed inside a worker process; never raises so one bad session can't
+    take down the batch. Keyword options are passed through to fetch_telemetry.
+    """
+    year, round_num, session_type = job
+    log = io.StringIO()
+    started = time.perf_counter()
+    result = {"job": job, "ok": False, "output": None, "error": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            result["output"] = str(fetch_telemetry(year, round_num, session_type, **options))
+        result["ok"] = True
     except Exception as e:
-        print(f"  Could not fetch team radio: {e}")
-
-    # Write output
-    filename = f"{year}-R{round_num:02d}-{slug}.json"
-    output_path = OUTPUT_DIR / filename
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
-
-    print(f"Written to {output_path}")
-    print(f"  {len(output['drivers'])} drivers")
-    print(f"  {len(output['lapData'])} laps")
-    print(f"  {len(output['telemetryData'])} telemetry traces")
-    print(f"  {len(output['stintData'])} stints")
-    print(f"  {len(output.get('drsZones', []))} DRS zones")
-    print(f"  Boundary: {'yes' if 'trackBoundary' in output else 'no'}")
-    print(f"  Weather: {len(output.get('weatherData', []))} entries")
-    print(f"  Race control: {len(output.get('raceControlMessages', []))} messages")
-    print(f"  Team radio: {len(output.get('teamRadioMessages', []))} clips")
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 1)
+    result["log"] = log.getvalue()
+    return result
+
+
+def run_batch(jobs: list[tuple[int, int, str]], max_workers: int = 2, worker=run_job) -> list[dict]:
+    """Run jobs in a process pool and return their results in job order.
+
+    Each job gets a fresh worker process (max_tasks_per_child=1) so memory
+    from one session.load() is returned to the OS before the next starts.
+    """
+    results: dict[tuple[int, int, str], dict] = {}
+    with ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=1) as pool:
+        futures = {pool.submit(worker, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # worker died (e.g. OOM-killed)
+                result = {"job": job, "ok": False, "output": None,
+                          "error": f"{type(e).__name__}: {e}", "seconds": None, "log": ""}
+            results[job] = result
+            label = session_label(*job)
+            print(f"--- {label} ({'ok' if result['ok'] else 'FAILED'}) ---")
+            if result["log"]:
+                print(result["log"], end="")
+            if result["error"]:
+                print(f"  Error: {result['error']}")
+    return [results[job] for job in jobs]
+
+
+def print_batch_summary(results: list[dict]) -> None:
+    """Print one line per job plus totals."""
+    print("\nBatch summary:")
+    for r in results:
+        seconds = f"{r['seconds']:.1f}s" if r["seconds"] is not None else "-"
+        detail = r["output"] if r["ok"] else r["error"]
+        print(f"  {session_label(*r['job']):<12} {'ok' if r['ok'] else 'FAILED':<7} {seconds:>8}  {detail}")
+    failed = sum(1 for r in results if not r["ok"])
+    print(f"  {len(results) - failed} succeeded, {failed} failed")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Fetch F1 telemetry data")
     parser.add_argument("--year", type=int, required=True, help="Season year")
-    parser.add_argument("--round", type=int, required=True, help="Round number")
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--round", type=int, help="Round number")
+    which.add_argument("--rounds", type=str, help='Round list for batch mode, e.g. "1-5,8"')
+    which.add_argument("--season", action="store_true", help="Every completed round of the season")
+    which.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild the season index from the session outputs already on disk, then exit",
+    )
     parser.add_argument(
         "--session",
         type=str,
         default="R",
-        help="Session type: R (Race), Q (Qualifying), S (Sprint), etc.",
+        help="Session type: R (Race), Q (Qualifying), S (Sprint), etc. Comma-separate for several.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=2,
+        help="Worker processes for batch mode (default: 2)",
+    )
+    parser.add_argument(
+        "--radio-workers",
+        type=int,
+        default=8,
+        help="Concurrent team radio downloads (default: 8)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for per-driver telemetry extraction (default: 1)",
+    )
+    parser.add_argument(
+        "--sampling",
+        choices=["adaptive", "fixed"],
+        default="adaptive",
+        help="Trace decimation: error-bounded 'adaptive' (default) or every 10th sample ('fixed')",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write a per-stage timing/memory report to {output}.profile.json",
+    )
+    parser.add_argument(
+        "--profile-stage",
+        choices=PROFILE_STAGES,
+        help="With --profile, also run this stage under cProfile ({output}.{stage}.prof)",
+    )
+    parser.add_argument(
+        "--binary-traces",
+        action="store_true",
+        help="Also write telemetry traces to a compact {output}.traces.bin sidecar",
+    )
+    parser.add_argument(
+        "--all-laps",
+        action="store_true",
+        help="Also write every lap's telemetry to a memory-mappable {output}.laps.bin archive",
+    )
+    parser.add_argument(
+        "--force-stage",
+        type=str,
+        help=f"Recompute these stages (and their dependents) even if checkpointed: {','.join(CHECKPOINT_STAGES)}",
+    )
+    parser.add_argument(
+        "--no-checkpoints",
+        action="store_true",
+        help="Recompute every stage and don't write stage checkpoints",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the output JSON (default: compact separators)",
+    )
+    parser.add_argument(
+        "--compress",
+        type=str,
+        default="",
+        help="Also write precompressed siblings: gz, br or gz,br ({output}.json.gz / .json.br)",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Downcast loaded data and release session frames as soon as no stage needs them",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Poll a running session and write incremental delta files until it is finalised",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between polls in --watch mode (default: 30)",
+    )
+    parser.add_argument(
+        "--compact-every",
+        type=int,
+        default=10,
+        help="Fold delta files into the session JSON after this many (default: 10)",
+    )
+    parser.add_argument(
+        "--previous-manifest",
+        type=Path,
+        help="Diff the output manifest against this one (e.g. the last deployed) instead of the local copy",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Don't update the season index after writing the output",
+    )
+    parser.add_argument(
+        "--only",
+        type=str,
+        help="Run only these stages (plus the ones they read from), e.g. laps,stints,weather",
+    )
+    parser.add_argument(
+        "--skip",
+        type=str,
+        help="Skip these stages and everything that depends on them, e.g. telemetry,radio",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List which stages would be recomputed, without loading the session or writing output",
     )
     args = parser.parse_args()
 
-    fetch_telemetry(args.year, args.round, args.session)
+    if args.rebuild_index:
+        changed = rebuild_season_index(SEASON_INDEX_DIR, OUTPUT_DIR, args.year)
+        print(f"Season index {'rebuilt' if changed else 'unchanged'}: {SEASON_INDEX_DIR / f'{args.year}.json'}")
+        return
+
+    try:
+        force_stages = parse_stage_list(args.force_stage or "")
+        only = parse_stage_list(args.only) if args.only else None
+        skip = parse_stage_list(args.skip) if args.skip else None
+    except ValueError as e:
+        parser.error(str(e))
+    compress = tuple(c.strip() for c in args.compress.split(",") if c.strip())
+    unknown = sorted(set(compress) - set(COMPRESSIONS))
+    if unknown:
+        parser.error(f"unknown compression(s): {', '.join(unknown)} (choose from {', '.join(COMPRESSIONS)})")
+
+    session_types = parse_session_types(args.session)
+    if args.watch:
+        if args.round is None or len(session_types) != 1:
+            parser.error("--watch needs a single --round and --session")
+        watch_session(
+            args.year,
+            args.round,
+            session_types[0],
+            interval=args.watch_interval,
+            compact_every=max(1, args.compact_every),
+            radio_workers=args.radio_workers,
+            indent=2 if args.pretty else None,
+            compress=compress,
+        )
+        return
+
+    options = {
+        "radio_workers": args.radio_workers,
+        "binary_traces": args.binary_traces,
+        "archive_all_laps": args.all_laps,
+        "sampling": args.sampling,
+        "workers": args.workers,
+        "profile": args.profile or args.profile_stage is not None,
+        "profile_stage": args.profile_stage,
+        "checkpoints": not args.no_checkpoints,
+        "force_stages": force_stages,
+        "dry_run": args.dry_run,
+        "only": only,
+        "skip": skip,
+        "indent": 2 if args.pretty else None,
+        "compress": compress,
+        "low_memory": args.low_memory,
+        "season_index": not args.no_index and not args.dry_run,
+    }
+
+    # Single session: run in-process exactly as before
+    if args.round is not None and len(session_types) == 1:
+        fetch_telemetry(args.year, args.round, session_types[0], previous_manifest=args.previous_manifest, **options)
+        return
+    if args.previous_manifest:
+        parser.error("--previous-manifest needs a single --round and --session")
+
+    if args.round is not None:
+        rounds = [args.round]
+    elif args.rounds:
+        rounds = parse_rounds(args.rounds)
+    else:
+        rounds = None
+
+    jobs = plan_jobs(args.year, rounds, session_types)
+    if not jobs:
+        print("No sessions to fetch")
+        return
+    print(f"Fetching {len(jobs)} session(s) with {args.jobs} worker(s)...")
+    # Workers would race on the season index file; fold their outputs in here instead
+    worker = functools.partial(run_job, **{**options, "season_index": False})
+    results = run_batch(jobs, max_workers=max(1, args.jobs), worker=worker)
+    print_batch_summary(results)
+    if options["season_index"]:
+        for result in results:
+            if result["ok"]:
+                update_season_index(SEASON_INDEX_DIR, Path(result["output"]))
+    if any(not r["ok"] for r in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
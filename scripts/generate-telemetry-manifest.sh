@@ -18,7 +18,8 @@ entries = []
 for f in sorted(os.listdir(telemetry_dir)):
     if not f.endswith('.json'):
         continue
-    m = re.match(r'^(\d{4})-R(\d{2})-(.+)\.json$', f)
+    # Race files only: sidecars (.profile.json) and other sessions (.q.json) carry an extra dot
+    m = re.match(r'^(\d{4})-R(\d{2})-([^.]+)\.json$', f)
     if not m:
         continue
     entries.append({
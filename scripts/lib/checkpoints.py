@@ -0,0 +1,138 @@
+"""
+On-disk checkpoints for fetch_telemetry stages.
+
+Each stage's output section is stored under
+``{root}/{session label}/{stage}.json``: a first line holding the key it was
+built from, then the JSON value, so keys can be checked without parsing the
+(possibly large) values. A key hashes the session identity, a content hash of the session's
+files in the FastF1 cache that the stage reads (see combine_hashes), the
+stage's code version, any options that change its output and the keys of
+the stages it reads from. A re-run recomputes
+only stages whose stored key no longer matches (or that were forced, along
+with everything downstream of them) and reassembles the rest from disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_hashes(path: Path) -> dict[str, str] | None:
+    """SHA-256 of every file under path, by relative name (None if path is not a directory)."""
+    path = Path(path)
+    if not path.is_dir():
+        return None
+    hashes = {}
+    for file in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest = hashlib.sha256()
+        with open(file, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        hashes[file.relative_to(path).as_posix()] = digest.hexdigest()
+    return hashes
+
+
+def combine_hashes(hashes: dict[str, str]) -> str:
+    """One SHA-256 over the names and hashes of a set of files (e.g. a subset of file_hashes())."""
+    digest = hashlib.sha256()
+    for name in sorted(hashes):
+        digest.update(f"{name}\0{hashes[name]}\0".encode())
+    return digest.hexdigest()
+
+
+def hash_tree(path: Path) -> str | None:
+    """SHA-256 over the relative names and contents of every file under path."""
+    hashes = file_hashes(path)
+    return None if hashes is None else combine_hashes(hashes)
+
+
+def stage_keys(
+    stages: dict[str, tuple[int, tuple[str, ...]]],
+    identity: dict,
+    inputs_hash: str | dict[str, str | None] | None,
+    options: dict[str, dict] | None = None,
+) -> dict[str, str]:
+    """Checkpoint key per stage; stages must be listed after their upstream stages.
+
+    inputs_hash is either shared by every stage or given per stage name.
+    """
+    keys: dict[str, str] = {}
+    for name, (version, upstream) in stages.items():
+        material = {
+            "stage": name,
+            "version": version,
+            "session": identity,
+            "inputs": inputs_hash.get(name) if isinstance(inputs_hash, dict) else inputs_hash,
+            "options": (options or {}).get(name, {}),
+            "upstream": {dep: keys[dep] for dep in upstream},
+        }
+        keys[name] = hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+    return keys
+
+
+class CheckpointStore:
+    """Stage outputs for one session, one JSON file per stage."""
+
+    def __init__(self, root: Path, label: str):
+        self.dir = Path(root) / label
+
+    def _path(self, stage: str) -> Path:
+        return self.dir / f"{stage}.json"
+
+    def stored_key(self, stage: str) -> str | None:
+        """Key of the stored checkpoint, or None when there is none (or it is unreadable)."""
+        try:
+            with open(self._path(stage)) as f:
+                return json.loads(f.readline())["key"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def load(self, stage: str):
+        with open(self._path(stage)) as f:
+            f.readline()
+            return json.load(f)
+
+    def save(self, stage: str, key: str, value) -> None:
+        """Atomically replace the checkpoint for a stage."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=f".{stage}.", suffix=".part")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps({"stage": stage, "key": key}) + "\n")
+                json.dump(value, f, separators=(",", ":"))
+            os.replace(tmp, self._path(stage))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def plan(
+        self,
+        stages: dict[str, tuple[int, tuple[str, ...]]],
+        keys: dict[str, str],
+        force: set[str] | frozenset = frozenset(),
+    ) -> dict[str, str | None]:
+        """Why each stage must be recomputed (None when its checkpoint is current)."""
+        reasons: dict[str, str | None] = {}
+        forced: set[str] = set()
+        for name, (_, upstream) in stages.items():
+            forced_upstream = [dep for dep in upstream if dep in forced]
+            stored = self.stored_key(name)
+            if name in force:
+                reasons[name] = "forced"
+            elif forced_upstream:
+                reasons[name] = f"upstream {', '.join(forced_upstream)} forced"
+            elif stored is None:
+                reasons[name] = "no checkpoint"
+            elif stored != keys[name]:
+                reasons[name] = "inputs or code changed"
+            else:
+                reasons[name] = None
+            if name in force or forced_upstream:
+                forced.add(name)
+        return reasons
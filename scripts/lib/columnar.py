@@ -0,0 +1,230 @@
+"""
+Column-at-a-time serialization of FastF1 tables into JSON-ready records.
+
+Each helper converts a whole DataFrame column in one pass and returns a plain
+Python list, using None wherever the source value is NaN/NaT. The results are
+value-for-value identical to the per-cell safe_* helpers in fetch_telemetry.py,
+so the JSON shape in app/types/telemetry.ts is unchanged.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def _missing(frame: pd.DataFrame) -> list:
+    return [None] * len(frame)
+
+
+def _with_nulls(values: list, mask: np.ndarray) -> list:
+    """Replace values at masked positions with None (in place)."""
+    for i in np.flatnonzero(mask):
+        values[i] = None
+    return values
+
+
+def seconds_column(frame: pd.DataFrame, name: str) -> list[float | None]:
+    """Convert a timedelta column to seconds, matching Timedelta.total_seconds().
+
+    Timedelta.total_seconds() truncates to microseconds and sums whole seconds
+    and the microsecond fraction separately, so do the same here to stay
+    bit-identical with the per-row path.
+    """
+    if name not in frame.columns:
+        return _missing(frame)
+    series = frame[name]
+    if not pd.api.types.is_timedelta64_dtype(series.dtype):
+        series = pd.to_timedelta(series)
+    mask = series.isna().to_numpy()
+    micros = series.to_numpy(dtype="timedelta64[ns]").astype("int64") // 1000
+    whole, frac = np.divmod(micros, 1_000_000)
+    seconds = whole.astype("float64") + frac / 1e6
+    return _with_nulls(seconds.tolist(), mask)
+
+
+def float_column(frame: pd.DataFrame, name: str) -> list[float | None]:
+    """Convert a column to floats, None for NaN."""
+    if name not in frame.columns:
+        return _missing(frame)
+    series = frame[name]
+    mask = series.isna().to_numpy()
+    values = series.where(~mask, 0).astype("float64").tolist()
+    return _with_nulls(values, mask)
+
+
+def int_column(frame: pd.DataFrame, name: str) -> list[int | None]:
+    """Convert a column to ints (truncating floats), None for NaN."""
+    if name not in frame.columns:
+        return _missing(frame)
+    series = frame[name]
+    mask = series.isna().to_numpy()
+    filled = series.where(~mask, 0)
+    if filled.dtype == object:
+        filled = pd.to_numeric(filled)
+    values = filled.astype("int64").tolist()
+    return _with_nulls(values, mask)
+
+
+def bool_column(frame: pd.DataFrame, name: str) -> list[bool | None]:
+    """Convert a column to bools, None for NaN."""
+    if name not in frame.columns:
+        return _missing(frame)
+    series = frame[name]
+    mask = series.isna().to_numpy()
+    values = series.where(~mask, False).astype(bool).tolist()
+    return _with_nulls(values, mask)
+
+
+def str_column(frame: pd.DataFrame, name: str) -> list[str | None]:
+    """Convert a column to strings, None for NaN."""
+    if name not in frame.columns:
+        return _missing(frame)
+    series = frame[name]
+    mask = series.isna().to_numpy()
+    values = series.astype(str).tolist()
+    return _with_nulls(values, mask)
+
+
+def notna_column(frame: pd.DataFrame, name: str) -> list[bool]:
+    """True where a column holds a value (e.g. a PitInTime was recorded)."""
+    if name not in frame.columns:
+        return [False] * len(frame)
+    return frame[name].notna().tolist()
+
+
+def text_column(frame: pd.DataFrame, name: str, default: str = "") -> list[str]:
+    """Stringify every value, including NaN, the way str(row.get(name, default)) does."""
+    if name not in frame.columns:
+        return [default] * len(frame)
+    return frame[name].astype(str).tolist()
+
+
+def to_records(columns: dict[str, list]) -> list[dict]:
+    """Zip equal-length columns into a list of dicts, preserving key order."""
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+# ---------------------------------------------------------------------------
+# Table serializers — one per section of the telemetry JSON
+# ---------------------------------------------------------------------------
+
+
+def serialize_results(results: pd.DataFrame) -> list[dict]:
+    """Serialize session.results into TelemetryDriver records."""
+    if results is None or results.empty:
+        return []
+    team_color = results["TeamColor"] if "TeamColor" in results.columns else pd.Series(
+        np.nan, index=results.index, dtype=object
+    )
+    colors = ("#" + team_color.astype(str)).tolist()
+    return to_records({
+        "number": int_column(results, "DriverNumber"),
+        "abbreviation": text_column(results, "Abbreviation"),
+        "fullName": (results["FirstName"].astype(str) + " " + results["LastName"].astype(str)).tolist(),
+        "teamName": text_column(results, "TeamName"),
+        "teamColor": _with_nulls(colors, team_color.isna().to_numpy()),
+        "position": int_column(results, "Position"),
+        "classifiedPosition": str_column(results, "ClassifiedPosition"),
+        "gridPosition": int_column(results, "GridPosition"),
+        "status": text_column(results, "Status"),
+        "points": float_column(results, "Points"),
+        "time": seconds_column(results, "Time"),
+        "q1": seconds_column(results, "Q1"),
+        "q2": seconds_column(results, "Q2"),
+        "q3": seconds_column(results, "Q3"),
+    })
+
+
+def serialize_laps(laps: pd.DataFrame) -> list[dict]:
+    """Serialize session.laps into TelemetryLap records."""
+    if laps is None or laps.empty:
+        return []
+    return to_records({
+        "driverNumber": int_column(laps, "DriverNumber"),
+        "lapNumber": int_column(laps, "LapNumber"),
+        "lapTime": seconds_column(laps, "LapTime"),
+        "sector1": seconds_column(laps, "Sector1Time"),
+        "sector2": seconds_column(laps, "Sector2Time"),
+        "sector3": seconds_column(laps, "Sector3Time"),
+        "speedI1": float_column(laps, "SpeedI1"),
+        "speedI2": float_column(laps, "SpeedI2"),
+        "speedFL": float_column(laps, "SpeedFL"),
+        "speedST": float_column(laps, "SpeedST"),
+        "compound": str_column(laps, "Compound"),
+        "tyreLife": int_column(laps, "TyreLife"),
+        "freshTyre": bool_column(laps, "FreshTyre"),
+        "stint": int_column(laps, "Stint"),
+        "position": int_column(laps, "Position"),
+        "trackStatus": str_column(laps, "TrackStatus"),
+        "isPersonalBest": bool_column(laps, "IsPersonalBest"),
+        "isAccurate": bool_column(laps, "IsAccurate"),
+        "deleted": bool_column(laps, "Deleted"),
+        "deletedReason": str_column(laps, "DeletedReason"),
+        "isPitOutLap": notna_column(laps, "PitOutTime"),
+        "isPitInLap": notna_column(laps, "PitInTime"),
+    })
+
+
+def serialize_weather(weather: pd.DataFrame) -> list[dict]:
+    """Serialize session.weather_data into TelemetryWeatherEntry records."""
+    if weather is None or weather.empty:
+        return []
+    return to_records({
+        "airTemp": float_column(weather, "AirTemp"),
+        "trackTemp": float_column(weather, "TrackTemp"),
+        "humidity": float_column(weather, "Humidity"),
+        "pressure": float_column(weather, "Pressure"),
+        "rainfall": bool_column(weather, "Rainfall"),
+        "windDirection": int_column(weather, "WindDirection"),
+        "windSpeed": float_column(weather, "WindSpeed"),
+    })
+
+
+def serialize_race_control(messages: pd.DataFrame) -> list[dict]:
+    """Serialize session.race_control_messages into TelemetryRaceControlMessage records."""
+    if messages is None or messages.empty:
+        return []
+    return to_records({
+        "lapNumber": int_column(messages, "Lap"),
+        "category": str_column(messages, "Category"),
+        "flag": str_column(messages, "Flag"),
+        "scope": str_column(messages, "Scope"),
+        "sector": int_column(messages, "Sector"),
+        "driverNumber": str_column(messages, "RacingNumber"),
+        "message": text_column(messages, "Message"),
+    })
+
+
+def serialize_stints(laps: pd.DataFrame) -> list[dict]:
+    """Aggregate laps into TelemetryStint records for every driver at once.
+
+    Drivers appear in order of first appearance in laps, stints ascending;
+    compound and fresh-tyre flag come from the first lap of each stint.
+    """
+    if laps is None or laps.empty:
+        return []
+    codes, drivers = pd.factorize(laps["DriverNumber"])
+    frame = pd.DataFrame({
+        "driver": codes,
+        "stint": laps["Stint"].to_numpy(),
+        "lap": laps["LapNumber"].to_numpy(),
+        "compound": laps["Compound"].to_numpy(),
+        "fresh": laps["FreshTyre"].to_numpy() if "FreshTyre" in laps.columns else None,
+    })
+    frame = frame.dropna(subset=["stint"]).sort_values(["driver", "stint", "lap"], kind="stable")
+    if frame.empty:
+        return []
+
+    first = frame.drop_duplicates(["driver", "stint"], keep="first")
+    lap_range = frame.groupby(["driver", "stint"], sort=True)["lap"].agg(["min", "max"])
+    compound = first["compound"]
+    return to_records({
+        "driverNumber": pd.Series(drivers[first["driver"].to_numpy()]).astype("int64").tolist(),
+        "stintNumber": first["stint"].astype("int64").tolist(),
+        "compound": compound.where(compound.notna(), "UNKNOWN").astype(str).tolist(),
+        "freshTyre": bool_column(first, "fresh"),
+        "lapStart": lap_range["min"].astype("int64").tolist(),
+        "lapEnd": lap_range["max"].astype("int64").tolist(),
+    })
@@ -0,0 +1,114 @@
+"""
+Error-bounded decimation of telemetry traces.
+
+A multi-channel Ramer–Douglas–Peucker variant: every channel is linearly
+interpolated against distance between kept samples, and a segment is split
+at its worst point until each channel is within its tolerance. All channels
+share one set of kept indices, so distance/speed/throttle/brake/gear/x/y/z
+stay aligned. Step channels (brake, gear, DRS) keep both sides of every
+change so braking points and gear shifts are exact.
+
+Each refinement pass splits every out-of-tolerance segment at once, so the
+work is a handful of whole-array NumPy passes rather than a Python recursion.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Allowed absolute error per continuous channel, in FastF1 units
+# (km/h, %, rpm, and 1/10 m for X/Y/Z)
+DEFAULT_TOLERANCES: dict[str, float] = {
+    "Speed": 2.0,
+    "Throttle": 3.0,
+    "RPM": 200.0,
+    "X": 10.0,
+    "Y": 10.0,
+    "Z": 5.0,
+}
+
+STEP_CHANNELS = ("Brake", "nGear", "DRS")
+
+
+def _interpolation_error(
+    param: np.ndarray, values: np.ndarray, kept: np.ndarray, seg: np.ndarray
+) -> np.ndarray:
+    """Absolute error of each sample vs. linear interpolation between kept neighbours."""
+    left, right = kept[seg], kept[seg + 1]
+    span = param[right] - param[left]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(span > 0, (param - param[left]) / span, 0.0)
+    approx = values[left] + t * (values[right] - values[left])
+    return np.nan_to_num(np.abs(values - approx), nan=0.0)
+
+
+def simplify_indices(
+    param: np.ndarray,
+    channels: dict[str, np.ndarray],
+    tolerances: dict[str, float],
+    steps: list[np.ndarray] | None = None,
+) -> np.ndarray:
+    """Return sorted indices to keep so every channel stays within tolerance."""
+    n = len(param)
+    if n <= 2:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    for step in steps or []:
+        change = np.flatnonzero(step[1:] != step[:-1])
+        keep[change] = True
+        keep[change + 1] = True
+
+    idx = np.arange(n)
+    scaled = [(channels[name], tolerances[name]) for name in channels if name in tolerances]
+    while True:
+        kept = np.flatnonzero(keep)
+        seg = np.clip(np.searchsorted(kept, idx, side="right") - 1, 0, len(kept) - 2)
+        err = np.zeros(n)
+        for values, tol in scaled:
+            np.fmax(err, _interpolation_error(param, values, kept, seg) / tol, out=err)
+        err[keep] = 0.0
+
+        over = np.flatnonzero(err > 1.0)
+        if len(over) == 0:
+            return kept
+        # Worst offender per segment: sort by (segment, -error), take first of each run
+        order = np.lexsort((-err[over], seg[over]))
+        over = over[order]
+        first = np.r_[True, seg[over][1:] != seg[over][:-1]]
+        keep[over[first]] = True
+
+
+def decimate_telemetry(
+    tel: pd.DataFrame, tolerances: dict[str, float] | None = None
+) -> tuple[pd.DataFrame, dict]:
+    """Simplify a get_telemetry() frame; returns (rows kept, stats).
+
+    stats = {"source": rows in, "points": rows out,
+             "maxError": {channel: max absolute error}}
+    """
+    tolerances = tolerances or DEFAULT_TOLERANCES
+    param = tel["Distance"].to_numpy(dtype="float64")
+    channels = {
+        name: tel[name].to_numpy(dtype="float64")
+        for name in tolerances
+        if name in tel.columns
+    }
+    steps = []
+    for name in STEP_CHANNELS:
+        if name in tel.columns:
+            values = tel[name].to_numpy()
+            steps.append(values >= 10 if name == "DRS" else values)
+
+    kept = simplify_indices(param, channels, tolerances, steps)
+
+    seg = np.clip(np.searchsorted(kept, np.arange(len(param)), side="right") - 1, 0, max(len(kept) - 2, 0))
+    max_error = {}
+    if len(kept) >= 2:
+        for name, values in channels.items():
+            max_error[name] = round(float(_interpolation_error(param, values, kept, seg).max()), 2)
+
+    stats = {"source": len(tel), "points": len(kept), "maxError": max_error}
+    return tel.iloc[kept], stats
@@ -0,0 +1,78 @@
+"""
+Driver-vs-driver time deltas on a shared distance grid.
+
+Fastest-lap traces are sampled at different distances for every driver
+(decimation keeps different points, fixed sampling starts at different
+offsets), so index-aligned comparisons drift. Here each trace is turned
+into elapsed time against distance (trapezoidal, from speed), and every
+driver is resampled onto one set of mini-sector edges shared by all of them.
+All-pairs tables are then a single broadcast over drivers x drivers x bins:
+
+    cumulativeDelta[i][j][m] = time_j - time_i at the end of bin m
+                               (positive: driver i is ahead; milliseconds)
+    dominance[i][j][m]       = 1 if i was faster than j through bin m,
+                               -1 if slower, 0 if level to the millisecond
+
+so comparing any two drivers in the web app is a lookup.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+MINI_SECTORS = 50
+MIN_SPEED = 1.0  # km/h; keeps a stationary sample from producing an infinite segment time
+
+
+def elapsed_time(distance, speed) -> tuple[np.ndarray, np.ndarray]:
+    """(distance, seconds since distance 0) for one trace.
+
+    Each segment takes its length over the mean of its end speeds; samples
+    that step backwards in distance add no time. A trace whose first sample
+    is past the line is extended back to 0 at that sample's speed.
+    """
+    distance = np.asarray(distance, dtype=float)
+    speed = np.fmax(np.nan_to_num(np.asarray(speed, dtype=float)), MIN_SPEED) / 3.6
+    if distance[0] > 0:
+        distance, speed = np.r_[0.0, distance], np.r_[speed[0], speed]
+    distance = np.maximum.accumulate(distance)
+    segment = np.diff(distance) / ((speed[1:] + speed[:-1]) / 2)
+    return distance, np.concatenate([[0.0], np.cumsum(segment)])
+
+
+def bin_edges(traces: list[dict], bins: int = MINI_SECTORS) -> np.ndarray:
+    """Mini-sector edges from 0 to the shortest lap distance every driver covers."""
+    end = min(float(np.max(t["distance"])) for t in traces)
+    return np.linspace(0.0, end, bins + 1)
+
+
+def resample_times(traces: list[dict], edges: np.ndarray) -> np.ndarray:
+    """Elapsed time (s) of each driver at each edge: shape (drivers, edges)."""
+    times = np.empty((len(traces), len(edges)))
+    for row, trace in enumerate(traces):
+        distance, elapsed = elapsed_time(trace["distance"], trace["speed"])
+        times[row] = np.interp(edges, distance, elapsed)
+    return times
+
+
+def delta_tables(times: np.ndarray) -> dict[str, np.ndarray]:
+    """All-pairs tables from per-driver times at the bin edges (see module docstring)."""
+    at_edge = np.rint(times * 1000).astype(np.int64)
+    bin_time = np.diff(at_edge, axis=1)
+    cumulative = at_edge[None, :, 1:] - at_edge[:, None, 1:]
+    dominance = np.sign(bin_time[None, :, :] - bin_time[:, None, :])
+    return {"binTime": bin_time, "cumulativeDelta": cumulative, "dominance": dominance}
+
+
+def compute_driver_deltas(traces: list[dict], bins: int = MINI_SECTORS) -> dict | None:
+    """The driverDeltas section for telemetryData entries (None if fewer than two drivers)."""
+    usable = [t for t in traces if len(t.get("distance") or []) >= 2 and len(t.get("speed") or []) >= 2]
+    if len(usable) < 2:
+        return None
+    edges = bin_edges(usable, bins)
+    tables = delta_tables(resample_times(usable, edges))
+    return {
+        "drivers": [t["driverNumber"] for t in usable],
+        "binEdges": np.round(edges, 1).tolist(),
+        **{name: table.tolist() for name, table in tables.items()},
+    }
@@ -0,0 +1,150 @@
+"""
+DRS zone detection from telemetryData entries, vectorized across all drivers.
+
+Every entry (one driver's lap, or many laps of one driver on full-race
+traces) is flattened into one array. Activation runs are found from edges
+of the DRS mask, runs from all drivers are clustered into zones by a gap
+test on sorted start distances, and zone endpoints are mapped to X/Y on a
+reference trace with a binary search instead of a scan per endpoint.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _flatten(telemetry_entries: list[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list]:
+    """Concatenate distance/DRS of every entry.
+
+    Returns (distance, active, entry-start mask, driver code per sample,
+    driver numbers in order of first appearance).
+    """
+    distances, masks, starts, codes = [], [], [], []
+    drivers: dict[int, int] = {}
+    for entry in telemetry_entries:
+        drs = entry.get("drs") or []
+        dist = entry.get("distance") or []
+        n = min(len(drs), len(dist))
+        if n == 0:
+            continue
+        code = drivers.setdefault(entry.get("driverNumber"), len(drivers))
+        distances.append(np.asarray(dist[:n], dtype=float))
+        masks.append(np.asarray(drs[:n], dtype=bool))
+        start = np.zeros(n, dtype=bool)
+        start[0] = True
+        starts.append(start)
+        codes.append(np.full(n, code))
+    if not distances:
+        empty = np.array([])
+        return empty, empty.astype(bool), empty.astype(bool), empty.astype(int), []
+    return (
+        np.concatenate(distances),
+        np.concatenate(masks),
+        np.concatenate(starts),
+        np.concatenate(codes),
+        list(drivers),
+    )
+
+
+def activation_runs(
+    distance: np.ndarray, active: np.ndarray, entry_start: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of the first and last sample of each contiguous DRS-open run.
+
+    Runs never span two entries: an entry's first sample always counts as a
+    rising edge if DRS is open there.
+    """
+    prev = np.empty_like(active)
+    prev[0] = False
+    prev[1:] = active[:-1]
+    prev[entry_start] = False
+    nxt = np.empty_like(active)
+    nxt[-1] = False
+    nxt[:-1] = active[1:] & ~entry_start[1:]
+    rising = np.flatnonzero(active & ~prev)
+    falling = np.flatnonzero(active & ~nxt)
+    return rising, falling
+
+
+def cluster_runs(starts: np.ndarray, ends: np.ndarray, distance_gap: float) -> np.ndarray:
+    """Zone id per run, for runs sorted by start distance.
+
+    A run opens a new zone when it starts more than distance_gap after the
+    furthest end of every run before it.
+    """
+    if len(starts) == 0:
+        return np.array([], dtype=int)
+    reach = np.maximum.accumulate(ends)
+    new_zone = np.empty(len(starts), dtype=bool)
+    new_zone[0] = False
+    new_zone[1:] = starts[1:] - reach[:-1] > distance_gap
+    return np.cumsum(new_zone)
+
+
+def nearest_indices(sorted_values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Index of the closest value in a non-decreasing array (the lower one on ties)."""
+    right = np.clip(np.searchsorted(sorted_values, targets), 0, len(sorted_values) - 1)
+    left = np.clip(right - 1, 0, len(sorted_values) - 1)
+    use_right = np.abs(sorted_values[right] - targets) < np.abs(targets - sorted_values[left])
+    return np.where(use_right, right, left)
+
+
+def extract_drs_zones(telemetry_entries: list[dict], distance_gap: float = 200.0) -> list[dict]:
+    """Extract DRS activation zones from every driver's telemetry.
+
+    Returns zone start/end distances with X/Y coordinates from the first
+    entry, plus per-driver usage: how many times each driver opened DRS in
+    the zone and over how many metres in total.
+    """
+    distance, active, entry_start, driver_codes, driver_numbers = _flatten(telemetry_entries)
+    if not active.any():
+        return []
+
+    rising, falling = activation_runs(distance, active, entry_start)
+    order = np.argsort(distance[rising], kind="stable")
+    rising, falling = rising[order], falling[order]
+    run_start, run_end = distance[rising], distance[falling]
+    zone_of_run = cluster_runs(run_start, run_end, distance_gap)
+
+    n_zones = int(zone_of_run[-1]) + 1
+    first_run = np.flatnonzero(np.r_[True, np.diff(zone_of_run) > 0])
+    zone_start = run_start[first_run]
+    zone_end = np.maximum.reduceat(run_end, first_run)
+
+    # Usage per (zone, driver) in one bincount
+    n_drivers = len(driver_numbers)
+    key = zone_of_run * n_drivers + driver_codes[rising]
+    activations = np.bincount(key, minlength=n_zones * n_drivers).reshape(n_zones, n_drivers)
+    open_distance = np.bincount(key, weights=run_end - run_start, minlength=n_zones * n_drivers)
+    open_distance = open_distance.reshape(n_zones, n_drivers)
+
+    ref = telemetry_entries[0] if telemetry_entries else None
+    coords = None
+    if ref and ref.get("distance") and ref.get("x") and ref.get("y"):
+        ref_dist = np.asarray(ref["distance"], dtype=float)
+        si = nearest_indices(ref_dist, zone_start)
+        ei = nearest_indices(ref_dist, zone_end)
+        ref_x, ref_y = np.asarray(ref["x"], dtype=float), np.asarray(ref["y"], dtype=float)
+        coords = (ref_x[si], ref_y[si], ref_x[ei], ref_y[ei])
+
+    zones = []
+    for z in range(n_zones):
+        zone = {"startDistance": round(float(zone_start[z]), 1), "endDistance": round(float(zone_end[z]), 1)}
+        if coords is not None:
+            zone.update({
+                "startX": round(float(coords[0][z]), 1),
+                "startY": round(float(coords[1][z]), 1),
+                "endX": round(float(coords[2][z]), 1),
+                "endY": round(float(coords[3][z]), 1),
+            })
+        used = np.flatnonzero(activations[z])
+        zone["usage"] = [
+            {
+                "driverNumber": driver_numbers[d],
+                "activations": int(activations[z, d]),
+                "distance": round(float(open_distance[z, d]), 1),
+            }
+            for d in used
+        ]
+        zones.append(zone)
+    return zones
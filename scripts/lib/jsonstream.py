@@ -0,0 +1,141 @@
+"""
+Streaming writer for the session JSON, one top-level section at a time.
+
+Sections are encoded and written as soon as they are produced, so the
+pipeline never holds the whole document (or its full serialized string) in
+memory; large lists are encoded a batch of items at a time. The bytes are
+teed into optional gzip and brotli compressors, producing ``.json.gz`` and
+``.json.br`` siblings in the same pass. Everything is written to temporary
+files that replace the targets only when the document is complete.
+
+The result is byte-identical to ``json.dumps(document, indent=indent)`` (or
+compact separators when indent is None) for the same key order.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIONS = ("gz", "br")
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9  # 11 is ~5x slower on multi-megabyte documents for ~3% smaller output
+LIST_BATCH = 256
+
+
+class _BrotliFile:
+    """File-like wrapper around a streaming brotli compressor."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "wb")
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def write(self, data: bytes) -> None:
+        self._file.write(self._compressor.process(data))
+
+    def close(self) -> None:
+        self._file.write(self._compressor.finish())
+        self._file.close()
+
+
+class JsonSectionWriter:
+    """Writes a JSON object key by key to path (and compressed siblings)."""
+
+    def __init__(self, path: Path, indent: int | None = None, compress: tuple[str, ...] = ()):
+        unknown = set(compress) - set(COMPRESSIONS)
+        if unknown:
+            raise ValueError(f"Unknown compression: {', '.join(sorted(unknown))}")
+        if "br" in compress and brotli is None:
+            raise RuntimeError("Brotli output needs the 'brotli' package (pip install brotli)")
+
+        self.path = Path(path)
+        self.indent = indent
+        self.section_bytes: dict[str, int] = {}
+        self.sizes: dict[Path, int] = {}
+        self._separators = (",", ": ") if indent is not None else (",", ":")
+        self._targets = [self.path] + [self.path.with_name(f"{self.path.name}.{ext}") for ext in compress]
+        self._temps = [p.with_name(f".{p.name}.part") for p in self._targets]
+        self._sinks = [open(self._temps[0], "wb")]
+        for ext, temp in zip(compress, self._temps[1:]):
+            if ext == "gz":
+                # mtime=0 keeps the output reproducible for unchanged content
+                self._sinks.append(gzip.GzipFile(temp, "wb", compresslevel=GZIP_LEVEL, mtime=0))
+            else:
+                self._sinks.append(_BrotliFile(temp))
+        self._count = 0
+        self._closed = False
+        self._write("{")
+
+    def _write(self, text: str) -> int:
+        data = text.encode()
+        for sink in self._sinks:
+            sink.write(data)
+        return len(data)
+
+    def _dumps(self, value, level: int) -> str:
+        text = json.dumps(value, indent=self.indent, separators=self._separators)
+        if self.indent and level:
+            text = text.replace("\n", "\n" + " " * (self.indent * level))
+        return text
+
+    def _newline(self, level: int) -> str:
+        return "\n" + " " * (self.indent * level) if self.indent is not None else ""
+
+    def section(self, key: str, value) -> None:
+        """Append one top-level key; large lists are encoded in batches."""
+        written = self._write(("," if self._count else "") + self._newline(1))
+        written += self._write(json.dumps(key) + self._separators[1])
+        if isinstance(value, list) and len(value) > LIST_BATCH:
+            item_sep = "," + self._newline(2)
+            written += self._write("[" + self._newline(2))
+            for start in range(0, len(value), LIST_BATCH):
+                batch = value[start:start + LIST_BATCH]
+                text = item_sep.join(self._dumps(item, 2) for item in batch)
+                written += self._write((item_sep if start else "") + text)
+            written += self._write(self._newline(1) + "]")
+        else:
+            written += self._write(self._dumps(value, 1))
+        self.section_bytes[key] = written
+        self._count += 1
+
+    def close(self) -> dict[Path, int]:
+        """Finish the document and move every file into place; returns sizes by path."""
+        if self._closed:
+            return self.sizes
+        self._write(self._newline(0) + "}" if self._count else "}")
+        for sink in self._sinks:
+            sink.close()
+        for temp, target in zip(self._temps, self._targets):
+            os.replace(temp, target)
+            self.sizes[target] = target.stat().st_size
+        self._closed = True
+        return self.sizes
+
+    def abort(self) -> None:
+        """Discard everything written so far, leaving existing outputs untouched."""
+        if self._closed:
+            return
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+        for temp in self._temps:
+            temp.unlink(missing_ok=True)
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
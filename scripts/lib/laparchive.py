@@ -0,0 +1,185 @@
+"""
+All-laps telemetry archive: every lap of every driver, memory-mappable.
+
+File layout (``{session}.laps.bin``, all integers little-endian):
+
+    offset  size  field
+    0       4     magic b"F1LA"
+    4       2     format version (uint16, currently 1)
+    6       2     reserved (0)
+    8       8     index offset I (uint64)
+    16      8     index length L in bytes (uint64)
+    24      ...   data section; every array starts on an 8-byte boundary
+    I       L     UTF-8 JSON index
+
+The data section holds, for each driver in turn, one contiguous array per
+channel with all of that driver's laps back to back. The index is written
+last, once every offset is known, so drivers can be streamed to disk one at
+a time::
+
+    {
+      "version": 1,
+      "rotation": 92.0,
+      "channels": {"distance": "<f4", "speed": "<f4", ..., "gear": "|i1"},
+      "drivers": [
+        {
+          "driverNumber": 1, "count": 43210,
+          "offsets": {"distance": 24, "speed": 172864, ...},
+          "laps": [[1, 0, 742], [2, 742, 751], ...]
+        }
+      ]
+    }
+
+``offsets`` are absolute file offsets, and each ``laps`` row is
+``[lapNumber, first sample, sample count]`` within the driver's arrays, so
+one lap of one channel is ``array[start:start + count]``. Samples are stored
+at full resolution, undecimated. Floats use NaN for missing values and gear
+uses -1. X/Y are the raw FastF1 coordinates: ``rotation`` is the circuit
+angle the web app applies.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"F1LA"
+VERSION = 1
+_PREAMBLE = struct.Struct("<4sHHQQ")
+
+# channel -> (telemetry column, on-disk dtype)
+CHANNELS: dict[str, tuple[str, str]] = {
+    "distance": ("Distance", "<f4"),
+    "speed": ("Speed", "<f4"),
+    "throttle": ("Throttle", "<f4"),
+    "brake": ("Brake", "|u1"),
+    "drs": ("DRS", "|u1"),
+    "rpm": ("RPM", "<f4"),
+    "gear": ("nGear", "|i1"),
+    "x": ("X", "<f4"),
+    "y": ("Y", "<f4"),
+    "z": ("Z", "<f4"),
+}
+
+
+def _column(tel: pd.DataFrame, column: str, dtype: str) -> np.ndarray:
+    """One telemetry column as the on-disk dtype (NaN, or -1 for integers, when missing)."""
+    kind = np.dtype(dtype).kind
+    fill = np.nan if kind == "f" else -1 if kind == "i" else 0
+    if column not in tel.columns:
+        return np.full(len(tel), fill, dtype=dtype)
+    values = pd.to_numeric(tel[column], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    if kind != "f":
+        values = np.nan_to_num(values, nan=fill)
+    return values.astype(dtype)
+
+
+class LapArchiveWriter:
+    """Streams drivers to an archive file; call add_driver() per driver, then close()."""
+
+    def __init__(self, path: Path, rotation: float = 0.0):
+        self.path = Path(path)
+        self.rotation = rotation
+        self.drivers: list[dict] = []
+        self._file = open(self.path, "wb")
+        self._file.write(b"\0" * _PREAMBLE.size)
+
+    def _align(self) -> int:
+        offset = self._file.tell()
+        pad = -offset % 8
+        if pad:
+            self._file.write(b"\0" * pad)
+        return offset + pad
+
+    def add_driver(self, driver_number: int, laps: list[tuple[int, pd.DataFrame]]) -> int:
+        """Write one driver's (lap number, telemetry frame) pairs; returns the sample count."""
+        laps = [(lap_number, tel) for lap_number, tel in laps if tel is not None and len(tel)]
+        table, start = [], 0
+        for lap_number, tel in laps:
+            table.append([int(lap_number), start, len(tel)])
+            start += len(tel)
+
+        offsets = {}
+        for name, (column, dtype) in CHANNELS.items():
+            offsets[name] = self._align()
+            for _, tel in laps:
+                self._file.write(_column(tel, column, dtype).tobytes())
+        self.drivers.append({"driverNumber": int(driver_number), "count": start, "offsets": offsets, "laps": table})
+        return start
+
+    def close(self) -> int:
+        """Write the index and preamble; returns the file size in bytes."""
+        if self._file.closed:
+            return self.path.stat().st_size
+        index = {
+            "version": VERSION,
+            "rotation": self.rotation,
+            "channels": {name: dtype for name, (_, dtype) in CHANNELS.items()},
+            "drivers": self.drivers,
+        }
+        index_bytes = json.dumps(index, separators=(",", ":")).encode()
+        index_offset = self._align()
+        self._file.write(index_bytes)
+        size = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_PREAMBLE.pack(MAGIC, VERSION, 0, index_offset, len(index_bytes)))
+        self._file.close()
+        return size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't leave a file without an index behind
+            self._file.close()
+            self.path.unlink(missing_ok=True)
+
+
+class LapArchive:
+    """Read-only view of an archive file; channel arrays are memory-mapped slices."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data = np.memmap(self.path, dtype="u1", mode="r")
+        magic, version, _, index_offset, index_len = _PREAMBLE.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a lap archive file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported lap archive version {version}")
+        self.index = json.loads(bytes(self._data[index_offset:index_offset + index_len]))
+        self.rotation = self.index["rotation"]
+        self._drivers = {d["driverNumber"]: d for d in self.index["drivers"]}
+        self._laps = {
+            d["driverNumber"]: {lap: (start, count) for lap, start, count in d["laps"]}
+            for d in self.index["drivers"]
+        }
+
+    @property
+    def drivers(self) -> list[int]:
+        return list(self._drivers)
+
+    def laps(self, driver_number: int) -> list[int]:
+        """Lap numbers stored for a driver, in file order."""
+        return list(self._laps[driver_number])
+
+    def channel(self, driver_number: int, name: str) -> np.ndarray:
+        """All of one driver's samples for a channel (every lap, back to back)."""
+        meta = self._drivers[driver_number]
+        dtype = np.dtype(self.index["channels"][name])
+        offset = meta["offsets"][name]
+        return self._data[offset:offset + meta["count"] * dtype.itemsize].view(dtype)
+
+    def lap(self, driver_number: int, lap_number: int) -> dict[str, np.ndarray]:
+        """Every channel of one lap, as views into the mapped file."""
+        start, count = self._laps[driver_number][lap_number]
+        return {
+            name: self.channel(driver_number, name)[start:start + count]
+            for name in self.index["channels"]
+        }
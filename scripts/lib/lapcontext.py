@@ -0,0 +1,201 @@
+"""
+Per-lap session context from sorted-time joins.
+
+Weather samples, track status changes and race control messages are each
+time series; laps are time windows [LapStartTime, Time]. Instead of a
+lookup per lap row, every join here is one sorted pass over the whole
+table (pd.merge_asof or np.searchsorted), so any question of the form "what
+was the weather / flag state on lap N" becomes an index lookup:
+
+- weather: the last weatherData sample at or before the lap start
+- trackState: the most severe track status in force at any point of the lap
+- messageStart/messageCount: the slice of raceControlMessages issued during
+  the lap (messages are in time order, as FastF1 returns them)
+
+All times are seconds of session time.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# FastF1 track status codes, least to most severe
+TRACK_STATES: dict[str, str] = {
+    "1": "GREEN",
+    "2": "YELLOW",
+    "7": "VSC_ENDING",
+    "6": "VSC",
+    "4": "SC",
+    "5": "RED",
+}
+_SEVERITY = {code: rank for rank, code in enumerate(TRACK_STATES)}
+_STATE_NAMES = np.array(list(TRACK_STATES.values()), dtype=object)
+
+
+def _seconds(values) -> np.ndarray:
+    """Timedelta-like values as float seconds (NaN where missing)."""
+    series = pd.Series(pd.to_timedelta(values))
+    return (series.dt.total_seconds()).to_numpy(dtype="float64")
+
+
+def lap_windows(laps: pd.DataFrame) -> pd.DataFrame:
+    """Start/end session time of each lap row, in lapData order."""
+    end = _seconds(laps["Time"]) if "Time" in laps.columns else np.full(len(laps), np.nan)
+    if "LapStartTime" in laps.columns:
+        start = _seconds(laps["LapStartTime"])
+    else:
+        start = end - _seconds(laps["LapTime"])
+    return pd.DataFrame({
+        "row": np.arange(len(laps)),
+        "lap": pd.to_numeric(laps["LapNumber"], errors="coerce").to_numpy(),
+        "start": start,
+        "end": end,
+    })
+
+
+def weather_at(starts: np.ndarray, weather: pd.DataFrame | None) -> np.ndarray:
+    """Position of the latest weather sample at or before each start (-1 if none)."""
+    result = np.full(len(starts), -1, dtype=np.int64)
+    if weather is None or weather.empty or "Time" not in weather.columns:
+        return result
+    samples = pd.DataFrame({"time": _seconds(weather["Time"]), "sample": np.arange(len(weather))})
+    samples = samples.dropna(subset=["time"]).sort_values("time", kind="stable")
+    probes = pd.DataFrame({"time": starts, "probe": np.arange(len(starts))})
+    valid = probes.dropna(subset=["time"]).sort_values("time", kind="stable")
+    if samples.empty or valid.empty:
+        return result
+    joined = pd.merge_asof(valid, samples, on="time", direction="backward")
+    found = joined["sample"].notna().to_numpy()
+    result[joined["probe"].to_numpy()[found]] = joined["sample"].to_numpy()[found].astype(np.int64)
+    return result
+
+
+def _severity_of_codes(codes) -> np.ndarray:
+    return np.array([_SEVERITY.get(str(c), -1) for c in codes], dtype=np.int64)
+
+
+def track_severity(windows: pd.DataFrame, status: pd.DataFrame | None, lap_codes=None) -> np.ndarray:
+    """Rank (in TRACK_STATES order) of the most severe track state during each window; -1 if unknown.
+
+    Uses the session's track status series when present (the status in
+    force at the start, plus every change before the end); otherwise falls
+    back to the per-lap TrackStatus code strings.
+    """
+    n = len(windows)
+    severity = np.full(n, -1, dtype=np.int64)
+    if status is not None and not status.empty and "Time" in status.columns:
+        times = _seconds(status["Time"])
+        order = np.argsort(times, kind="stable")
+        times, codes = times[order], _severity_of_codes(status["Status"].to_numpy()[order])
+        start, end = windows["start"].to_numpy(), windows["end"].to_numpy()
+        ok = ~(np.isnan(start) | np.isnan(end))
+        first = np.clip(np.searchsorted(times, np.where(ok, start, 0), side="right") - 1, 0, None)
+        stop = np.searchsorted(times, np.where(ok, end, 0), side="left")
+        ok &= stop > first
+        if ok.any():
+            # Max over every [first, stop) slice in one reduceat; the odd slices
+            # (between windows) are discarded, and the sentinel keeps stop in range.
+            bounds = np.column_stack([first[ok], stop[ok]]).ravel()
+            severity[ok] = np.maximum.reduceat(np.r_[codes, -1], bounds)[::2]
+    elif lap_codes is not None:
+        text = pd.Series(lap_codes, dtype=object).fillna("").astype(str)
+        for code, rank in _SEVERITY.items():
+            found = text.str.contains(code, regex=False).to_numpy()
+            severity = np.where(found, np.maximum(severity, rank), severity)
+    return severity
+
+
+def state_names(severity: np.ndarray) -> list[str | None]:
+    return [None if s < 0 else _STATE_NAMES[s] for s in severity]
+
+
+def message_ranges(windows: pd.DataFrame, message_times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(first index, count) of the time-ordered messages issued in each window.
+
+    A message without a time takes its predecessor's, so indices still
+    line up with the message list.
+    """
+    times = pd.Series(message_times, dtype="float64").ffill().fillna(-np.inf).to_numpy()
+    start, end = windows["start"].to_numpy(), windows["end"].to_numpy()
+    ok = ~(np.isnan(start) | np.isnan(end))
+    first = np.searchsorted(times, np.where(ok, start, 0), side="left")
+    stop = np.searchsorted(times, np.where(ok, end, 0), side="left")
+    count = np.where(ok, np.maximum(stop - first, 0), 0)
+    return np.where(ok, first, 0), count
+
+
+def race_laps(windows: pd.DataFrame) -> pd.DataFrame:
+    """One window per lap number: first driver starting it to last driver finishing it."""
+    grouped = windows.dropna(subset=["lap"]).groupby("lap", sort=True).agg(start=("start", "min"), end=("end", "max"))
+    return grouped.reset_index()
+
+
+def _nullable(values: np.ndarray) -> list:
+    return [None if v < 0 else int(v) for v in values]
+
+
+def _rounded(values: np.ndarray) -> list:
+    return [None if np.isnan(v) else round(float(v), 3) for v in values]
+
+
+def build_lap_context(
+    laps: pd.DataFrame,
+    weather: pd.DataFrame | None = None,
+    track_status: pd.DataFrame | None = None,
+    messages: pd.DataFrame | None = None,
+    t0_date=None,
+) -> dict:
+    """The lapContext section: per-lap-row columns and a per-race-lap index table.
+
+    ``laps`` columns line up row for row with lapData; ``index`` has one
+    row per lap number. Race control message times are wall-clock, so they
+    are converted with the session's t0_date; without it, messages are
+    matched to lap numbers by their Lap column instead.
+    """
+    if laps is None or laps.empty:
+        return {}
+    windows = lap_windows(laps)
+    per_lap = race_laps(windows)
+
+    message_times = None
+    if messages is not None and not messages.empty and t0_date is not None and "Time" in messages.columns:
+        message_times = _seconds(pd.to_datetime(messages["Time"]) - pd.Timestamp(t0_date))
+
+    def columns(frame: pd.DataFrame, severity: np.ndarray) -> dict:
+        result = {
+            "weather": _nullable(weather_at(frame["start"].to_numpy(), weather)),
+            "trackState": state_names(severity),
+        }
+        if message_times is not None:
+            first, count = message_ranges(frame, message_times)
+        elif messages is not None and not messages.empty and "Lap" in messages.columns:
+            # Lap-number fallback: messages are sorted, so each lap's messages are contiguous
+            msg_laps = pd.to_numeric(messages["Lap"], errors="coerce").to_numpy(dtype="float64")
+            lap = frame["lap"].to_numpy(dtype="float64")
+            first = np.searchsorted(msg_laps, lap, side="left")
+            count = np.searchsorted(msg_laps, lap, side="right") - first
+        else:
+            first = count = np.zeros(len(frame), dtype=np.int64)
+        result["messageStart"] = np.asarray(first).tolist()
+        result["messageCount"] = np.asarray(count).tolist()
+        return result
+
+    lap_codes = laps["TrackStatus"].to_numpy() if "TrackStatus" in laps.columns else None
+    row_severity = track_severity(windows, track_status, lap_codes)
+    if track_status is not None and not track_status.empty:
+        lap_severity = track_severity(per_lap, track_status)
+    else:
+        # Without the status series, a lap number is as severe as any driver's lap
+        by_lap = pd.Series(row_severity).groupby(windows["lap"].to_numpy()).max()
+        lap_severity = by_lap.reindex(per_lap["lap"].to_numpy(), fill_value=-1).to_numpy()
+
+    return {
+        "laps": columns(windows, row_severity),
+        "index": {
+            "lapNumber": per_lap["lap"].astype("int64").tolist(),
+            "start": _rounded(per_lap["start"].to_numpy()),
+            "end": _rounded(per_lap["end"].to_numpy()),
+            **columns(per_lap, lap_severity),
+        },
+    }
@@ -0,0 +1,40 @@
+"""
+One-pass index of a session's laps by driver.
+
+Per-driver stages used to filter ``laps[laps["DriverNumber"] == n]`` for every
+driver, scanning the whole table each time. LapIndex groups row positions
+once so each lookup is a single ``iloc`` take. (Stints don't need an index:
+columnar.serialize_stints aggregates every driver's stints in one groupby.)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class LapIndex:
+    """Row positions of each driver's laps, in lap order."""
+
+    def __init__(self, laps: pd.DataFrame | None):
+        self.laps = laps
+        self._by_driver: dict[str, np.ndarray] = {}
+        if laps is None or laps.empty:
+            self.drivers: list = []
+            return
+
+        # Drivers in order of first appearance, as laps["DriverNumber"].unique()
+        self.drivers = list(laps["DriverNumber"].unique())
+
+        order = np.argsort(laps["LapNumber"].to_numpy(), kind="stable")
+        ordered = laps.iloc[order]
+        by_driver = ordered.groupby("DriverNumber", sort=False).indices
+        self._by_driver = {d: order[by_driver[d]] for d in self.drivers if d in by_driver}
+
+    def __len__(self) -> int:
+        return len(self.drivers)
+
+    def driver_laps(self, driver_number) -> pd.DataFrame:
+        """All laps for one driver, sorted by lap number."""
+        rows = self._by_driver.get(driver_number, np.array([], dtype=int))
+        return self.laps.iloc[rows]
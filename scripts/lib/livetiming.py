@@ -0,0 +1,214 @@
+"""
+Livetiming archive client with an on-disk HTTP cache.
+
+Every session in the archive (``{base}/static/{year}/{meeting}/{session}/``)
+publishes one ``{Topic}.jsonStream`` per feed (TeamRadio,
+RaceControlMessages, TrackStatus, ...). Each line is a session timestamp
+followed by a JSON patch:
+
+    00:01:02.345{"Captures":[{"Utc":"...","RacingNumber":"1","Path":"..."}]}
+
+Responses are kept under a cache directory that mirrors the URL path, with
+the validators next to them in ``{name}.meta.json``. A cached topic is
+revalidated with If-None-Match / If-Modified-Since, so a re-run costs a 304
+instead of the whole stream; if the archive can't be reached at all, the
+cached copy is used as is. On a 200 the body is parsed line by line as it
+arrives and written to a temp file alongside, which replaces the cached
+copy only once the stream has been read to the end.
+
+A session still in progress is polled with tail() instead, which asks only
+for the bytes past what the previous poll read.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.request
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from lib.radio import USER_AGENT
+
+BOM = b"\xef\xbb\xbf"
+
+
+def stream_seconds(timestamp: str) -> float | None:
+    """Session seconds of a "HH:MM:SS.fff" stream timestamp (None if malformed)."""
+    try:
+        hours, minutes, seconds = timestamp.split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+
+def parse_stream(lines: Iterable[bytes]) -> Iterator[tuple[float | None, dict]]:
+    """(session seconds, message) for each timestamp-prefixed JSON line.
+
+    Blank, unprefixed and unparseable lines are skipped, as the archive
+    occasionally ends a stream mid-line.
+    """
+    for number, line in enumerate(lines):
+        if number == 0:
+            line = line.removeprefix(BOM)
+        brace = line.find(b"{")
+        if brace < 0:
+            continue
+        try:
+            message = json.loads(line[brace:])
+        except ValueError:
+            continue
+        if isinstance(message, dict):
+            yield stream_seconds(line[:brace].decode("utf-8", "replace").strip()), message
+
+
+def iter_items(
+    messages: Iterable[tuple[float | None, dict]], field: str, key, seen: set | None = None
+) -> Iterator[dict]:
+    """Items of a patched collection (TeamRadio Captures, RaceControlMessages Messages), each once.
+
+    The first message carries a list; later ones patch in new items as a
+    dict keyed by list position, and the archive repeats some of them.
+    Items are deduplicated by key(item); pass `seen` to carry the keys
+    already handled over from an earlier call.
+    """
+    seen = set() if seen is None else seen
+    for _, message in messages:
+        items = message.get(field) or []
+        if isinstance(items, dict):
+            items = items.values()
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            identity = key(item)
+            if not identity or identity in seen:
+                continue
+            seen.add(identity)
+            yield item
+
+
+def iter_captures(messages: Iterable[tuple[float | None, dict]], seen: set | None = None) -> Iterator[dict]:
+    """Team radio captures from TeamRadio messages, each clip (audio path) once."""
+    return iter_items(messages, "Captures", lambda capture: capture.get("Path"), seen)
+
+
+class LivetimingClient:
+    """Fetch archive files through the on-disk cache.
+
+    ``last_status`` records how the latest request was served: "fetched",
+    "not-modified" (revalidated with a 304) or "stale" (archive unreachable,
+    cached copy used).
+    """
+
+    def __init__(self, base_url: str, cache_dir: Path, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.last_status: str | None = None
+
+    def cache_path(self, url_path: str) -> Path:
+        parts = [part for part in url_path.split("/") if part and part not in (".", "..")]
+        return self.cache_dir.joinpath(*parts)
+
+    @staticmethod
+    def _meta_path(path: Path) -> Path:
+        return path.with_name(path.name + ".meta.json")
+
+    def _validators(self, path: Path) -> dict[str, str]:
+        if not path.exists():
+            return {}
+        try:
+            meta = json.loads(self._meta_path(path).read_text())
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("lastModified"):
+            headers["If-Modified-Since"] = meta["lastModified"]
+        return headers
+
+    def _open(self, url_path: str):
+        """The live response, or None when the cached copy should be read instead."""
+        path = self.cache_path(url_path)
+        headers = {"User-Agent": USER_AGENT, **self._validators(path)}
+        request = urllib.request.Request(f"{self.base_url}{url_path}", headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and path.exists():
+                e.close()
+                self.last_status = "not-modified"
+                return None
+            raise
+        except OSError:
+            if not path.exists():
+                raise
+            self.last_status = "stale"
+            return None
+        self.last_status = "fetched"
+        return response
+
+    def lines(self, url_path: str) -> Iterator[bytes]:
+        """Lines of an archive file, streamed from the network or the cache."""
+        path = self.cache_path(url_path)
+        response = self._open(url_path)
+        if response is None:
+            with open(path, "rb") as f:
+                yield from f
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+        try:
+            with response, os.fdopen(fd, "wb") as tmp:
+                for line in response:
+                    tmp.write(line)
+                    yield line
+            os.replace(tmp_name, path)
+        finally:
+            # Reached on errors and when the caller stops early: nothing is cached
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+        meta = {
+            "url": f"{self.base_url}{url_path}",
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+        }
+        self._meta_path(path).write_text(json.dumps(meta) + "\n")
+
+    def tail(self, url_path: str, offset: int = 0) -> tuple[list[bytes], int]:
+        """Complete lines added to a growing file since byte `offset`, and the new offset.
+
+        For polling a live session: bypasses the cache and asks for the new
+        bytes only (Range), falling back to skipping them when the server
+        sends the whole file. A trailing partial line is left for the next
+        call. A file that isn't published yet reads as empty.
+        """
+        headers = {"User-Agent": USER_AGENT}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        request = urllib.request.Request(f"{self.base_url}{url_path}", headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                if response.status != 206:
+                    body = body[offset:]
+        except urllib.error.HTTPError as e:
+            if e.code in (404, 416):  # not published yet / nothing past offset
+                e.close()
+                return [], offset
+            raise
+        complete = body[:body.rfind(b"\n") + 1]
+        return complete.splitlines(keepends=True), offset + len(complete)
+
+    def topic(self, api_path: str, name: str) -> Iterator[tuple[float | None, dict]]:
+        """Parsed messages of one session topic, e.g. topic(session.api_path, "TeamRadio")."""
+        return parse_stream(self.lines(f"{api_path}{name}.jsonStream"))
+
+    def keyframe(self, api_path: str, name: str) -> dict:
+        """A topic's final state from its ``{name}.json`` keyframe."""
+        return json.loads(b"".join(self.lines(f"{api_path}{name}.json")).removeprefix(BOM))
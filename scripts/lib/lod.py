@@ -0,0 +1,127 @@
+"""
+Level-of-detail pyramids for track polylines.
+
+The track boundary ribbon and each driver's fastest-lap path are reduced to
+roughly LOD_TARGETS points, so the web app can pick a level for the
+viewport instead of decimating in the browser. Reduction reuses the
+error-bounded simplification from lib/decimate.py on X/Y against arc
+length; for a point budget, the tolerance is bisected to the smallest one
+whose simplification fits. Levels keep original samples only (a subset of
+the full polyline), and each carries its own bounding box.
+
+The full-resolution level is not repeated: it is the polyline already in
+the session JSON (trackBoundary.inner/outer, telemetryData x/y). Nor is a
+level that would be nearly as large: fastest-lap paths are already
+decimated to a few hundred points, so they often get no levels at all.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from lib.decimate import simplify_indices
+
+LOD_TARGETS = (200, 1000)
+BISECT_STEPS = 20
+FILL = 0.9  # stop bisecting once a level uses this much of its budget
+MAX_LEVEL_SHARE = 0.7  # a level's budget must be at most this share of the full point count
+
+
+def bbox(xs: np.ndarray, ys: np.ndarray) -> list[float]:
+    """[minX, minY, maxX, maxY], rounded like the coordinates themselves."""
+    if len(xs) == 0:
+        return []
+    return [
+        round(float(np.nanmin(xs)), 1),
+        round(float(np.nanmin(ys)), 1),
+        round(float(np.nanmax(xs)), 1),
+        round(float(np.nanmax(ys)), 1),
+    ]
+
+
+def arc_length(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Cumulative distance along a polyline, starting at 0."""
+    step = np.hypot(np.diff(xs), np.diff(ys))
+    return np.concatenate([[0.0], np.cumsum(np.nan_to_num(step))])
+
+
+def budget_indices(param: np.ndarray, channels: dict[str, np.ndarray], target: int) -> np.ndarray:
+    """Indices of at most `target` points (and at least FILL of it, when reachable)."""
+    n = len(param)
+    if n <= target:
+        return np.arange(n)
+    extent = max(float(np.nanmax(v) - np.nanmin(v)) for v in channels.values()) or 1.0
+    lo, hi = 0.0, extent
+    best = simplify_indices(param, channels, dict.fromkeys(channels, hi))
+    for _ in range(BISECT_STEPS):
+        mid = (lo + hi) / 2
+        kept = simplify_indices(param, channels, dict.fromkeys(channels, mid))
+        if len(kept) <= target:
+            hi, best = mid, kept
+            if len(kept) >= target * FILL:
+                break
+        else:
+            lo = mid
+    return best
+
+
+def level_targets(targets: tuple[int, ...], points: int) -> list[int]:
+    """The budgets worth a level for a polyline of `points`, smallest first."""
+    return [target for target in sorted(targets) if target <= points * MAX_LEVEL_SHARE]
+
+
+def path_pyramid(xs, ys, targets: tuple[int, ...] = LOD_TARGETS) -> dict:
+    """Reduced levels of one path; levels within 30% of the full point count are omitted.
+
+    Returns {"points": full count, "bbox": [...], "levels": [{"points",
+    "bbox", "index", "x", "y"}, ...]} with levels coarsest first. ``index``
+    maps each kept point back to the full trace, so other channels (speed,
+    gear, ...) can be looked up for it.
+    """
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    param = arc_length(xs, ys)
+    levels = []
+    for target in level_targets(targets, len(xs)):
+        kept = budget_indices(param, {"x": xs, "y": ys}, target)
+        levels.append({
+            "points": len(kept),
+            "bbox": bbox(xs[kept], ys[kept]),
+            "index": kept.tolist(),
+            "x": np.round(xs[kept], 1).tolist(),
+            "y": np.round(ys[kept], 1).tolist(),
+        })
+    return {"points": len(xs), "bbox": bbox(xs, ys), "levels": levels}
+
+
+def boundary_pyramid(boundary: dict, targets: tuple[int, ...] = LOD_TARGETS) -> dict:
+    """Bounding box and reduced levels for a compute_track_boundary() result.
+
+    Inner and outer edges are simplified together (one shared set of
+    indices, against the centre line's arc length), so every level is
+    still a ribbon of matching point pairs.
+    """
+    edges = {
+        f"{side}_{axis}": np.asarray(boundary[side][axis], dtype=float)
+        for side in ("inner", "outer")
+        for axis in ("x", "y")
+    }
+    all_x = np.concatenate([edges["inner_x"], edges["outer_x"]])
+    all_y = np.concatenate([edges["inner_y"], edges["outer_y"]])
+    param = arc_length(
+        (edges["inner_x"] + edges["outer_x"]) / 2, (edges["inner_y"] + edges["outer_y"]) / 2
+    )
+    levels = []
+    for target in level_targets(targets, len(param)):
+        kept = budget_indices(param, edges, target)
+        level = {"points": len(kept)}
+        level["bbox"] = bbox(
+            np.concatenate([edges["inner_x"][kept], edges["outer_x"][kept]]),
+            np.concatenate([edges["inner_y"][kept], edges["outer_y"][kept]]),
+        )
+        for side in ("inner", "outer"):
+            level[side] = {
+                "x": np.round(edges[f"{side}_x"][kept], 1).tolist(),
+                "y": np.round(edges[f"{side}_y"][kept], 1).tolist(),
+            }
+        levels.append(level)
+    return {"bbox": bbox(all_x, all_y), "levels": levels}
@@ -0,0 +1,158 @@
+"""
+Memory savers for ``--low-memory`` runs.
+
+A loaded race holds every driver's car and position data plus the laps
+table for the whole run. In low-memory mode fetch_telemetry shrinks those
+frames right after session.load() and drops each one from the session as
+soon as the last stage that reads it has finished.
+
+Downcasting keeps every stored value: a float64 column only becomes float32
+(and an integer column int16) when every value survives the round trip,
+which holds for FastF1's speeds, RPM, throttle, coordinates and lap
+counters. Repeated strings (compound, team, track status) become
+categoricals. FastF1 merges and interpolates car and position data in
+their own dtypes, though, so trace extraction wraps each driver in
+full_precision(), which restores that driver's channels to the loaded
+dtypes while they are read. The output is identical to a normal run.
+"""
+
+from __future__ import annotations
+
+import gc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Parsed with columnar.int_column, which fills NaN with 0 (not a valid category)
+KEEP_COLUMNS = ("DriverNumber",)
+CATEGORY_RATIO = 0.5  # categorize string columns with at most this share of distinct values
+
+# frame.attrs key listing the columns downcast_frame narrowed, with their original dtypes
+DOWNCAST_ATTR = "downcast"
+
+# Session attributes holding the data each session.load() flag fetches
+SESSION_DATA: dict[str, tuple[str, ...]] = {
+    "laps": ("laps", "track_status"),
+    "telemetry": ("car_data", "pos_data"),
+    "weather": ("weather_data",),
+    "messages": ("race_control_messages",),
+}
+
+
+def _fits_int16(values: pd.Series) -> bool:
+    info = np.iinfo(np.int16)
+    return values.empty or (values.min() >= info.min and values.max() <= info.max)
+
+
+def downcast_frame(frame: pd.DataFrame, keep=KEEP_COLUMNS, categories: bool = True) -> int:
+    """Shrink columns in place wherever no value changes; returns bytes saved."""
+    before = int(frame.memory_usage(deep=True).sum())
+    original = {}
+    for name in frame.columns:
+        if name in keep:
+            continue
+        column = frame[name]
+        dtype = column.dtype
+        if dtype.kind == "f" and dtype.itemsize > 4:
+            small = column.astype("float32")
+            if np.array_equal(small.to_numpy(dtype="float64"), column.to_numpy(dtype="float64"), equal_nan=True):
+                frame[name] = small
+                original[name] = dtype
+        elif dtype.kind in "iu" and dtype.itemsize > 2 and _fits_int16(column):
+            frame[name] = column.astype("int16")
+            original[name] = dtype
+        elif categories and dtype == object and len(column):
+            if pd.api.types.infer_dtype(column, skipna=True) != "string":
+                continue
+            if column.nunique(dropna=True) <= len(column) * CATEGORY_RATIO:
+                frame[name] = column.astype("category")
+                original[name] = dtype
+    if original:
+        frame.attrs[DOWNCAST_ATTR] = {**frame.attrs.get(DOWNCAST_ATTR, {}), **original}
+    return before - int(frame.memory_usage(deep=True).sum())
+
+
+def restore_frame(frame: pd.DataFrame) -> None:
+    """Undo downcast_frame in place: every narrowed column gets its original dtype back."""
+    for name, dtype in frame.attrs.pop(DOWNCAST_ATTR, {}).items():
+        if name in frame.columns:
+            frame[name] = frame[name].astype(dtype)
+
+
+def loaded_attr(session, name: str):
+    """A session attribute, or None when FastF1 has not loaded it (or doesn't provide it)."""
+    try:
+        return getattr(session, name)
+    except Exception:  # FastF1 raises DataNotLoadedError for data it didn't load
+        return None
+
+
+def downcast_session(session) -> int:
+    """Downcast the laps table and per-driver telemetry of a loaded session; returns bytes saved."""
+    saved = 0
+    laps = loaded_attr(session, "laps")
+    if isinstance(laps, pd.DataFrame) and not laps.empty:
+        saved += downcast_frame(laps)
+    for name in SESSION_DATA["telemetry"]:
+        frames = loaded_attr(session, name)
+        for tel in (frames or {}).values():
+            # FastF1 merges and resamples these itself; leave string columns alone
+            saved += downcast_frame(tel, keep=(), categories=False)
+    return saved
+
+
+@contextmanager
+def full_precision(session, driver):
+    """Restore one driver's downcast car and position data for the duration of the block.
+
+    Downcasting only narrows columns whose values survive the round trip,
+    so the restored frames hold exactly the loaded values; they are
+    downcast again on exit. A session that was never downcast (or driver
+    without telemetry) passes through untouched.
+    """
+    frames = []
+    if session is not None:
+        for name in SESSION_DATA["telemetry"]:
+            frame = (loaded_attr(session, name) or {}).get(driver)
+            if frame is not None and DOWNCAST_ATTR in frame.attrs:
+                frames.append(frame)
+    for frame in frames:
+        restore_frame(frame)
+    try:
+        yield
+    finally:
+        for frame in frames:
+            downcast_frame(frame, keep=(), categories=False)
+
+
+def release_session_data(session, flag: str) -> list[str]:
+    """Drop the data a load flag fetched from the session; returns the attributes released.
+
+    FastF1 keeps loaded data in private attributes behind read-only
+    properties, so the private name is tried first.
+    """
+    released = []
+    for name in SESSION_DATA[flag]:
+        for attr in (f"_{name}", name):
+            try:
+                delattr(session, attr)
+            except AttributeError:
+                continue
+            released.append(name)
+            break
+    gc.collect()  # laps and telemetry frames hold reference cycles back to the session
+    return released
+
+
+def release_plan(stages: list[str], loads: dict[str, set[str]], keep: set[str] = frozenset()) -> dict[str, list[str]]:
+    """Load flags to release after each stage: after the last of `stages` that reads them."""
+    last: dict[str, str] = {}
+    for name in stages:
+        for flag in sorted(loads[name]):
+            last[flag] = name
+    plan: dict[str, list[str]] = {}
+    for flag, name in last.items():
+        if flag not in keep:
+            plan.setdefault(name, []).append(flag)
+    return plan
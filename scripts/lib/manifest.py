@@ -0,0 +1,137 @@
+"""
+Content-hashed output manifest.
+
+Every artifact of a run is listed under the object key it is deployed to
+(its path below app/data, e.g. ``telemetry/2025-R01-....json`` or
+``radio/2025-R01/003_NOR.mp3``) with its SHA-256, size and content type:
+
+    {
+      "version": 1,
+      "objects": {
+        "radio/2025-R01/000_VER.mp3": {"sha256": "...", "size": 48213,
+                                       "contentType": "audio/mpeg"},
+        "radio/2025-R01/007_VER.mp3": {..., "duplicateOf": "radio/2025-R01/000_VER.mp3"},
+        "telemetry/2025-R01-....json.gz": {..., "contentType": "application/json",
+                                           "contentEncoding": "gzip"},
+        ...
+      },
+      "changes": {"upload": [...], "removed": [...], "unchanged": 41}
+    }
+
+``changes`` is the diff against the previous manifest: objects that are
+new or whose content changed, minus duplicates (identical content already
+listed under another key), so a deploy step only has to push ``upload``.
+Keys the output refers to (the session JSON's ``audioFile`` values) are
+never marked as duplicates, so everything it links to gets deployed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+CONTENT_TYPES = {".json": "application/json", ".mp3": "audio/mpeg", ".bin": "application/octet-stream"}
+CONTENT_ENCODINGS = {".gz": "gzip", ".br": "br"}
+
+
+def file_digest(path: Path) -> str:
+    """Hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe(path: Path) -> dict:
+    """Manifest entry for one file: hash, size, content type (and encoding)."""
+    path = Path(path)
+    entry = {"sha256": file_digest(path), "size": path.stat().st_size}
+    suffix = path.suffix
+    encoding = CONTENT_ENCODINGS.get(suffix)
+    if encoding:
+        suffix = Path(path.stem).suffix
+    entry["contentType"] = CONTENT_TYPES.get(suffix, "application/octet-stream")
+    if encoding:
+        entry["contentEncoding"] = encoding
+    return entry
+
+
+def build_objects(artifacts: dict[str, Path], referenced: set[str] | frozenset = frozenset()) -> dict[str, dict]:
+    """Entries for {object key: local path}, in key order, with duplicates marked.
+
+    The first key with a given content, taking referenced keys before the
+    rest, is the canonical copy; other unreferenced keys with that content
+    get ``duplicateOf`` pointing at it.
+    """
+    entries: dict[str, dict] = {}
+    first: dict[tuple[str, str | None], str] = {}
+    for key in sorted(artifacts, key=lambda key: (key not in referenced, key)):
+        entry = describe(artifacts[key])
+        content = (entry["sha256"], entry.get("contentEncoding"))
+        if content in first and key not in referenced:
+            entry["duplicateOf"] = first[content]
+        else:
+            first.setdefault(content, key)
+        entries[key] = entry
+    return {key: entries[key] for key in sorted(entries)}
+
+
+def _identity(entry: dict) -> tuple:
+    return entry["sha256"], entry["contentType"], entry.get("contentEncoding")
+
+
+def _deployed(previous: dict[str, dict], key: str, entry: dict) -> bool:
+    """Whether the previous run already uploaded this content under key (duplicates were skipped)."""
+    before = previous.get(key)
+    return before is not None and "duplicateOf" not in before and _identity(before) == _identity(entry)
+
+
+def diff_objects(previous: dict[str, dict], current: dict[str, dict]) -> dict:
+    """Keys to upload (new or changed, not duplicates) and keys no longer produced."""
+    upload = [key for key, entry in current.items() if "duplicateOf" not in entry and not _deployed(previous, key, entry)]
+    return {
+        "upload": upload,
+        "removed": sorted(set(previous) - set(current)),
+        "unchanged": sum(1 for key, entry in current.items() if key in previous and key not in upload),
+    }
+
+
+def load_manifest(path: Path | None) -> dict | None:
+    """A manifest, or None if missing, unreadable or from another format version."""
+    if path is None:
+        return None
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) and manifest.get("version") == VERSION else None
+
+
+def write_manifest(
+    path: Path, artifacts: dict[str, Path], previous: dict | None = None, referenced: set[str] | frozenset = frozenset()
+) -> dict:
+    """Describe the artifacts, diff against `previous`, and atomically write the manifest."""
+    objects = build_objects(artifacts, referenced)
+    manifest = {
+        "version": VERSION,
+        "objects": objects,
+        "changes": diff_objects((previous or {}).get("objects", {}), objects),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return manifest
@@ -0,0 +1,122 @@
+"""
+Stage-level instrumentation for fetch_telemetry (``--profile``).
+
+StageProfiler times each named stage and, when enabled, records tracemalloc
+current/peak bytes with the top allocation sites, the process's peak RSS,
+row/point counts and the serialized size of each top-level output key. The
+whole thing is written as a JSON report next to the telemetry output. One
+stage can additionally be run under cProfile and dumped for snakeviz/pstats.
+
+When disabled every method is a cheap no-op, so the pipeline code is the
+same with or without --profile.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TOP_ALLOCATIONS = 5
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageProfiler:
+    """Collects per-stage timings, memory and counts for one session run."""
+
+    def __init__(self, enabled: bool = False, cprofile_stage: str | None = None):
+        self.enabled = enabled
+        self.cprofile_stage = cprofile_stage
+        self.stages: list[dict] = []
+        self.output_bytes: dict[str, int] = {}
+        self.file_bytes: dict[str, int] = {}
+        self.cprofile_path: str | None = None
+        self._profile: cProfile.Profile | None = None
+        self._started = time.perf_counter()
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as stage `name`."""
+        if not self.enabled:
+            yield self
+            return
+
+        record: dict = {"name": name, "counts": {}}
+        self.stages.append(record)
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile() if name == self.cprofile_stage else None
+        started = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile:
+                profile.disable()
+                self._profile = profile
+            record["seconds"] = round(time.perf_counter() - started, 4)
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+            record["tracemalloc"] = {
+                "currentBytes": current,
+                "peakBytes": peak,
+                "top": [{"where": str(stat.traceback[0]), "bytes": stat.size} for stat in top],
+            }
+            record["peakRssBytes"] = peak_rss_bytes()
+
+    def count(self, **counts: int) -> None:
+        """Attach counts (rows, points, clips, ...) to the current stage."""
+        if self.enabled and self.stages:
+            self.stages[-1]["counts"].update(counts)
+
+    def record_output(self, section_bytes: dict[str, int], file_bytes: dict[str, int] | None = None) -> None:
+        """Record the serialized size of each top-level output key (and of each output file)."""
+        if not self.enabled:
+            return
+        self.output_bytes = dict(section_bytes)
+        self.file_bytes = dict(file_bytes or {})
+
+    def report(self, **meta) -> dict:
+        return {
+            **meta,
+            "totalSeconds": round(time.perf_counter() - self._started, 4),
+            "peakRssBytes": peak_rss_bytes(),
+            "stages": self.stages,
+            "outputBytes": self.output_bytes,
+            "fileBytes": self.file_bytes,
+            "cprofile": self.cprofile_path,
+        }
+
+    def write(self, output_path: Path, **meta) -> Path | None:
+        """Write {output}.profile.json (and {output}.{stage}.prof); returns the report path."""
+        if not self.enabled:
+            return None
+        stem = output_path.with_suffix("")
+        if self._profile is not None:
+            prof_path = stem.with_name(f"{stem.name}.{self.cprofile_stage}.prof")
+            self._profile.dump_stats(prof_path)
+            self.cprofile_path = str(prof_path)
+        report_path = stem.with_name(f"{stem.name}.profile.json")
+        with open(report_path, "w") as f:
+            json.dump(self.report(**meta), f, indent=2)
+        tracemalloc.stop()
+        return report_path
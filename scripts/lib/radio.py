@@ -0,0 +1,174 @@
+"""
+Concurrent team-radio clip downloader.
+
+Clips are fetched by a bounded thread pool that lives as long as the
+downloader, so repeated download_all() calls (one per poll in --watch mode)
+reuse the same threads. Each worker thread keeps one
+keep-alive HTTP(S) connection to the livetiming host and streams the body to
+a temp file next to the destination, renaming it into place only once the
+download is complete, so an interrupted run never leaves a truncated MP3
+behind for the "already cached" check to trust.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import http.client
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+USER_AGENT = "f1-tracker/1.0"
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadError(Exception):
+    """A clip could not be fetched (after retries, or a non-retryable status)."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ClipResult:
+    """Outcome of one clip: "downloaded", "cached" or "failed"."""
+
+    url_path: str
+    local_path: Path
+    status: str
+    seconds: float = 0.0
+    bytes: int = 0
+    attempts: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+class RadioDownloader:
+    """Download many files from one host with pooled keep-alive connections."""
+
+    def __init__(
+        self,
+        base_url: str,
+        workers: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 15.0,
+    ):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname or ""
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+
+    # -- connections ---------------------------------------------------------
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _reset_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def __enter__(self) -> RadioDownloader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- downloads -----------------------------------------------------------
+
+    def _fetch_to(self, url_path: str, local_path: Path) -> int:
+        """Stream one response body to local_path atomically. Returns bytes written."""
+        conn = self._connection()
+        conn.request("GET", f"{self.prefix}{url_path}", headers={"User-Agent": USER_AGENT})
+        resp = conn.getresponse()
+        if resp.status != 200:
+            resp.read()  # drain so the connection can be reused
+            raise DownloadError(f"HTTP {resp.status}", status=resp.status)
+
+        fd, tmp_name = tempfile.mkstemp(dir=local_path.parent, prefix=f".{local_path.name}.", suffix=".part")
+        written = 0
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := resp.read(CHUNK_SIZE):
+                    tmp.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp_name, local_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+        return written
+
+    def download(self, url_path: str, local_path: Path) -> ClipResult:
+        """Download one file unless it already exists, retrying with exponential backoff."""
+        result = ClipResult(url_path=url_path, local_path=local_path, status="cached")
+        if local_path.exists():
+            return result
+
+        started = time.perf_counter()
+        for attempt in range(1, self.retries + 2):
+            result.attempts = attempt
+            try:
+                result.bytes = self._fetch_to(url_path, local_path)
+                result.status = "downloaded"
+                result.error = None
+                break
+            except DownloadError as e:
+                result.status, result.error = "failed", str(e)
+                # 4xx (other than rate limiting) won't get better on retry
+                if e.status is not None and 400 <= e.status < 500 and e.status != 429:
+                    break
+            except (OSError, http.client.HTTPException) as e:
+                result.status, result.error = "failed", f"{type(e).__name__}: {e}"
+                self._reset_connection()
+            if attempt <= self.retries:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def download_all(self, items: list[tuple[str, Path]]) -> list[ClipResult]:
+        """Download (url_path, local_path) pairs concurrently; results keep input order."""
+        if not items:
+            return []
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="radio")
+            pool = self._pool
+        return list(pool.map(lambda item: self.download(*item), items))
@@ -0,0 +1,228 @@
+"""
+Season index: per-session and per-driver summaries of every telemetry output.
+
+Cross-race views (season top speeds, best laps, compound usage, DNFs) would
+otherwise have to load every session JSON. The index keeps one compact
+file per season, ``{index dir}/{year}.json``::
+
+    {
+      "version": 1,
+      "year": 2025,
+      "sessions": [
+        {"file": "2025-R01-australian-grand-prix.json", "round": 1,
+         "sessionType": "R", "eventName": ..., "laps": 1120,
+         "fastestLap": {"driverNumber": 4, "lapNumber": 43, "time": 82.167},
+         "topSpeed": {"driverNumber": 1, "speed": 331.0},
+         "drivers": [{"driverNumber": 1, "abbreviation": "VER", "teamName": ...,
+                      "position": 2, "status": "Finished", "dnf": false,
+                      "fastestLap": 82.4, "topSpeed": 331.0, "laps": 57,
+                      "stints": [["MEDIUM", 21], ["HARD", 36]]}, ...]},
+        ...
+      ],
+      "drivers": [
+        {"driverNumber": 1, "abbreviation": "VER", "sessions": 3, "races": 1,
+         "dnfs": 0, "fastestLaps": 1, "topSpeed": 331.0,
+         "compoundLaps": {"HARD": 36, "MEDIUM": 21}}, ...
+      ]
+    }
+
+Each session entry depends only on that session's output, and the season
+totals are recomputed from the session entries on every update, so
+updating with the same output twice (or rebuilding from scratch) gives
+byte-identical files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+VERSION = 1
+SESSION_ORDER = ["FP1", "FP2", "FP3", "SQ", "SS", "S", "Q", "R"]
+# Race outputs and non-race ones tagged with their session (".q.json"), but no sidecars
+OUTPUT_PATTERN = re.compile(
+    rf"^(\d{{4}})-R(\d{{2}})-[^.]+(?:\.(?:{'|'.join(s.lower() for s in SESSION_ORDER if s != 'R')}))?\.json$"
+)
+# ClassifiedPosition codes for cars that started but did not finish
+DNF_CODES = {"R", "N"}
+SPEED_FIELDS = ("speedST", "speedFL", "speedI1", "speedI2")
+
+
+def _best(values: list[tuple], pick=min) -> tuple | None:
+    """The (value, ...) tuple with the best value, ignoring None values."""
+    values = [v for v in values if v[0] is not None]
+    return pick(values, key=lambda v: v[0]) if values else None
+
+
+def summarize_driver(driver: dict, laps: list[dict], speeds: list[float], stints: list[dict], race: bool) -> dict:
+    lap_times = [lap["lapTime"] for lap in laps if lap.get("lapTime") is not None and not lap.get("deleted")]
+    classified = driver.get("classifiedPosition")
+    return {
+        "driverNumber": driver["number"],
+        "abbreviation": driver.get("abbreviation"),
+        "teamName": driver.get("teamName"),
+        "position": driver.get("position"),
+        "status": driver.get("status"),
+        "dnf": (classified in DNF_CODES) if race else None,
+        "fastestLap": min(lap_times) if lap_times else None,
+        "topSpeed": max(speeds) if speeds else None,
+        "laps": len(laps),
+        "stints": [[s["compound"], s["lapEnd"] - s["lapStart"] + 1] for s in stints],
+    }
+
+
+def summarize_session(data: dict, filename: str) -> dict:
+    """Index entry for one session output document."""
+    session_type = data.get("sessionType", "R")
+    laps_by_driver: dict[int, list[dict]] = {}
+    speeds: dict[int, list[float]] = {}
+    for lap in data.get("lapData") or []:
+        laps_by_driver.setdefault(lap["driverNumber"], []).append(lap)
+        speeds.setdefault(lap["driverNumber"], []).extend(
+            lap[field] for field in SPEED_FIELDS if lap.get(field) is not None
+        )
+    for trace in data.get("telemetryData") or []:
+        speeds.setdefault(trace["driverNumber"], []).extend(v for v in trace.get("speed") or [] if v is not None)
+    stints: dict[int, list[dict]] = {}
+    for stint in data.get("stintData") or []:
+        stints.setdefault(stint["driverNumber"], []).append(stint)
+
+    drivers = [
+        summarize_driver(
+            driver,
+            laps_by_driver.get(driver["number"], []),
+            speeds.get(driver["number"], []),
+            stints.get(driver["number"], []),
+            race=session_type in ("R", "S"),
+        )
+        for driver in sorted(data.get("drivers") or [], key=lambda d: d["number"])
+    ]
+
+    fastest = _best([
+        (lap["lapTime"], lap["driverNumber"], lap["lapNumber"])
+        for lap in data.get("lapData") or []
+        if not lap.get("deleted")
+    ])
+    top = _best([(d["topSpeed"], d["driverNumber"]) for d in drivers], pick=max)
+    return {
+        "file": filename,
+        "round": data.get("round"),
+        "sessionType": session_type,
+        "eventName": data.get("eventName"),
+        "laps": len(data.get("lapData") or []),
+        "fastestLap": {"driverNumber": fastest[1], "lapNumber": fastest[2], "time": fastest[0]} if fastest else None,
+        "topSpeed": {"driverNumber": top[1], "speed": top[0]} if top else None,
+        "drivers": drivers,
+    }
+
+
+def season_drivers(sessions: list[dict]) -> list[dict]:
+    """Per-driver season totals from the session entries."""
+    totals: dict[int, dict] = {}
+    for session in sessions:
+        fastest_driver = (session.get("fastestLap") or {}).get("driverNumber")
+        for driver in session["drivers"]:
+            entry = totals.setdefault(driver["driverNumber"], {
+                "driverNumber": driver["driverNumber"],
+                "abbreviation": driver["abbreviation"],
+                "sessions": 0,
+                "races": 0,
+                "dnfs": 0,
+                "fastestLaps": 0,
+                "topSpeed": None,
+                "compoundLaps": {},
+            })
+            entry["abbreviation"] = driver["abbreviation"] or entry["abbreviation"]
+            entry["sessions"] += 1
+            if driver["dnf"] is not None:
+                entry["races"] += 1
+                entry["dnfs"] += bool(driver["dnf"])
+            entry["fastestLaps"] += fastest_driver == driver["driverNumber"]
+            if driver["topSpeed"] is not None and (entry["topSpeed"] is None or driver["topSpeed"] > entry["topSpeed"]):
+                entry["topSpeed"] = driver["topSpeed"]
+            for compound, laps in driver["stints"]:
+                entry["compoundLaps"][compound] = entry["compoundLaps"].get(compound, 0) + laps
+    for entry in totals.values():
+        entry["compoundLaps"] = dict(sorted(entry["compoundLaps"].items()))
+    return [totals[number] for number in sorted(totals)]
+
+
+def _session_sort_key(entry: dict) -> tuple:
+    session_type = entry["sessionType"]
+    order = SESSION_ORDER.index(session_type) if session_type in SESSION_ORDER else len(SESSION_ORDER)
+    return entry["round"] or 0, order, session_type, entry["file"]
+
+
+def build_index(year: int, sessions: list[dict]) -> dict:
+    sessions = sorted(sessions, key=_session_sort_key)
+    return {"version": VERSION, "year": year, "sessions": sessions, "drivers": season_drivers(sessions)}
+
+
+def index_path(index_dir: Path, year: int) -> Path:
+    return Path(index_dir) / f"{year}.json"
+
+
+def load_index(path: Path) -> dict | None:
+    """A season index, or None if missing, unreadable or from another format version."""
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if isinstance(index, dict) and index.get("version") == VERSION else None
+
+
+def write_index(path: Path, index: dict) -> bool:
+    """Atomically write the index if its content changed; returns whether it did."""
+    text = json.dumps(index, separators=(",", ":")) + "\n"
+    try:
+        if path.read_text() == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def update_season_index(index_dir: Path, output_path: Path) -> tuple[Path, bool]:
+    """Fold one session output into its season's index; returns (index path, changed)."""
+    output_path = Path(output_path)
+    with open(output_path) as f:
+        data = json.load(f)
+    year = data["year"]
+    path = index_path(index_dir, year)
+    index = load_index(path)
+    if index is None:
+        # No usable index yet: start from every output already on disk
+        return path, rebuild_season_index(index_dir, output_path.parent, year)
+    entry = summarize_session(data, output_path.name)
+    sessions = [s for s in index["sessions"] if s["file"] != entry["file"]] + [entry]
+    return path, write_index(path, build_index(year, sessions))
+
+
+def rebuild_season_index(index_dir: Path, output_dir: Path, year: int) -> bool:
+    """Rebuild a season's index from scratch from every session output in output_dir."""
+    sessions = []
+    for path in sorted(Path(output_dir).glob(f"{year}-R*.json")):
+        match = OUTPUT_PATTERN.match(path.name)
+        if not match or int(match.group(1)) != year:
+            continue
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  Skipping {path.name}: {e}")
+            continue
+        sessions.append(summarize_session(data, path.name))
+    return write_index(index_path(index_dir, year), build_index(year, sessions))
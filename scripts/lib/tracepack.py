@@ -0,0 +1,218 @@
+"""
+Compact binary encoding of telemetry traces (the ``telemetryData`` section).
+
+File layout (``{session}.traces.bin``, all integers little-endian):
+
+    offset  size  field
+    0       4     magic b"F1TR"
+    4       2     format version (uint16, currently 1)
+    6       2     reserved (0)
+    8       4     header length H in bytes (uint32)
+    12      H     UTF-8 JSON header
+    12+H    pad   zero bytes up to the next multiple of 8
+    D       ...   data section; every array starts on an 8-byte boundary
+
+The JSON header looks like::
+
+    {
+      "version": 1,
+      "dataOffset": D,
+      "dataLength": ...,
+      "traces": [
+        {
+          "driverNumber": 1, "lapNumber": 43, "count": 812,
+          "channels": {
+            "speed": {"offset": 0, "length": 1624, "dtype": "<i2",
+                      "encoding": "scaled", "scale": 0.1, "null": -32768},
+            ...
+          }
+        }
+      ]
+    }
+
+``offset`` is relative to the data section, ``length`` is in bytes. Each
+channel uses one of these encodings (decoded value in brackets):
+
+    raw      values stored as-is                     [v]
+    scaled   integer q, ``null`` sentinel = None     [q * scale]
+    delta    integer deltas of q = round(v / scale); q[0] is the header
+             "base" and the first delta is 0         [(base + cumsum(d)) * scale]
+    bits     np.packbits(bitorder="little") flags    [bool]
+
+Distance (1 cm) and x/y (0.1 m) are delta-encoded, using int16 deltas when
+they fit and int32 otherwise; a delta channel containing nulls falls back to
+raw float32 with NaN = None. Speed and throttle are int16 at 0.1 units, z
+is int32 at 0.1 units (elevation in FastF1 units can exceed int16's
++-3276.7), rpm is int16, gear int8 and brake/DRS are bit-packed. Typed arrays can be
+mapped straight onto the data section without copying.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"F1TR"
+VERSION = 1
+_PREAMBLE = struct.Struct("<4sHHI")
+
+# channel -> (encoding, dtype, scale); "delta" picks int16 or int32 per trace
+CHANNELS: dict[str, tuple[str, str, float | None]] = {
+    "distance": ("delta", "<i4", 0.01),
+    "speed": ("scaled", "<i2", 0.1),
+    "throttle": ("scaled", "<i2", 0.1),
+    "brake": ("bits", "|u1", None),
+    "drs": ("bits", "|u1", None),
+    "rpm": ("scaled", "<i2", 1.0),
+    "gear": ("scaled", "|i1", 1.0),
+    "x": ("delta", "<i4", 0.1),
+    "y": ("delta", "<i4", 0.1),
+    "z": ("scaled", "<i4", 0.1),
+}
+
+
+def _as_float(values: list) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype="float64")
+
+
+def _encode(name: str, values: list) -> tuple[bytes, dict]:
+    encoding, dtype, scale = CHANNELS[name]
+    meta: dict = {"dtype": dtype, "encoding": encoding}
+
+    if encoding == "bits":
+        flags = np.array([bool(v) for v in values], dtype=bool)
+        return np.packbits(flags, bitorder="little").tobytes(), meta
+
+    arr = _as_float(values)
+    if encoding == "delta" and np.isnan(arr).any():
+        encoding, dtype = "raw", "<f4"
+        meta = {"dtype": dtype, "encoding": encoding}
+    if encoding == "raw":
+        return arr.astype(dtype).tobytes(), meta
+
+    info = np.iinfo(np.dtype(dtype))
+    null = int(info.min)
+    meta["scale"] = scale
+    if encoding == "scaled":
+        mask = np.isnan(arr)
+        q = np.rint(np.where(mask, 0, arr) / scale)
+        if (q[~mask] <= null).any() or (q[~mask] > info.max).any():
+            raise ValueError(f"{name} out of range for {dtype} at scale {scale}")
+        q[mask] = null
+        if mask.any():
+            meta["null"] = null
+        return q.astype(dtype).tobytes(), meta
+
+    # delta
+    q = np.rint(arr / scale).astype("int64")
+    deltas = np.diff(q, prepend=q[:1]) if len(q) else q
+    if len(deltas) and np.abs(deltas).max() <= np.iinfo(np.int16).max:
+        meta["dtype"] = "<i2"
+    meta["base"] = int(q[0]) if len(q) else 0
+    return deltas.astype(meta["dtype"]).tobytes(), meta
+
+
+def _decode(meta: dict, data: memoryview, count: int) -> list:
+    raw = np.frombuffer(data[meta["offset"]:meta["offset"] + meta["length"]], dtype=meta["dtype"])
+    encoding = meta["encoding"]
+    if encoding == "bits":
+        return np.unpackbits(raw, count=count, bitorder="little").astype(bool).tolist()
+    if encoding == "raw":
+        values = raw.astype("float64")
+        return [None if np.isnan(v) else v for v in values.tolist()]
+    if encoding == "delta":
+        q = meta["base"] + np.cumsum(raw.astype("int64"))
+        return (q * meta["scale"]).tolist()
+    values = (raw.astype("float64") * meta["scale"]).tolist()
+    if "null" in meta:
+        nulls = np.flatnonzero(raw == meta["null"])
+        for i in nulls:
+            values[i] = None
+    return values
+
+
+def encode_traces(telemetry_entries: list[dict]) -> bytes:
+    """Encode telemetryData entries into the binary trace format."""
+    chunks: list[bytes] = []
+    traces = []
+    offset = 0
+    for entry in telemetry_entries:
+        count = len(entry.get("distance", []))
+        channels = {}
+        for name in CHANNELS:
+            values = entry.get(name) or []
+            if not values:
+                continue
+            if len(values) != count:
+                raise ValueError(f"{name} has {len(values)} samples, expected {count}")
+            blob, meta = _encode(name, values)
+            pad = -offset % 8
+            chunks.append(b"\0" * pad)
+            offset += pad
+            meta["offset"] = offset
+            meta["length"] = len(blob)
+            chunks.append(blob)
+            offset += len(blob)
+            channels[name] = meta
+        traces.append({
+            "driverNumber": entry["driverNumber"],
+            "lapNumber": entry["lapNumber"],
+            "count": count,
+            "channels": channels,
+        })
+
+    header = {"version": VERSION, "dataOffset": 0, "dataLength": offset, "traces": traces}
+    # dataOffset depends on the header length, which depends on dataOffset's digits
+    while True:
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        start = _PREAMBLE.size + len(header_bytes)
+        data_offset = start + (-start % 8)
+        if data_offset == header["dataOffset"]:
+            break
+        header["dataOffset"] = data_offset
+
+    preamble = _PREAMBLE.pack(MAGIC, VERSION, 0, len(header_bytes))
+    padding = b"\0" * (data_offset - start)
+    return preamble + header_bytes + padding + b"".join(chunks)
+
+
+def write_traces(telemetry_entries: list[dict], path: Path) -> int:
+    """Write the binary trace file and return its size in bytes."""
+    blob = encode_traces(telemetry_entries)
+    Path(path).write_bytes(blob)
+    return len(blob)
+
+
+def read_header(blob: bytes | memoryview) -> dict:
+    """Parse and validate the preamble and JSON header."""
+    magic, version, _, header_len = _PREAMBLE.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a telemetry trace file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported trace file version {version}")
+    return json.loads(bytes(blob[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+
+
+def decode_traces(blob: bytes | memoryview) -> list[dict]:
+    """Decode a binary trace file back into telemetryData-shaped dicts."""
+    view = memoryview(blob)
+    header = read_header(view)
+    data = view[header["dataOffset"]:header["dataOffset"] + header["dataLength"]]
+    entries = []
+    for trace in header["traces"]:
+        entry = {"driverNumber": trace["driverNumber"], "lapNumber": trace["lapNumber"]}
+        for name in CHANNELS:
+            meta = trace["channels"].get(name)
+            entry[name] = _decode(meta, data, trace["count"]) if meta else []
+        entries.append(entry)
+    return entries
+
+
+def read_traces(path: Path) -> list[dict]:
+    """Read a binary trace file from disk (memory-mapped)."""
+    with open(path, "rb") as f:
+        mapped = np.memmap(f, dtype="u1", mode="r")
+        return decode_traces(mapped.data)
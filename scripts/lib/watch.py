@@ -0,0 +1,338 @@
+"""
+Incremental updates for a session in progress (``--watch``).
+
+Each poll tails the session's livetiming topics from where the previous
+one stopped (LivetimingClient.tail) and turns what arrived into a delta:
+
+    live/{label}/000001.json  {"seq": 1, "lapData": [...], "raceControlMessages": [...],
+                               "teamRadioMessages": [...]}
+    live/{label}/head.json    {"seq": 7, "compactedThrough": 5,
+                               "output": "2025-R01-....json", "finished": false}
+
+Clients load the session JSON once and then fetch only the delta files
+after the last seq they applied, a few KB per poll. Compaction folds the
+pending deltas into the session JSON and deletes them; a client whose seq
+is below compactedThrough reloads the session JSON instead.
+
+Live laps carry the timing feed's fields only (lap and sector times,
+position); the full post-session run replaces them with FastF1's laps.
+The poll state (byte offsets, the timing feed merged so far, captures and
+messages already emitted, clips still to download) is kept in
+live/{label}/state.json, so a restarted watcher carries on from the same
+offsets and sequence number. A radio clip only enters a delta once it has
+been downloaded; failed clips are retried on every later poll.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from lib.jsonstream import JsonSectionWriter
+from lib.livetiming import LivetimingClient, iter_captures, iter_items, parse_stream
+
+# DriverList first, so radio clips of the same poll get driver abbreviations
+TOPICS = ("DriverList", "TimingData", "RaceControlMessages", "TeamRadio", "SessionStatus")
+FINISHED = {"Finalised", "Ends"}
+DELTA_SECTIONS = ("lapData", "raceControlMessages", "teamRadioMessages")
+
+
+def write_json(path: Path, data) -> None:
+    """Write compact JSON atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def merge_patch(target: dict, patch) -> dict:
+    """Apply a livetiming patch in place; lists are merged as dicts keyed by position."""
+    if isinstance(patch, list):
+        patch = {str(i): value for i, value in enumerate(patch)}
+    for key, value in patch.items():
+        if isinstance(value, (dict, list)):
+            current = target.get(key)
+            target[key] = merge_patch(current if isinstance(current, dict) else {}, value)
+        else:
+            target[key] = value
+    return target
+
+
+def lap_seconds(value) -> float | None:
+    """Seconds of a timing feed time ("1:32.456" or "28.123"); None if blank or malformed."""
+    if not value:
+        return None
+    minutes, _, seconds = str(value).rpartition(":")
+    try:
+        return round(int(minutes or 0) * 60 + float(seconds), 3)
+    except ValueError:
+        return None
+
+
+def message_key(message: dict) -> str:
+    """Identity of a race control message; the feed repeats some in later patches."""
+    return f"{message.get('Utc')}|{message.get('Message')}"
+
+
+def race_control_entry(message: dict) -> dict:
+    """A RaceControlMessages item as a TelemetryRaceControlMessage record."""
+    return {
+        "lapNumber": message.get("Lap"),
+        "category": message.get("Category"),
+        "flag": message.get("Flag"),
+        "scope": message.get("Scope"),
+        "sector": message.get("Sector"),
+        "driverNumber": message.get("RacingNumber"),
+        "message": message.get("Message"),
+    }
+
+
+class LiveSession:
+    """What has been read from the live topics so far; poll() returns what is new."""
+
+    def __init__(self, state: dict | None = None):
+        state = state or {}
+        self.offsets: dict[str, int] = state.get("offsets", {})
+        self.drivers: dict[str, dict] = state.get("drivers", {})
+        self.timing: dict[str, dict] = state.get("timing", {})
+        self.laps_done: dict[str, int] = state.get("lapsDone", {})
+        self.seen_messages: set[str] = set(state.get("seenMessages", []))
+        self.seen_captures: set[str] = set(state.get("seenCaptures", []))
+        self.clips: int = state.get("clips", 0)
+        # Captures not downloaded yet: {"path": archive path, "message": teamRadioMessages record}
+        self.pending_clips: list[dict] = state.get("pendingClips", [])
+        self.status: str | None = state.get("status")
+        self.seq: int = state.get("seq", 0)  # the last delta this state has been polled through
+
+    @classmethod
+    def load(cls, path: Path) -> LiveSession:
+        try:
+            with open(path) as f:
+                return cls(json.load(f))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        write_json(path, {
+            "offsets": self.offsets,
+            "drivers": self.drivers,
+            "timing": self.timing,
+            "lapsDone": self.laps_done,
+            "seenMessages": sorted(self.seen_messages),
+            "seenCaptures": sorted(self.seen_captures),
+            "clips": self.clips,
+            "pendingClips": self.pending_clips,
+            "status": self.status,
+            "seq": self.seq,
+        })
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def driver_entries(self) -> list[dict]:
+        """TelemetryDriver records from the DriverList feed, in running order."""
+        entries = []
+        for number, info in self.drivers.items():
+            if not number.isdigit():
+                continue
+            color = info.get("TeamColour")
+            entries.append({
+                "number": int(number),
+                "abbreviation": info.get("Tla"),
+                "fullName": info.get("FullName"),
+                "teamName": info.get("TeamName"),
+                "teamColor": f"#{color}" if color else None,
+                "position": int(info["Line"]) if str(info.get("Line", "")).isdigit() else None,
+            })
+        return sorted(entries, key=lambda d: (d["position"] is None, d["position"] or 0, d["number"]))
+
+    def _new_laps(self, messages) -> list[dict]:
+        """A lap record each time a driver's NumberOfLaps goes up."""
+        laps = []
+        for _, message in messages:
+            lines = message.get("Lines")
+            if not isinstance(lines, dict):
+                continue
+            merge_patch(self.timing, lines)
+            for number, patch in lines.items():
+                if not isinstance(patch, dict) or "NumberOfLaps" not in patch:
+                    continue
+                line = self.timing[number]
+                count = line.get("NumberOfLaps")
+                if not isinstance(count, int):
+                    continue
+                if count <= self.laps_done.get(number, 0):
+                    continue
+                self.laps_done[number] = count
+                sectors = line.get("Sectors") or {}
+                laps.append({
+                    "driverNumber": int(number),
+                    "lapNumber": count,
+                    "lapTime": lap_seconds((line.get("LastLapTime") or {}).get("Value")),
+                    **{
+                        f"sector{i + 1}": lap_seconds((sectors.get(str(i)) or {}).get("Value"))
+                        for i in range(3)
+                    },
+                    "position": int(line["Position"]) if str(line.get("Position", "")).isdigit() else None,
+                })
+        return laps
+
+    def poll(self, client: LivetimingClient, api_path: str, radio_label: str) -> tuple[dict, list[tuple[str, str]]]:
+        """Read what arrived since the last poll.
+
+        Returns the delta sections and the radio clips to download (new ones
+        and those that failed before), as (archive path, local file name)
+        pairs. teamRadioMessages stays empty until downloaded() fills it.
+        """
+        delta = {name: [] for name in DELTA_SECTIONS}
+        for topic in TOPICS:
+            lines, self.offsets[topic] = client.tail(f"{api_path}{topic}.jsonStream", self.offsets.get(topic, 0))
+            messages = list(parse_stream(lines))
+            if topic == "DriverList":
+                for _, message in messages:
+                    merge_patch(self.drivers, {k: v for k, v in message.items() if isinstance(v, dict)})
+            elif topic == "TimingData":
+                delta["lapData"] = self._new_laps(messages)
+            elif topic == "RaceControlMessages":
+                items = iter_items(messages, "Messages", message_key, self.seen_messages)
+                delta["raceControlMessages"] = [race_control_entry(m) for m in items]
+            elif topic == "TeamRadio":
+                for capture in iter_captures(messages, self.seen_captures):
+                    number = str(capture.get("RacingNumber", ""))
+                    abbr = self.drivers.get(number, {}).get("Tla") or number
+                    local_name = f"{self.clips:03d}_{abbr}.mp3"
+                    self.clips += 1
+                    self.pending_clips.append({"path": capture["Path"], "message": {
+                        "driverNumber": int(number) if number.isdigit() else None,
+                        "timestamp": capture.get("Utc", ""),
+                        "audioFile": f"radio/{radio_label}/{local_name}",
+                    }})
+            elif topic == "SessionStatus":
+                for _, message in messages:
+                    self.status = message.get("Status", self.status)
+        return delta, [(clip["path"], Path(clip["message"]["audioFile"]).name) for clip in self.pending_clips]
+
+    def downloaded(self, names: set[str]) -> list[dict]:
+        """Take the pending clips whose files were downloaded; returns their messages.
+
+        The others stay pending, so the next poll tries them again.
+        """
+        done = [clip for clip in self.pending_clips if Path(clip["message"]["audioFile"]).name in names]
+        self.pending_clips = [clip for clip in self.pending_clips if clip not in done]
+        return [clip["message"] for clip in done]
+
+
+def fold_deltas(document: dict, deltas: list[dict]) -> dict:
+    """The session document with the deltas applied, in order.
+
+    Laps already in the document (e.g. from a full run) are kept over
+    their live versions; radio clips already listed are not repeated.
+    """
+    laps = document.setdefault("lapData", [])
+    have_laps = {(lap["driverNumber"], lap["lapNumber"]) for lap in laps}
+    messages = document.setdefault("raceControlMessages", [])
+    radio = document.setdefault("teamRadioMessages", [])
+    have_clips = {clip["audioFile"] for clip in radio}
+    for delta in deltas:
+        for lap in delta.get("lapData", []):
+            key = (lap["driverNumber"], lap["lapNumber"])
+            if key not in have_laps:
+                have_laps.add(key)
+                laps.append(lap)
+        messages.extend(delta.get("raceControlMessages", []))
+        for clip in delta.get("teamRadioMessages", []):
+            if clip["audioFile"] not in have_clips:
+                have_clips.add(clip["audioFile"])
+                radio.append(clip)
+    return document
+
+
+class DeltaLog:
+    """Sequence-numbered delta files and head.json in one live directory."""
+
+    def __init__(self, directory: Path, output_name: str):
+        self.dir = Path(directory)
+        self.written: Path | None = None  # delta file of the current poll, until commit()
+        try:
+            with open(self.dir / "head.json") as f:
+                self.head = json.load(f)
+        except (OSError, ValueError):
+            self.head = {"seq": 0, "compactedThrough": 0, "output": output_name, "finished": False}
+
+    def delta_path(self, seq: int) -> Path:
+        return self.dir / f"{seq:06d}.json"
+
+    def write(self, delta: dict) -> Path | None:
+        """Write the next delta file (None if nothing is new); commit() publishes it."""
+        self.written = None
+        if not any(delta.get(name) for name in DELTA_SECTIONS):
+            return None
+        path = self.delta_path(self.head["seq"] + 1)
+        write_json(path, {"seq": self.head["seq"] + 1, **delta})
+        self.written = path
+        return path
+
+    def commit(self) -> None:
+        """Advance head.json past the delta written last, if write() wrote one."""
+        if self.written is not None:
+            self.head["seq"] += 1
+            self.written = None
+        write_json(self.dir / "head.json", self.head)
+
+    def recover(self, seq: int) -> bool:
+        """Publish delta `seq` when the poll state already covers it but head.json does not.
+
+        That is a watcher stopped between saving its state and commit(): the
+        state's offsets are past the delta's data, so it would never be
+        polled again. Returns whether head.json moved.
+        """
+        if seq != self.head["seq"] + 1 or not self.delta_path(seq).exists():
+            return False
+        self.head["seq"] = seq
+        write_json(self.dir / "head.json", self.head)
+        return True
+
+    def pending(self) -> list[int]:
+        return list(range(self.head["compactedThrough"] + 1, self.head["seq"] + 1))
+
+    def compact(self, output_path: Path, skeleton: dict, indent: int | None = None, compress=()) -> int:
+        """Fold pending deltas into the session JSON (or `skeleton` if there is none); returns how many."""
+        pending = self.pending()
+        if not pending:
+            return 0
+        try:
+            with open(output_path) as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            document = dict(skeleton)
+        deltas = []
+        for seq in pending:
+            with open(self.delta_path(seq)) as f:
+                deltas.append(json.load(f))
+        document = fold_deltas(document, deltas)
+
+        writer = JsonSectionWriter(output_path, indent=indent, compress=compress)
+        try:
+            for key, value in document.items():
+                writer.section(key, value)
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+        self.head["compactedThrough"] = pending[-1]
+        write_json(self.dir / "head.json", self.head)
+        for seq in pending:
+            self.delta_path(seq).unlink(missing_ok=True)
+        return len(pending)
+
+    def finish(self) -> None:
+        self.head["finished"] = True
+        write_json(self.dir / "head.json", self.head)
@@ -0,0 +1,304 @@
+"""
+Synthetic, offline stand-ins for the FastF1 objects fetch_telemetry reads.
+
+SyntheticSession mirrors the parts of fastf1.core.Session the pipeline
+touches (results, laps, weather_data, race_control_messages, track_status,
+t0_date, event, get_circuit_info, load) with the same column names and
+dtypes, at realistic race-scale sizes and fully deterministic for a given
+seed. Laps support pick_fastest() and each lap's get_telemetry() returns a
+lap-shaped trace, so the whole pipeline can run in tests and benchmarks
+without the network. With channels=True the session also holds car_data and
+pos_data, and get_telemetry() merges them the way FastF1 does.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+SAMPLES_PER_LAP = 750  # a get_telemetry() lap is ~700-800 merged samples
+TRACK_LENGTH = 5300.0
+COMPOUNDS = ["SOFT", "MEDIUM", "HARD"]
+POSITION_COLUMNS = ["X", "Y", "Z"]
+
+# Benchmark/test presets: drivers, laps, and whether every lap gets telemetry
+SCALES: dict[str, dict] = {
+    "sprint": {"drivers": 20, "laps": 19, "all_laps_telemetry": False},
+    "race": {"drivers": 20, "laps": 58, "all_laps_telemetry": False},
+    "race-all-laps": {"drivers": 20, "laps": 58, "all_laps_telemetry": True},
+}
+
+
+def make_lap_telemetry(n: int = SAMPLES_PER_LAP, seed: int = 0) -> pd.DataFrame:
+    """A lap-shaped trace: long straights, hard braking into slow corners."""
+    rng = np.random.default_rng(seed)
+    s = np.linspace(0, 1, n)
+    corners = [0.18, 0.33, 0.52, 0.71, 0.9]
+    speed = np.full(n, 320.0)
+    for c in corners:
+        speed = np.minimum(speed, 90 + 2200 * np.abs(s - c))
+    speed += rng.normal(0, 0.3, n)
+    brake = np.zeros(n, dtype=bool)
+    for c in corners:
+        brake |= (s > c - 0.03) & (s < c)
+    gear = np.clip((speed // 40).astype(int), 1, 8)
+    angle = 2 * np.pi * s
+    return pd.DataFrame({
+        "Distance": s * TRACK_LENGTH,
+        "Speed": speed,
+        "Throttle": np.where(brake, 0.0, np.clip((speed - 80) / 2, 0, 100)),
+        "Brake": brake,
+        "nGear": gear,
+        "DRS": np.where((s > 0.05) & (s < 0.15), 12, 8),
+        "RPM": 6000 + speed * 35,
+        "X": 20000 * np.cos(angle) + 3000 * np.sin(5 * angle),
+        "Y": 12000 * np.sin(angle),
+        "Z": 50 * np.sin(3 * angle),
+    })
+
+
+def lap_seed(driver_number, lap_number) -> int:
+    return int(driver_number) * 1000 + int(lap_number)
+
+
+def make_channels(laps: pd.DataFrame) -> tuple[dict, dict]:
+    """session.car_data and session.pos_data: every lap's trace, per driver.
+
+    Values are whole numbers, as in FastF1's feeds, so they fit float32 and
+    get downcast in --low-memory runs.
+    """
+    car_data, pos_data = {}, {}
+    for driver, numbers in laps.groupby("DriverNumber", sort=False)["LapNumber"]:
+        trace = pd.concat(
+            [make_lap_telemetry(seed=lap_seed(driver, n)) for n in sorted(numbers)], ignore_index=True
+        )
+        for column in trace.columns:
+            if trace[column].dtype.kind == "f" and column != "Distance":
+                trace[column] = trace[column].round()
+        car_data[driver] = trace.drop(columns=POSITION_COLUMNS)
+        pos_data[driver] = trace[POSITION_COLUMNS].copy()
+    return car_data, pos_data
+
+
+class SyntheticLap(pd.Series):
+    """A single lap whose get_telemetry() is a deterministic synthetic trace."""
+
+    _metadata = ["session"]
+
+    @property
+    def _constructor(self):
+        return SyntheticLap
+
+    def get_telemetry(self):
+        session = getattr(self, "session", None)
+        if getattr(session, "car_data", None) is None:
+            return make_lap_telemetry(seed=lap_seed(self["DriverNumber"], self["LapNumber"]))
+        lap = int(self["LapNumber"])
+        rows = slice((lap - 1) * SAMPLES_PER_LAP, lap * SAMPLES_PER_LAP)
+        tel = session.car_data[self["DriverNumber"]].iloc[rows].reset_index(drop=True)
+        # Like FastF1's merge, position is interpolated onto the car samples in its own dtype
+        pos = session.pos_data[self["DriverNumber"]].iloc[rows].to_numpy()
+        merged = pos + (np.roll(pos, -1, axis=0) - pos) * pos.dtype.type(0.37)
+        for i, column in enumerate(POSITION_COLUMNS):
+            tel[column] = merged[:, i]
+        return tel
+
+
+class SyntheticLaps(pd.DataFrame):
+    """Laps table with the pick_fastest() method fetch_telemetry relies on."""
+
+    _metadata = ["session"]
+
+    @property
+    def _constructor(self):
+        return SyntheticLaps
+
+    @property
+    def _constructor_sliced(self):
+        # Rows (iloc[i], iterrows) are laps; columns stay plain Series, as in FastF1
+        def construct(*args, **kwargs):
+            series = pd.Series(*args, **kwargs)
+            if not series.index.equals(self.columns):
+                return series
+            lap = SyntheticLap(series)
+            lap.session = getattr(self, "session", None)
+            return lap
+        return construct
+
+    def pick_fastest(self):
+        valid = self.dropna(subset=["LapTime"])
+        if valid.empty:
+            return None
+        lap = SyntheticLap(valid.loc[valid["LapTime"].idxmin()])
+        lap.session = getattr(self, "session", None)
+        return lap
+
+
+def make_results(drivers: int = 20, seed: int = 0) -> pd.DataFrame:
+    """session.results for `drivers` classified drivers."""
+    rng = np.random.default_rng(seed)
+    numbers = [str(d + 1) for d in range(drivers)]
+    finish = rng.permutation(drivers) + 1
+    return pd.DataFrame({
+        "DriverNumber": numbers,
+        "Abbreviation": [f"D{d + 1:02d}" for d in range(drivers)],
+        "FirstName": [f"First{d}" for d in range(drivers)],
+        "LastName": [f"Last{d}" for d in range(drivers)],
+        "TeamName": [f"Team {d // 2}" for d in range(drivers)],
+        "TeamColor": ["3671C6"] * drivers,
+        "Position": finish.astype(float),
+        "ClassifiedPosition": [str(p) for p in finish],
+        "GridPosition": (rng.permutation(drivers) + 1).astype(float),
+        "Status": ["Finished"] * drivers,
+        "Points": np.where(finish <= 10, 26.0 - finish * 2, 0.0),
+        "Time": pd.to_timedelta(5400 + np.sort(rng.uniform(0, 60, drivers)), unit="s"),
+        "Q1": pd.to_timedelta(rng.uniform(80, 82, drivers), unit="s"),
+        "Q2": pd.Series(pd.to_timedelta(rng.uniform(79, 81, drivers), unit="s")).where(finish <= 15),
+        "Q3": pd.Series(pd.to_timedelta(rng.uniform(78, 80, drivers), unit="s")).where(finish <= 10),
+    })
+
+
+def make_laps(drivers: int = 20, laps: int = 58, seed: int = 0) -> SyntheticLaps:
+    """session.laps: every driver completes `laps` laps over up to three stints."""
+    rng = np.random.default_rng(seed)
+    n = drivers * laps
+    driver = np.repeat(np.arange(1, drivers + 1), laps)
+    lap = np.tile(np.arange(1, laps + 1), drivers).astype(float)
+
+    # Pit stops a third and two thirds of the way through, spread per driver
+    spread = laps // 10
+    pit1 = np.repeat(laps // 3 + rng.integers(-spread, spread + 1, drivers), laps)
+    pit2 = np.repeat(2 * laps // 3 + rng.integers(-spread, spread + 1, drivers), laps)
+    stint = 1.0 + (lap > pit1) + (lap > pit2)
+    stint_start = np.where(stint == 1, 1, np.where(stint == 2, pit1 + 1, pit2 + 1))
+    compound = np.array(COMPOUNDS)[(driver + stint.astype(int)) % 3]
+
+    lap_time = rng.uniform(80, 84, n) + (lap == 1) * 6
+    sectors = lap_time[:, None] * np.array([0.31, 0.38, 0.31])
+    session_time = np.zeros(n)
+    for d in range(drivers):
+        rows = slice(d * laps, (d + 1) * laps)
+        session_time[rows] = np.cumsum(lap_time[rows]) + 3600
+    pit_in = lap == np.where(stint == 1, pit1, pit2)
+    pit_out = (lap == stint_start) & (stint > 1)
+    lap_time_td = pd.Series(pd.to_timedelta(lap_time, unit="s")).where(~(pit_in | pit_out) | (rng.random(n) < 0.5))
+
+    return SyntheticLaps({
+        "Time": pd.to_timedelta(session_time, unit="s"),
+        "Driver": [f"D{d:02d}" for d in driver],
+        "DriverNumber": driver.astype(str),
+        "LapTime": lap_time_td,
+        "LapNumber": lap,
+        "Stint": stint,
+        "PitOutTime": pd.Series(pd.to_timedelta(session_time - lap_time, unit="s")).where(pit_out),
+        "PitInTime": pd.Series(pd.to_timedelta(session_time - 2, unit="s")).where(pit_in),
+        "Sector1Time": pd.to_timedelta(sectors[:, 0], unit="s"),
+        "Sector2Time": pd.to_timedelta(sectors[:, 1], unit="s"),
+        "Sector3Time": pd.to_timedelta(sectors[:, 2], unit="s"),
+        "SpeedI1": rng.uniform(250, 300, n),
+        "SpeedI2": rng.uniform(250, 300, n),
+        "SpeedFL": rng.uniform(270, 310, n),
+        "SpeedST": pd.Series(rng.uniform(300, 340, n)).where(rng.random(n) > 0.02),
+        "IsPersonalBest": rng.random(n) < 0.05,
+        "Compound": compound,
+        "TyreLife": lap - stint_start + 1 + np.where(stint == 1, 2, 0),
+        "FreshTyre": stint > 1,
+        "Team": [f"Team {(d - 1) // 2}" for d in driver],
+        "LapStartTime": pd.to_timedelta(session_time - lap_time, unit="s"),
+        "TrackStatus": np.where(rng.random(n) < 0.05, "4", "1"),
+        "Position": ((driver + lap.astype(int)) % drivers + 1).astype(float),
+        "Deleted": rng.random(n) < 0.01,
+        "DeletedReason": "",
+        "FastF1Generated": False,
+        "IsAccurate": ~(pit_in | pit_out),
+    })
+
+
+def make_weather(minutes: int = 120, seed: int = 0) -> pd.DataFrame:
+    """session.weather_data, one sample per minute."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Time": pd.to_timedelta(np.arange(minutes) * 60, unit="s"),
+        "AirTemp": 21 + np.cumsum(rng.normal(0, 0.05, minutes)),
+        "Humidity": rng.uniform(40, 60, minutes),
+        "Pressure": rng.uniform(1010, 1014, minutes),
+        "Rainfall": np.zeros(minutes, dtype=bool),
+        "TrackTemp": 34 + np.cumsum(rng.normal(0, 0.1, minutes)),
+        "WindDirection": rng.integers(0, 360, minutes),
+        "WindSpeed": rng.uniform(0, 4, minutes),
+    })
+
+
+def make_race_control(messages: int = 80, laps: int = 58, seed: int = 0) -> pd.DataFrame:
+    """session.race_control_messages spread over the race."""
+    rng = np.random.default_rng(seed)
+    category = rng.choice(["Flag", "Other", "Drs", "SafetyCar", "CarEvent"], messages)
+    flagged = category == "Flag"
+    return pd.DataFrame({
+        "Time": pd.Timestamp("2025-03-16 04:00") + pd.to_timedelta(np.sort(rng.uniform(0, 6000, messages)), unit="s"),
+        "Category": category,
+        "Message": [f"MESSAGE {i}" for i in range(messages)],
+        "Status": pd.Series(np.where(category == "Drs", "ENABLED", None)),
+        "Flag": pd.Series(np.where(flagged, rng.choice(["GREEN", "YELLOW", "CLEAR"], messages), None)),
+        "Scope": pd.Series(np.where(flagged, rng.choice(["Track", "Sector"], messages), None)),
+        "Sector": pd.Series(rng.integers(1, 20, messages).astype(float)).where(flagged),
+        "RacingNumber": pd.Series([str(v) for v in rng.integers(1, 21, messages)]).where(category == "CarEvent"),
+        "Lap": np.sort(rng.integers(1, laps + 1, messages)),
+    })
+
+
+def make_track_status(laps: int = 58, lap_seconds: float = 82.0, start: float = 3600.0) -> pd.DataFrame:
+    """session.track_status: a yellow, a safety car and a virtual safety car period."""
+    def at(lap: float) -> float:
+        return start + lap * lap_seconds
+
+    changes = [
+        (start, "1", "AllClear"),
+        (at(laps * 0.15), "2", "Yellow"),
+        (at(laps * 0.15 + 0.2), "1", "AllClear"),
+        (at(laps * 0.4), "4", "SCDeployed"),
+        (at(laps * 0.4 + 3), "1", "AllClear"),
+        (at(laps * 0.75), "6", "VSCDeployed"),
+        (at(laps * 0.75 + 1), "7", "VSCEnding"),
+        (at(laps * 0.75 + 1.3), "1", "AllClear"),
+    ]
+    return pd.DataFrame({
+        "Time": pd.to_timedelta([t for t, _, _ in changes], unit="s"),
+        "Status": [code for _, code, _ in changes],
+        "Message": [message for _, _, message in changes],
+    })
+
+
+class SyntheticCircuitInfo:
+    rotation = 92.0
+
+
+class SyntheticSession:
+    """Just enough of fastf1.core.Session for fetch_telemetry() to run offline."""
+
+    api_path = "/static/2025/2025-03-16_Australian_Grand_Prix/2025-03-16_Race/"
+
+    def __init__(self, drivers: int = 20, laps: int = 58, seed: int = 0, channels: bool = False):
+        self.event = pd.Series({"EventName": "Australian Grand Prix", "Location": "Melbourne", "Country": "Australia"})
+        self.results = make_results(drivers, seed)
+        self.laps = make_laps(drivers, laps, seed)
+        self.laps.session = self
+        if channels:
+            self.car_data, self.pos_data = make_channels(self.laps)
+        self.weather_data = make_weather(max(30, int(laps * 1.6)), seed)
+        self.race_control_messages = make_race_control(max(10, laps + 20), laps, seed)
+        self.track_status = make_track_status(laps)
+        self.t0_date = pd.Timestamp("2025-03-16 03:00")  # race control messages start an hour in
+        self.load_kwargs: dict | None = None
+
+    @classmethod
+    def at_scale(cls, scale: str, seed: int = 0) -> SyntheticSession:
+        preset = SCALES[scale]
+        return cls(drivers=preset["drivers"], laps=preset["laps"], seed=seed)
+
+    def load(self, **kwargs):
+        self.load_kwargs = kwargs
+
+    def get_circuit_info(self):
+        return SyntheticCircuitInfo()
+